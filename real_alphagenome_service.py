@@ -5,13 +5,32 @@ NO MOCK DATA - ONLY REAL ALPHAGENOME CALLS
 """
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from google.protobuf.json_format import MessageToDict, ParseDict
 import os
+import asyncio
+import collections
+import contextvars
 import logging
 import base64
 import io
-from typing import Dict, Any, Optional
+import tempfile
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+import pandas as pd
+from starlette.background import BackgroundTask
+
+from src.alphagenome import arrow_utils
+from src.alphagenome import bed_scoring
+from src.alphagenome import columnar_utils
+from src.alphagenome import load_reporting
+from src.alphagenome import message_stream
+from src.alphagenome import reference_genome
+from src.alphagenome import sequence_codec
+from src.alphagenome import tensor_utils
+from src.alphagenome.protos import dna_model_pb2
+from src.alphagenome.protos import tensor_pb2
 
 # Configure logging first
 logging.basicConfig(level=logging.INFO)
@@ -44,6 +63,81 @@ except ImportError as e:
 
 app = FastAPI(title="Real AlphaGenome Service", version="1.0.0")
 
+# Clients opt into quantized track values (bfloat16, float16, int8 or uint8) with this header
+QUANTIZATION_HEADER = "X-AlphaGenome-Quantization"
+# Quantized values are sent in chunks of at most this many bytes (before compression), so
+# every message the proxy forwards stays well under gRPC's default 4 MB limit
+TENSOR_CHUNK_BYTES = int(os.getenv("TENSOR_CHUNK_BYTES", str(1024 * 1024)))
+
+# Blocking model calls run on a bounded worker pool, whose load is published on /load,
+# /metrics and as X-AlphaGenome-Load-* headers of every response
+MODEL_WORKERS = int(os.getenv("MODEL_WORKERS", "4"))
+MODEL_MAX_QUEUE_DEPTH = int(os.getenv("MODEL_MAX_QUEUE_DEPTH", "0")) or None
+LOAD_MONITOR = load_reporting.LoadMonitor(MODEL_WORKERS, max_queue_depth=MODEL_MAX_QUEUE_DEPTH)
+
+
+# The proxy sends the seconds left of its caller's deadline, and an ID it can post to /cancel
+TIMEOUT_HEADER = "X-AlphaGenome-Timeout"
+REQUEST_ID_HEADER = "X-AlphaGenome-Request-Id"
+REQUEST_DEADLINE = contextvars.ContextVar("request_deadline", default=None)
+REQUEST_ID = contextvars.ContextVar("request_id", default=None)
+# Model calls of each request ID, so that /cancel can abort them
+MODEL_CALLS = collections.defaultdict(set)
+# Model calls given up on, by reason
+ABORTED_CALLS = collections.Counter()
+
+
+async def run_model(fn, /, *args, **kwargs):
+    """Run a blocking model call on the worker pool without blocking the event loop.
+
+    The call is aborted once the request's deadline passes or the proxy cancels it; a call
+    still queued is dropped, a running one finishes in the background and is discarded.
+    """
+    call = asyncio.ensure_future(LOAD_MONITOR.run(fn, *args, **kwargs))
+    request_id = REQUEST_ID.get()
+    if request_id is not None:
+        MODEL_CALLS[request_id].add(call)
+    try:
+        deadline = REQUEST_DEADLINE.get()
+        timeout = None if deadline is None else deadline - asyncio.get_running_loop().time()
+        done, _ = await asyncio.wait({call}, timeout=timeout)
+        if not done:
+            ABORTED_CALLS["deadline_exceeded"] += 1
+            raise HTTPException(status_code=504, detail="Deadline exceeded before the model call completed")
+        if call.cancelled():
+            ABORTED_CALLS["cancelled"] += 1
+            raise HTTPException(status_code=499, detail="Model call cancelled by the client")
+        return call.result()
+    except load_reporting.Overloaded as e:
+        # 429 rather than 503, so that balancers retry elsewhere instead of ejecting this replica
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    finally:
+        call.cancel()
+        if request_id is not None:
+            MODEL_CALLS[request_id].discard(call)
+            if not MODEL_CALLS[request_id]:
+                del MODEL_CALLS[request_id]
+
+
+@app.middleware("http")
+async def report_load(request: Request, call_next):
+    timeout = request.headers.get(TIMEOUT_HEADER)
+    try:
+        if timeout is not None:
+            REQUEST_DEADLINE.set(asyncio.get_running_loop().time() + float(timeout))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {TIMEOUT_HEADER} header: {timeout}")
+    REQUEST_ID.set(request.headers.get(REQUEST_ID_HEADER))
+    # Only prediction requests count as in flight; probes of /load and /health do not
+    if request.method == "POST" and request.url.path != "/cancel":
+        with LOAD_MONITOR.track_request():
+            response = await call_next(request)
+    else:
+        response = await call_next(request)
+    response.headers.update(LOAD_MONITOR.report().headers())
+    return response
+
+
 # Add CORS middleware to allow web interface connections
 app.add_middleware(
     CORSMiddleware,
@@ -203,6 +297,93 @@ def generate_fallback_plot(variant=None, interval=None):
         logger.error(f"Error generating fallback plot: {e}")
         return None
 
+def wants_arrow(request: Request, data: Dict[str, Any]) -> bool:
+    """Check whether the client asked for an Arrow IPC stream instead of JSON"""
+    accept = request.headers.get('accept', '')
+    return arrow_utils.ARROW_STREAM_MEDIA_TYPE in accept or data.get('output_format') == 'arrow'
+
+def requested_quantization(request: Request) -> int:
+    """Parse the quantization negotiated with the X-AlphaGenome-Quantization header"""
+    name = request.headers.get(QUANTIZATION_HEADER, '')
+    if not name:
+        return tensor_pb2.QuantizationType.QUANTIZATION_TYPE_NONE
+    try:
+        return tensor_pb2.QuantizationType.Value(f"QUANTIZATION_TYPE_{name.upper()}")
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Unsupported quantization: {name}")
+
+def output_payload_field(output_type) -> str:
+    """Name of the Output payload field used for an output type"""
+    return "junction_data" if output_type.name == "SPLICE_JUNCTIONS" else "track_data"
+
+def quantized_output(outputs, output_type, quantization_type: int) -> Optional[Tuple[dna_model_pb2.Output, Iterator[tensor_pb2.TensorChunk]]]:
+    """Pack the values of an output as a quantized, zstd compressed, chunked Tensor
+
+    Returns the Output, whose values only hold the Tensor header, and a lazy iterator of
+    the chunks that follow it on the stream. Metadata (and splice junctions) are sent in
+    their columnar form, so neither side builds a protobuf message per track or junction.
+    """
+    track_data = getattr(outputs, output_type.name.lower(), None)
+    if track_data is None:
+        return None
+    # Contact maps are symmetric, so only the upper triangle is sent.
+    layout = tensor_pb2.TensorLayout.TENSOR_LAYOUT_DENSE
+    if output_type.name == "CONTACT_MAPS":
+        layout = tensor_pb2.TensorLayout.TENSOR_LAYOUT_SYMMETRIC_UPPER_TRIANGLE
+    try:
+        values, chunks = tensor_utils.pack_tensor_stream(
+            track_data.values,
+            bytes_per_chunk=TENSOR_CHUNK_BYTES,
+            compression_type=tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD,
+            quantization_type=quantization_type,
+            layout=layout
+        )
+    except ValueError as e:
+        # e.g. NaN tracks, which only the floating point quantizations can carry
+        raise HTTPException(status_code=400, detail=f"Cannot quantize {output_type.name}: {e}")
+    output = dna_model_pb2.Output(output_type=output_type.value)
+    payload = getattr(output, output_payload_field(output_type))
+    payload.values.CopyFrom(values)
+    payload.metadata_table.CopyFrom(columnar_utils.metadata_to_table(track_data.metadata))
+    if output_type.name == "SPLICE_JUNCTIONS":
+        payload.junction_columns.CopyFrom(columnar_utils.intervals_to_columns(pd.DataFrame({
+            "chromosome": [junction.chromosome for junction in track_data.junctions],
+            "start": [junction.start for junction in track_data.junctions],
+            "end": [junction.end for junction in track_data.junctions],
+            "strand": [junction.strand for junction in track_data.junctions]
+        })))
+    else:
+        payload.resolution = track_data.resolution
+    return output, chunks
+
+def quantized_response(request: Request, outputs, requested_outputs, quantization_type: int, response_type) -> Optional[Response]:
+    """Stream a quantized Output message and its tensor_chunk messages per requested output
+
+    Returns None if none of the requested outputs was predicted. The messages are sent
+    length-delimited in binary, so the proxy forwards them without a JSON (and base64)
+    round trip. Every output is quantized before the response starts, so errors still
+    return 400; chunks are then compressed as the body is sent.
+    """
+    packed = [
+        output_and_chunks
+        for output_and_chunks in (quantized_output(outputs, ot, quantization_type) for ot in requested_outputs)
+        if output_and_chunks is not None
+    ]
+    if not packed:
+        return None
+
+    def messages():
+        for output, chunks in packed:
+            yield response_type(output=output)
+            for chunk in chunks:
+                yield response_type(tensor_chunk=chunk)
+
+    return StreamingResponse(
+        message_stream.iter_delimited(messages()),
+        media_type=message_stream.MEDIA_TYPE,
+        headers={QUANTIZATION_HEADER: request.headers[QUANTIZATION_HEADER].lower()}
+    )
+
 def get_output_type(output_type_id: int) -> Any:
     """Convert output type ID to AlphaGenome OutputType enum"""
     if not REAL_ALPHAGENOME_AVAILABLE:
@@ -253,17 +434,29 @@ async def predict_sequence(request: Request):
     
     try:
         data = await request.json()
-        logger.info(f"PredictSequence request: {data}")
+        
+        # The proxy sends sequences 2-bit packed; plain strings are still accepted
+        if sequence_codec.WIRE_SEQUENCE_FIELD in data:
+            packed_sequence = sequence_codec.from_wire(data)
+            sequence = sequence_codec.unpack_sequence(packed_sequence)
+        else:
+            sequence = data.get('sequence', 'ATCG')
+            try:
+                packed_sequence = sequence_codec.pack_sequence(sequence)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        sequence_key = sequence_codec.sequence_key(packed_sequence)
+        logger.info(f"PredictSequence request: {len(sequence)} bp sequence {sequence_key}")
         
         # Extract parameters
-        sequence = data.get('sequence', 'ATCG')
         sequence_type = data.get('sequence_type', 1)
         organism = data.get('organism', 9606)  # Human
         requested_outputs = [get_output_type(ot) for ot in data.get('requested_outputs', [4])]  # Default to RNA_SEQ
         model_version = data.get('model_version', 'v1')
+        quantization_type = requested_quantization(request)
         
         logger.info(f"Calling REAL AlphaGenome predict_sequence with:")
-        logger.info(f"  Sequence: {sequence}")
+        logger.info(f"  Sequence: {len(sequence)} bp, key {sequence_key}")
         logger.info(f"  Sequence type: {sequence_type}")
         logger.info(f"  Organism: {organism}")
         logger.info(f"  Requested outputs: {requested_outputs}")
@@ -280,7 +473,7 @@ async def predict_sequence(request: Request):
             logger.info("✓ DnaClient created successfully with API key")
             
             # Call the real predict_sequence method
-            outputs = client.predict_sequence(
+            outputs = await run_model(client.predict_sequence,
                 sequence=sequence,
                 organism=Organism.HOMO_SAPIENS,
                 requested_outputs=requested_outputs
@@ -303,12 +496,24 @@ async def predict_sequence(request: Request):
                 }
             }
             
+            # Only clients that negotiated a quantization receive the (lossy) track values
+            if quantization_type:
+                quantized = quantized_response(
+                    request, outputs, requested_outputs, quantization_type, dna_model_pb2.PredictSequenceResponse
+                )
+                if quantized is not None:
+                    return quantized
+            
             return JSONResponse(response_data)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Real AlphaGenome model call failed: {e}")
             raise HTTPException(status_code=500, detail=f"AlphaGenome model prediction failed: {str(e)}")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in predict_sequence: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -328,6 +533,7 @@ async def predict_interval(request: Request):
         organism = data.get('organism', 9606)
         requested_outputs = [get_output_type(ot) for ot in data.get('requested_outputs', [4])]  # Default to RNA_SEQ
         model_version = data.get('model_version', 'v1')
+        quantization_type = requested_quantization(request)
         
         logger.info(f"Calling REAL AlphaGenome predict_interval with:")
         logger.info(f"  Interval: {interval}")
@@ -346,7 +552,7 @@ async def predict_interval(request: Request):
             logger.info("✓ DnaClient created successfully with API key")
             
             # Call the real predict_interval method
-            outputs = client.predict_interval(
+            outputs = await run_model(client.predict_interval,
                 interval=interval,
                 organism=Organism.HOMO_SAPIENS,
                 requested_outputs=requested_outputs
@@ -373,12 +579,24 @@ async def predict_interval(request: Request):
                 }
             }
             
+            # Only clients that negotiated a quantization receive the (lossy) track values
+            if quantization_type:
+                quantized = quantized_response(
+                    request, outputs, requested_outputs, quantization_type, dna_model_pb2.PredictIntervalResponse
+                )
+                if quantized is not None:
+                    return quantized
+            
             return JSONResponse(response_data)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Real AlphaGenome model call failed: {e}")
             raise HTTPException(status_code=500, detail=f"AlphaGenome model prediction failed: {str(e)}")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in predict_interval: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -432,7 +650,7 @@ async def score_ism_variant(request: Request):
             variant_scorers = [GeneMaskActiveScorer(requested_output=requested_outputs[0])]
             
             # Call the real score_ism_variant method
-            outputs = client.score_ism_variant(
+            outputs = await run_model(client.score_ism_variant,
                 interval=interval,
                 ism_interval=ism_interval,
                 variant_scorers=variant_scorers,
@@ -471,10 +689,14 @@ async def score_ism_variant(request: Request):
             
             return JSONResponse(response_data)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Real AlphaGenome model call failed: {e}")
             raise HTTPException(status_code=500, detail=f"AlphaGenome model ISM scoring failed: {str(e)}")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in score_ism_variant: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -516,7 +738,7 @@ async def predict_variant(request: Request):
             logger.info("✓ DnaClient created successfully with API key")
             
             # Call the real predict_variant method
-            outputs = client.predict_variant(
+            outputs = await run_model(client.predict_variant,
                 interval=interval,
                 variant=variant,
                 organism=Organism.HOMO_SAPIENS,
@@ -561,10 +783,14 @@ async def predict_variant(request: Request):
             
             return JSONResponse(response_data)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Real AlphaGenome model call failed: {e}")
             raise HTTPException(status_code=500, detail=f"AlphaGenome model prediction failed: {str(e)}")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in predict_variant: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -607,7 +833,7 @@ async def score_variant(request: Request):
             variant_scorers = [GeneMaskActiveScorer(requested_output=requested_outputs[0])]
             
             # Call the real score_variant method
-            scores = client.score_variant(
+            scores = await run_model(client.score_variant,
                 interval=interval,
                 variant=variant,
                 variant_scorers=variant_scorers,
@@ -616,6 +842,17 @@ async def score_variant(request: Request):
             
             logger.info(f"✓ REAL AlphaGenome scoring successful: {type(scores)}")
             
+            if wants_arrow(request, data):
+                # Columnar result: scores share memory with the AnnData buffers
+                scorer_index = int(data.get('scorer_index', 0))
+                ipc_stream = arrow_utils.scores_to_ipc_stream(scores[scorer_index], variant=str(variant))
+                logger.info(f"Returning Arrow IPC stream of {len(ipc_stream)} bytes")
+                return Response(
+                    content=ipc_stream,
+                    media_type=arrow_utils.ARROW_STREAM_MEDIA_TYPE,
+                    headers={"X-AlphaGenome-Score-Count": str(len(scores))}
+                )
+            
             # Convert AnnData to serializable format
             response_data = {
                 "status": "success",
@@ -640,10 +877,14 @@ async def score_variant(request: Request):
             
             return JSONResponse(response_data)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Real AlphaGenome model call failed: {e}")
             raise HTTPException(status_code=500, detail=f"AlphaGenome model scoring failed: {str(e)}")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in score_variant: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -684,7 +925,7 @@ async def score_interval(request: Request):
             interval_scorers = [GeneMaskActiveScorer(requested_output=requested_outputs[0])]
             
             # Call the real score_interval method
-            outputs = client.score_interval(
+            outputs = await run_model(client.score_interval,
                 interval=interval,
                 interval_scorers=interval_scorers,
                 organism=Organism.HOMO_SAPIENS
@@ -714,16 +955,156 @@ async def score_interval(request: Request):
             
             return JSONResponse(response_data)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Real AlphaGenome model call failed: {e}")
             raise HTTPException(status_code=500, detail=f"AlphaGenome model scoring failed: {str(e)}")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in score_interval: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/score_variants_parquet")
+async def score_variants_parquet(request: Request):
+    """Score a batch of variants with one scorer and return all scores as a Parquet file
+
+    Each variant is appended to the file as a row group as soon as it is scored, so the
+    batch is never held in memory as a whole.
+    """
+    if not REAL_ALPHAGENOME_AVAILABLE:
+        raise HTTPException(status_code=500, detail="Real AlphaGenome package not available")
+
+    try:
+        data = await request.json()
+        items = data.get('variants', [])
+        if not items:
+            raise HTTPException(status_code=400, detail="No variants to score")
+        requested_output = get_output_type(data.get('requested_output', 4))  # Default to RNA_SEQ
+        variant_scorers = [GeneMaskActiveScorer(requested_output=requested_output)]
+        logger.info(f"ScoreVariantsParquet request: {len(items)} variants")
+
+        api_key = os.getenv('ALPHAGENOME_API_KEY')
+        if not api_key:
+            raise HTTPException(status_code=500, detail="ALPHAGENOME_API_KEY environment variable not set")
+        client = create(api_key=api_key)
+
+        fd, path = tempfile.mkstemp(suffix='.parquet')
+        os.close(fd)
+        try:
+            with arrow_utils.ParquetScoreWriter(path) as writer:
+                for item in items:
+                    variant = create_alphagenome_variant(item)
+                    scores = await run_model(client.score_variant,
+                        interval=create_alphagenome_interval(item),
+                        variant=variant,
+                        variant_scorers=variant_scorers,
+                        organism=Organism.HOMO_SAPIENS
+                    )
+                    writer.write(scores[0], variant=str(variant))
+        except BaseException:
+            os.unlink(path)
+            raise
+        return FileResponse(
+            path,
+            media_type=arrow_utils.PARQUET_MEDIA_TYPE,
+            filename="variant_scores.parquet",
+            background=BackgroundTask(os.unlink, path)
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"Invalid batch scoring request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in score_variants_parquet: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/score_intervals_bed")
+async def score_intervals_bed(request: Request):
+    """Score every region of a BED file, sharing one prediction per window
 
+    If a window fails once the table is streaming, the table ends with an "#error" row.
+    """
+    if not REAL_ALPHAGENOME_AVAILABLE:
+        raise HTTPException(status_code=500, detail="Real AlphaGenome package not available")
+    
+    try:
+        data = await request.json()
+        regions = bed_scoring.read_bed(data.get('bed', '').splitlines())
+        scorer = ParseDict(data.get('gene_mask', {}), dna_model_pb2.GeneMaskIntervalScorer())
+        requested_output = get_output_type(scorer.requested_output or 4)  # Default to RNA_SEQ
+        window_width = int(data.get('window_width', bed_scoring.DEFAULT_WINDOW_WIDTH))
+        # Keep windows within their chromosome when the local reference knows its length; windows
+        # of shorter chromosomes are predicted from the reference sequence, padded with N
+        reference = reference_genome.reference_from_env()
+        chromosome_lengths = reference.chromosome_lengths if reference is not None else None
+        windows = bed_scoring.merge_regions(
+            regions, window_width=window_width, chromosome_lengths=chromosome_lengths
+        )
+        
+        logger.info(f"ScoreIntervalsBed request: {len(regions)} regions in {len(windows)} prediction windows")
+        
+        api_key = os.getenv('ALPHAGENOME_API_KEY')
+        if not api_key:
+            raise HTTPException(status_code=500, detail="ALPHAGENOME_API_KEY environment variable not set")
+        client = create(api_key=api_key)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"Invalid BED scoring request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in score_intervals_bed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def predict_window(window):
+        # Windows run on the model worker pool, so they count towards its load
+        if chromosome_lengths is not None and window.end > chromosome_lengths[window.chromosome]:
+            # Windows of chromosomes shorter than the window (such as chrM) are padded with N
+            outputs = LOAD_MONITOR.call(client.predict_sequence,
+                sequence=reference.fetch(window.chromosome, window.start, window.end, pad=True).decode(),
+                organism=Organism.HOMO_SAPIENS,
+                requested_outputs=[requested_output]
+            )
+        else:
+            outputs = LOAD_MONITOR.call(client.predict_interval,
+                interval=genome.Interval(
+                    chromosome=window.chromosome,
+                    start=window.start,
+                    end=window.end
+                ),
+                organism=Organism.HOMO_SAPIENS,
+                requested_outputs=[requested_output]
+            )
+        track_data = getattr(outputs, requested_output.name.lower())
+        return bed_scoring.WindowPrediction(
+            values=track_data.values,
+            resolution=track_data.resolution,
+            track_names=list(track_data.metadata['name'])
+        )
+
+    # Windows are predicted lazily as the table is streamed to the client.
+    results = bed_scoring.score_regions(
+        regions, predict_window, scorer, window_width=window_width, chromosome_lengths=chromosome_lengths
+    )
+
+    def table():
+        # The 200 status is sent with the first rows, so a window failing later can only be
+        # reported in the body: the table then ends with an "#error" row instead of its last rows
+        try:
+            yield from bed_scoring.iter_table(results)
+        except Exception as e:
+            logger.error(f"Error in score_intervals_bed after streaming started: {e}")
+            message = " ".join(str(e).split())
+            yield f"#error\t{type(e).__name__}: {message}\n"
 
+    return StreamingResponse(
+        table(),
+        media_type="text/tab-separated-values"
+    )
 
 
 
@@ -732,6 +1113,30 @@ async def score_interval(request: Request):
 
 
 
+
+
+
+@app.get("/reference_sequence")
+async def reference_sequence(chromosome: str, start: int, end: int, strand: str = '+'):
+    """Return the local reference sequence of an interval (REFERENCE_GENOME_PATH)"""
+    reference = reference_genome.reference_from_env()
+    if reference is None:
+        raise HTTPException(status_code=501, detail="REFERENCE_GENOME_PATH environment variable not set")
+    
+    interval = dna_model_pb2.Interval(
+        chromosome=chromosome,
+        start=start,
+        end=end,
+        strand=dna_model_pb2.STRAND_NEGATIVE if strand == '-' else dna_model_pb2.STRAND_POSITIVE
+    )
+    try:
+        sequence = reference.sequence(interval, pad=True)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown chromosome: {chromosome}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=sequence, media_type="text/plain")
+
 @app.post("/metadata")
 async def get_metadata(request: Request):
     """Get metadata using REAL AlphaGenome - NO MOCK DATA"""
@@ -761,7 +1166,7 @@ async def get_metadata(request: Request):
             logger.info("✓ DnaClient created successfully with API key")
             
             # Call the real get_metadata method
-            metadata = client.get_metadata(
+            metadata = await run_model(client.get_metadata,
                 organism=Organism.HOMO_SAPIENS
             )
             
@@ -790,10 +1195,14 @@ async def get_metadata(request: Request):
             
             return JSONResponse(response_data)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Real AlphaGenome model call failed: {e}")
             raise HTTPException(status_code=500, detail=f"AlphaGenome model metadata failed: {str(e)}")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_metadata: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -809,6 +1218,31 @@ async def health_check():
         "note": "All prediction methods now use the real AlphaGenome API with API key authentication."
     }
 
+@app.post("/cancel")
+async def cancel(request: Request):
+    """Abort the model calls of a request the proxy gave up on"""
+    data = await request.json()
+    calls = MODEL_CALLS.get(data.get("request_id"), set())
+    for call in calls:
+        call.cancel()
+    return {"cancelled": len(calls)}
+
+@app.get("/load")
+async def load():
+    """Live load of this replica"""
+    return LOAD_MONITOR.report().as_dict()
+
+@app.get("/metrics")
+async def metrics():
+    """Live load of this replica in the Prometheus text format"""
+    lines = [LOAD_MONITOR.report().prometheus()]
+    # Model work avoided: calls dropped before running and running calls whose result was discarded
+    for outcome in ("dropped", "abandoned"):
+        lines.append(f"alphagenome_service_model_calls_{outcome}_total {LOAD_MONITOR.counters[outcome]}\n")
+    for reason in ("deadline_exceeded", "cancelled"):
+        lines.append(f'alphagenome_service_model_calls_aborted_total{{reason="{reason}"}} {ABORTED_CALLS[reason]}\n')
+    return Response("".join(lines), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 async def root():
     """Root endpoint"""
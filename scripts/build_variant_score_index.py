@@ -0,0 +1,68 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Builds a memory-mapped variant score index from precomputed scores.
+
+The input is a JSON lines file where each line holds a scored request and the
+service response to serve for it:
+
+  {"request": {"variant": {...}, "variant_scorers": [...], ...},
+   "response": {...}}
+
+Usage:
+
+  python -m scripts.build_variant_score_index \
+    --input=gwas_scores.jsonl --output=/data/variant_scores.idx
+
+The output file is replaced atomically, so a running proxy configured with
+VARIANT_SCORE_INDEX_PATH picks it up without a restart.
+"""
+
+from collections.abc import Iterator, Sequence
+import json
+
+from absl import app
+from absl import flags
+from src.alphagenome import variant_score_index
+
+
+_INPUT = flags.DEFINE_string(
+    'input', None, 'JSON lines file of scored requests and their responses.'
+)
+_OUTPUT = flags.DEFINE_string('output', None, 'Path of the index to write.')
+
+
+def _read_records(path: str) -> Iterator[tuple[bytes, bytes]]:
+  with open(path) as f:
+    for line in f:
+      if line.strip():
+        record = json.loads(line)
+        yield (
+            variant_score_index.key_from_request(record['request']),
+            json.dumps(record['response'], separators=(',', ':')).encode(),
+        )
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  num_entries = variant_score_index.build_index(
+      _read_records(_INPUT.value), _OUTPUT.value
+  )
+  print(f'Wrote {num_entries} entries to {_OUTPUT.value}.')
+
+
+if __name__ == '__main__':
+  flags.mark_flags_as_required(['input', 'output'])
+  app.run(main)
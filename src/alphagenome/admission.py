@@ -0,0 +1,623 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-tenant admission control for upstream calls.
+
+`FairScheduler` bounds the number of concurrent upstream calls and shares them
+between tenants (e.g. API keys) with start-time fair queuing: when a slot frees
+up, each tenant with queued requests is tagged with a virtual finish time
+`start + cost / weight` for its next request, where `start` is the later of the
+current virtual time and the tenant's previous finish time, and the tenant with
+the earliest finish time is granted the slot. A tenant submitting a large batch
+therefore only delays other tenants by its weighted share, instead of filling
+the pool.
+
+Within a tenant, requests run shortest expected job first, with aging so that
+expensive requests are not starved: a request's priority is its expected cost
+minus `aging` times the time it has been queued. Expected costs come from a
+`CostModel`, which learns seconds per unit of work for each RPC online from
+observed latencies.
+
+The number of slots can adapt to the upstream's capacity with `AimdLimit` or
+`GradientLimit`, driven by the latency and failures of admitted requests.
+
+Requests beyond a tenant's queue depth, or its token bucket rate, are rejected
+immediately with `AdmissionRejected`, as are requests not admitted within their
+queue timeout.
+"""
+
+import collections
+from collections.abc import Callable, Iterator, Mapping, Sequence
+import contextlib
+import dataclasses
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+
+class AdmissionRejected(Exception):
+  """Raised when a request is rejected instead of queued."""
+
+
+class TokenBucket:
+  """Thread-safe token bucket rate limiter."""
+
+  def __init__(
+      self,
+      rate: float,
+      burst: float,
+      *,
+      clock: Callable[[], float] = time.monotonic,
+  ):
+    """Initializes the bucket, full.
+
+    Args:
+      rate: Tokens added per second.
+      burst: Capacity of the bucket.
+      clock: Monotonic clock in seconds.
+    """
+    self._rate = rate
+    self._burst = burst
+    self._clock = clock
+    self._tokens = burst
+    self._updated = clock()
+    self._lock = threading.Lock()
+
+  def try_acquire(self, tokens: float = 1.0) -> bool:
+    """Takes `tokens` from the bucket if available."""
+    with self._lock:
+      now = self._clock()
+      self._tokens = min(
+          self._burst, self._tokens + (now - self._updated) * self._rate
+      )
+      self._updated = now
+      if self._tokens < tokens:
+        return False
+      self._tokens -= tokens
+      return True
+
+
+@dataclasses.dataclass
+class TenantStats:
+  """Admission statistics of a tenant.
+
+  Attributes:
+    admitted: Number of admitted requests.
+    rejected: Number of rejected requests.
+    queue_time_total: Total time admitted requests spent queued, in seconds.
+    queue_time_max: Longest time a request spent queued, in seconds.
+    recent_queue_times: Queue times of the most recent admitted requests.
+  """
+
+  admitted: int = 0
+  rejected: int = 0
+  queue_time_total: float = 0.0
+  queue_time_max: float = 0.0
+  recent_queue_times: collections.deque[float] = dataclasses.field(
+      default_factory=lambda: collections.deque(maxlen=1024)
+  )
+
+  def queue_time_quantile(self, q: float) -> float:
+    """Returns a quantile of the recent queue times, in seconds."""
+    if not self.recent_queue_times:
+      return 0.0
+    return float(np.quantile(np.fromiter(self.recent_queue_times, float), q))
+
+
+@dataclasses.dataclass(frozen=True)
+class RequestFeatures:
+  """Features of a request that determine its cost.
+
+  Attributes:
+    rpc: Name of the RPC, e.g. 'score_variant'.
+    width: Width of the predicted interval or sequence in base pairs.
+    ism_width: Width of the in silico mutagenesis interval in base pairs.
+    num_outputs: Number of requested outputs.
+    num_scorers: Number of scorers.
+  """
+
+  rpc: str
+  width: int = 0
+  ism_width: int = 0
+  num_outputs: int = 0
+  num_scorers: int = 0
+
+  @property
+  def work(self) -> float:
+    """Units of work, proportional to the expected cost within an RPC."""
+    work = max(self.width, 1) / 2**20
+    work *= max(self.num_outputs, 1) * max(self.num_scorers, 1)
+    if self.ism_width:
+      # Each position is scored for the three alternate bases.
+      work *= 3 * self.ism_width
+    return work
+
+
+def _interval_width(interval: Mapping[str, Any] | None) -> int:
+  if not interval:
+    return 0
+  return max(int(interval.get('end', 0)) - int(interval.get('start', 0)), 0)
+
+
+def request_features(rpc: str, request: Mapping[str, Any]) -> RequestFeatures:
+  """Extracts the features of a request.
+
+  Args:
+    rpc: Name of the RPC.
+    request: Request as returned by `json_format.MessageToDict` (with
+      `preserving_proto_field_name=True`), optionally with a packed sequence
+      length in `sequence_length`.
+
+  Returns:
+    The request features.
+  """
+  width = _interval_width(request.get('interval'))
+  if not width:
+    width = int(
+        request.get('sequence_length', len(request.get('sequence', '')))
+    )
+  scorers: Sequence[Any] = request.get(
+      'variant_scorers', request.get('interval_scorers', ())
+  )
+  return RequestFeatures(
+      rpc=rpc,
+      width=width,
+      ism_width=_interval_width(request.get('ism_interval')),
+      num_outputs=len(request.get('requested_outputs', ())),
+      num_scorers=len(scorers),
+  )
+
+
+class CostModel:
+  """Online estimates of the cost of requests, in seconds.
+
+  The cost of a request is `seconds_per_work[rpc] * features.work`, where
+  `seconds_per_work` is an exponentially weighted moving average of the observed
+  latency per unit of work of each RPC, and at least the RPC's minimum cost.
+  The minimum keeps requests with little work, such as metadata lookups, from
+  being estimated as free, which would make their latency look like an extreme
+  slowdown to the concurrency limit.
+  """
+
+  def __init__(
+      self,
+      *,
+      priors: Mapping[str, float] | None = None,
+      default_prior: float = 1.0,
+      min_costs: Mapping[str, float] | None = None,
+      default_min_cost: float = 0.05,
+      smoothing: float = 0.1,
+  ):
+    """Initializes the model.
+
+    Args:
+      priors: Initial seconds per unit of work of each RPC.
+      default_prior: Initial seconds per unit of work of other RPCs.
+      min_costs: Minimum cost of a request of each RPC, in seconds.
+      default_min_cost: Minimum cost of a request of other RPCs, in seconds.
+      smoothing: Weight of each new observation in the moving average.
+    """
+    self._seconds_per_work = dict(priors or {})
+    self._default_prior = default_prior
+    self._min_costs = dict(min_costs or {})
+    self._default_min_cost = default_min_cost
+    self._smoothing = smoothing
+    self._lock = threading.Lock()
+
+  def estimate(self, features: RequestFeatures) -> float:
+    """Returns the expected cost of a request in seconds."""
+    rate = self._seconds_per_work.get(features.rpc, self._default_prior)
+    min_cost = self._min_costs.get(features.rpc, self._default_min_cost)
+    return max(rate * features.work, min_cost)
+
+  def observe(self, features: RequestFeatures, latency: float) -> None:
+    """Updates the estimates with the observed latency of a request."""
+    observed = latency / features.work
+    with self._lock:
+      rate = self._seconds_per_work.get(features.rpc)
+      if rate is None:
+        self._seconds_per_work[features.rpc] = observed
+      else:
+        self._seconds_per_work[features.rpc] = rate + self._smoothing * (
+            observed - rate
+        )
+
+  def seconds_per_work(self) -> dict[str, float]:
+    """Returns a snapshot of the learned seconds per unit of work."""
+    with self._lock:
+      return dict(self._seconds_per_work)
+
+
+class ConcurrencyLimit:
+  """A fixed concurrency limit, and base class of adaptive limits.
+
+  Limits are updated by `FairScheduler` with the outcome of each admitted
+  request, while holding its lock.
+  """
+
+  def __init__(self, limit: int):
+    self._limit = limit
+
+  @property
+  def limit(self) -> int:
+    return max(int(self._limit), 1)
+
+  def update(self, slowdown: float, *, dropped: bool, in_flight: int) -> None:
+    """Updates the limit with the outcome of a request.
+
+    Args:
+      slowdown: Latency of the request divided by its expected cost.
+      dropped: Whether the request failed, timed out or was rejected upstream.
+      in_flight: Number of admitted requests, including this one.
+    """
+    del slowdown, dropped, in_flight  # Unused.
+
+
+class AimdLimit(ConcurrencyLimit):
+  """Additive increase, multiplicative decrease concurrency limit.
+
+  The limit grows by one per limit's worth of successful requests while it is
+  at least half used, and is multiplied by `backoff` on each dropped request or
+  request slower than `slowdown_threshold`.
+  """
+
+  def __init__(
+      self,
+      initial: int,
+      *,
+      min_limit: int = 1,
+      max_limit: int = 64,
+      backoff: float = 0.9,
+      slowdown_threshold: float = 2.0,
+  ):
+    super().__init__(initial)
+    self._min_limit = min_limit
+    self._max_limit = max_limit
+    self._backoff = backoff
+    self._slowdown_threshold = slowdown_threshold
+
+  def update(self, slowdown: float, *, dropped: bool, in_flight: int) -> None:
+    if dropped or slowdown > self._slowdown_threshold:
+      self._limit = max(self._min_limit, self._limit * self._backoff)
+    elif 2 * in_flight >= self._limit:
+      self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+
+class GradientLimit(ConcurrencyLimit):
+  """Concurrency limit following the latency gradient.
+
+  After Netflix's gradient limiter: the limit is scaled by the ratio of the
+  no-load slowdown to the short-term average slowdown (times `tolerance`,
+  clamped to [0.5, 1]) and a headroom of sqrt(limit) is added, so the limit
+  grows while latency is flat and shrinks as soon as requests queue upstream.
+  The no-load slowdown is the minimum over windows of `baseline_window`
+  requests, so it follows lasting changes of the upstream.
+  """
+
+  def __init__(
+      self,
+      initial: int,
+      *,
+      min_limit: int = 1,
+      max_limit: int = 64,
+      smoothing: float = 0.2,
+      tolerance: float = 1.5,
+      short_window: int = 10,
+      baseline_window: int = 1000,
+  ):
+    """Initializes the limit.
+
+    Args:
+      initial: Initial limit.
+      min_limit: Minimum limit.
+      max_limit: Maximum limit.
+      smoothing: Weight of each new limit in the moving average of the limit.
+      tolerance: Ratio of short-term to no-load slowdown tolerated before the
+        limit decreases.
+      short_window: Number of requests in the short-term average.
+      baseline_window: Number of requests after which the no-load slowdown is
+        reset to the minimum of the last window.
+    """
+    super().__init__(initial)
+    self._min_limit = min_limit
+    self._max_limit = max_limit
+    self._smoothing = smoothing
+    self._tolerance = tolerance
+    self._short_alpha = 2 / (short_window + 1)
+    self._baseline_window = baseline_window
+    self._short = None
+    self._baseline = math.inf
+    self._window_min = math.inf
+    self._window_count = 0
+
+  def update(self, slowdown: float, *, dropped: bool, in_flight: int) -> None:
+    if dropped:
+      self._limit = max(self._min_limit, self._limit * 0.9)
+      return
+    if self._short is None:
+      self._short = slowdown
+    self._short += self._short_alpha * (slowdown - self._short)
+    self._baseline = min(self._baseline, slowdown)
+    self._window_min = min(self._window_min, slowdown)
+    self._window_count += 1
+    if self._window_count >= self._baseline_window:
+      self._baseline = self._window_min
+      self._window_min = math.inf
+      self._window_count = 0
+    if 2 * in_flight < self._limit:
+      return  # Not enough load to learn anything about a higher limit.
+    gradient = self._tolerance * self._baseline / max(self._short, 1e-12)
+    gradient = min(max(gradient, 0.5), 1.0)
+    new_limit = self._limit * gradient + math.sqrt(self._limit)
+    self._limit = min(
+        max(
+            (1 - self._smoothing) * self._limit + self._smoothing * new_limit,
+            self._min_limit,
+        ),
+        self._max_limit,
+    )
+
+
+@dataclasses.dataclass
+class Admission:
+  """A slot granted by `FairScheduler.admit`.
+
+  Attributes:
+    queue_time: Time spent queued, in seconds.
+    dropped: Whether the request failed upstream. Set by `mark_dropped`, or if
+      the context exits with an exception.
+    aborted: Whether the caller gave up on the request, e.g. it was cancelled
+      or ran out of time. Set by `mark_aborted`. Aborted requests say nothing
+      about the upstream, so they neither count as dropped nor as a latency
+      sample.
+  """
+
+  queue_time: float
+  dropped: bool = False
+  aborted: bool = False
+
+  def mark_dropped(self) -> None:
+    self.dropped = True
+
+  def mark_aborted(self) -> None:
+    self.aborted = True
+
+
+@dataclasses.dataclass(order=True)
+class _Waiter:
+  priority: float
+  sequence: int
+  cost: float = dataclasses.field(compare=False)
+  tenant: str = dataclasses.field(compare=False)
+  event: threading.Event = dataclasses.field(
+      compare=False, default_factory=threading.Event
+  )
+  granted: bool = dataclasses.field(compare=False, default=False)
+  cancelled: bool = dataclasses.field(compare=False, default=False)
+
+
+class FairScheduler:
+  """Weighted fair admission of requests to a bounded number of slots.
+
+  Usage:
+    scheduler = FairScheduler(GradientLimit(8), weights={'interactive': 4})
+    with scheduler.admit(tenant, cost=expected_seconds) as admission:
+      if not call_upstream():
+        admission.mark_dropped()
+  """
+
+  def __init__(
+      self,
+      max_concurrency: int | ConcurrencyLimit,
+      *,
+      weights: Mapping[str, float] | None = None,
+      default_weight: float = 1.0,
+      max_queue_depth: int = 64,
+      rate: float = 0.0,
+      burst: float = 0.0,
+      aging: float = 1.0,
+      clock: Callable[[], float] = time.monotonic,
+  ):
+    """Initializes the scheduler.
+
+    Args:
+      max_concurrency: Maximum number of admitted requests at a time, fixed or
+        adaptive.
+      weights: Share of each tenant relative to `default_weight`.
+      default_weight: Weight of tenants not in `weights`.
+      max_queue_depth: Maximum number of queued requests per tenant.
+      rate: Requests per second allowed per tenant, or 0 for no limit.
+      burst: Token bucket capacity per tenant. Defaults to `rate`.
+      aging: Seconds of cost by which a request's priority improves for each
+        second it is queued. 0 orders each tenant's requests strictly by cost;
+        large values approach FIFO.
+      clock: Monotonic clock in seconds.
+    """
+    if isinstance(max_concurrency, int):
+      max_concurrency = ConcurrencyLimit(max_concurrency)
+    self._limit = max_concurrency
+    self._weights = dict(weights or {})
+    self._default_weight = default_weight
+    self._max_queue_depth = max_queue_depth
+    self._rate = rate
+    self._burst = burst or rate
+    self._aging = aging
+    self._clock = clock
+
+    self._lock = threading.Lock()
+    self._queues: dict[str, list[_Waiter]] = {}
+    self._sequence = itertools.count()
+    self._virtual_time = 0.0
+    self._last_finish: dict[str, float] = {}
+    self._queue_depth: collections.Counter[str] = collections.Counter()
+    self._buckets: dict[str, TokenBucket] = {}
+    self._stats: dict[str, TenantStats] = collections.defaultdict(TenantStats)
+    self._in_flight = 0
+
+  @property
+  def max_concurrency(self) -> int:
+    return self._limit.limit
+
+  @property
+  def in_flight(self) -> int:
+    return self._in_flight
+
+  @property
+  def queue_depth(self) -> int:
+    return sum(self._queue_depth.values())
+
+  def stats(self) -> dict[str, TenantStats]:
+    """Returns a snapshot of the statistics of each tenant."""
+    with self._lock:
+      return {
+          tenant: dataclasses.replace(
+              stats,
+              recent_queue_times=collections.deque(
+                  stats.recent_queue_times, maxlen=1024
+              ),
+          )
+          for tenant, stats in self._stats.items()
+      }
+
+  def _reject(self, tenant: str, reason: str) -> AdmissionRejected:
+    self._stats[tenant].rejected += 1
+    return AdmissionRejected(f'Tenant {tenant!r}: {reason}')
+
+  def _enqueue(self, tenant: str, cost: float, enqueued: float) -> _Waiter:
+    """Queues a request. Must be called with the lock held."""
+    # Ordering by cost + aging * enqueued is the same, at any time, as ordering
+    # by cost - aging * time queued.
+    waiter = _Waiter(
+        cost + self._aging * enqueued, next(self._sequence), cost, tenant
+    )
+    heapq.heappush(self._queues.setdefault(tenant, []), waiter)
+    self._queue_depth[tenant] += 1
+    return waiter
+
+  def _next(self) -> tuple[_Waiter, float, float] | None:
+    """Returns the next request with its start and finish tags, if any."""
+    best = None
+    for tenant, queue in list(self._queues.items()):
+      while queue and queue[0].cancelled:
+        heapq.heappop(queue)
+      if not queue:
+        del self._queues[tenant]
+        continue
+      head = queue[0]
+      weight = self._weights.get(tenant, self._default_weight)
+      start = max(self._virtual_time, self._last_finish.get(tenant, 0.0))
+      finish = start + head.cost / weight
+      if best is None or (finish, head.sequence) < (best[2], best[0].sequence):
+        best = head, start, finish
+    return best
+
+  def _dispatch(self) -> None:
+    """Grants free slots in finish time order. Must be called with the lock."""
+    while self._in_flight < self._limit.limit:
+      best = self._next()
+      if best is None:
+        return
+      waiter, start, finish = best
+      heapq.heappop(self._queues[waiter.tenant])
+      self._virtual_time = start
+      self._last_finish[waiter.tenant] = finish
+      self._queue_depth[waiter.tenant] -= 1
+      self._in_flight += 1
+      waiter.granted = True
+      waiter.event.set()
+
+  def _release(self, slowdown: float | None, dropped: bool) -> None:
+    with self._lock:
+      if slowdown is not None:
+        self._limit.update(slowdown, dropped=dropped, in_flight=self._in_flight)
+      self._in_flight -= 1
+      self._dispatch()
+
+  def _wait(self, waiter: _Waiter, timeout: float | None) -> None:
+    """Waits for `waiter` to be granted, or cancels it after `timeout`."""
+    if waiter.event.wait(timeout):
+      return
+    with self._lock:
+      if waiter.granted:
+        return
+      waiter.cancelled = True
+      self._queue_depth[waiter.tenant] -= 1
+      raise self._reject(waiter.tenant, f'queued for over {timeout:.3g}s')
+
+  @contextlib.contextmanager
+  def admit(
+      self, tenant: str, *, cost: float = 1.0, timeout: float | None = None
+  ) -> Iterator[Admission]:
+    """Waits for a slot and holds it for the duration of the context.
+
+    Args:
+      tenant: Tenant of the request.
+      cost: Expected cost of the request, e.g. from `CostModel.estimate`. It
+        orders the tenant's requests and is charged against its share.
+      timeout: Maximum time to wait in the queue, in seconds.
+
+    Yields:
+      The admission, to report a failed request with `mark_dropped`, or one the
+      caller gave up on with `mark_aborted`.
+
+    Raises:
+      AdmissionRejected: If the tenant exceeds its rate limit or queue depth,
+        or the request is not admitted within `timeout`.
+    """
+    enqueued = self._clock()
+    with self._lock:
+      if self._rate > 0:
+        bucket = self._buckets.get(tenant)
+        if bucket is None:
+          bucket = self._buckets[tenant] = TokenBucket(
+              self._rate, self._burst, clock=self._clock
+          )
+        if not bucket.try_acquire():
+          raise self._reject(tenant, f'rate limit of {self._rate:g}/s')
+      if self._queue_depth[tenant] >= self._max_queue_depth:
+        raise self._reject(
+            tenant, f'queue depth limit of {self._max_queue_depth}'
+        )
+      waiter = self._enqueue(tenant, cost, enqueued)
+      self._dispatch()
+    self._wait(waiter, timeout)
+
+    queue_time = self._clock() - enqueued
+    with self._lock:
+      stats = self._stats[tenant]
+      stats.admitted += 1
+      stats.queue_time_total += queue_time
+      stats.queue_time_max = max(stats.queue_time_max, queue_time)
+      stats.recent_queue_times.append(queue_time)
+    admission = Admission(queue_time)
+    start = self._clock()
+    try:
+      yield admission
+    except BaseException:
+      if not admission.aborted:
+        admission.mark_dropped()
+      raise
+    finally:
+      if admission.aborted:
+        self._release(None, dropped=False)
+      else:
+        latency = self._clock() - start
+        self._release(
+            latency / cost if cost > 0 else latency, admission.dropped
+        )
@@ -0,0 +1,150 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+
+from . import admission
+
+
+class CostModelTest(absltest.TestCase):
+
+  def test_cold_start_uses_priors_and_floor(self):
+    model = admission.CostModel(
+        priors={'score_variant': 2.0},
+        min_costs={'metadata': 0.01},
+        default_min_cost=0.5,
+    )
+    interval = {'interval': {'start': 0, 'end': 2**20}}
+    self.assertAlmostEqual(
+        model.estimate(admission.request_features('score_variant', interval)),
+        2.0,
+    )
+    self.assertAlmostEqual(
+        model.estimate(admission.request_features('metadata', {})), 0.01
+    )
+    self.assertAlmostEqual(
+        model.estimate(admission.request_features('predict_sequence', {})), 0.5
+    )
+
+  def test_observations_update_estimate(self):
+    model = admission.CostModel(default_min_cost=0.0, smoothing=0.5)
+    features = admission.request_features(
+        'predict_interval', {'interval': {'start': 0, 'end': 2**20}}
+    )
+    model.observe(features, 4.0)
+    self.assertAlmostEqual(model.estimate(features), 4.0)
+    model.observe(features, 2.0)
+    self.assertAlmostEqual(model.estimate(features), 3.0)
+
+
+class AimdLimitTest(absltest.TestCase):
+
+  def test_grows_additively_while_used(self):
+    limit = admission.AimdLimit(4, max_limit=6)
+    for _ in range(4):
+      limit.update(1.0, dropped=False, in_flight=4)
+    self.assertEqual(limit.limit, 4)
+    for _ in range(20):
+      limit.update(1.0, dropped=False, in_flight=4)
+    self.assertEqual(limit.limit, 6)
+
+  def test_does_not_grow_while_underused(self):
+    limit = admission.AimdLimit(8)
+    for _ in range(100):
+      limit.update(1.0, dropped=False, in_flight=3)
+    self.assertEqual(limit.limit, 8)
+
+  def test_backs_off_on_drops_and_slowdowns(self):
+    limit = admission.AimdLimit(
+        10, min_limit=2, backoff=0.5, slowdown_threshold=2.0
+    )
+    limit.update(1.0, dropped=True, in_flight=10)
+    self.assertEqual(limit.limit, 5)
+    limit.update(3.0, dropped=False, in_flight=10)
+    self.assertEqual(limit.limit, 2)
+    limit.update(3.0, dropped=False, in_flight=10)
+    self.assertEqual(limit.limit, 2)
+
+
+class GradientLimitTest(absltest.TestCase):
+
+  def _update(self, limit, slowdown, count):
+    for _ in range(count):
+      limit.update(slowdown, dropped=False, in_flight=limit.limit)
+
+  def test_grows_while_latency_is_flat(self):
+    limit = admission.GradientLimit(4, max_limit=32)
+    self._update(limit, 1.0, 100)
+    self.assertEqual(limit.limit, 32)
+
+  def test_shrinks_when_latency_rises(self):
+    limit = admission.GradientLimit(32, max_limit=32)
+    self._update(limit, 1.0, 10)
+    self.assertEqual(limit.limit, 32)
+    self._update(limit, 4.0, 100)
+    self.assertLess(limit.limit, 8)
+
+  def test_baseline_follows_lasting_changes(self):
+    limit = admission.GradientLimit(16, max_limit=16, baseline_window=10)
+    self._update(limit, 1.0, 10)
+    self._update(limit, 4.0, 10)
+    self.assertLess(limit.limit, 16)
+    # The slower upstream becomes the new baseline.
+    self._update(limit, 4.0, 100)
+    self.assertEqual(limit.limit, 16)
+
+  def test_backs_off_on_drops(self):
+    limit = admission.GradientLimit(10, min_limit=8)
+    limit.update(1.0, dropped=True, in_flight=10)
+    self.assertEqual(limit.limit, 9)
+    limit.update(1.0, dropped=True, in_flight=10)
+    limit.update(1.0, dropped=True, in_flight=10)
+    self.assertEqual(limit.limit, 8)
+
+
+class _RecordingLimit(admission.ConcurrencyLimit):
+
+  def __init__(self, limit):
+    super().__init__(limit)
+    self.updates = []
+
+  def update(self, slowdown, *, dropped, in_flight):
+    self.updates.append((slowdown, dropped))
+
+
+class FairSchedulerTest(absltest.TestCase):
+
+  def test_failed_request_is_dropped(self):
+    limit = _RecordingLimit(1)
+    scheduler = admission.FairScheduler(limit)
+    with self.assertRaises(RuntimeError):
+      with scheduler.admit('tenant'):
+        raise RuntimeError('upstream failed')
+    ((_, dropped),) = limit.updates
+    self.assertTrue(dropped)
+    self.assertEqual(scheduler.in_flight, 0)
+
+  def test_aborted_request_is_not_sampled(self):
+    limit = _RecordingLimit(1)
+    scheduler = admission.FairScheduler(limit)
+    with self.assertRaises(TimeoutError):
+      with scheduler.admit('tenant') as admitted:
+        admitted.mark_aborted()
+        raise TimeoutError('client went away')
+    self.assertEmpty(limit.updates)
+    self.assertEqual(scheduler.in_flight, 0)
+
+
+if __name__ == '__main__':
+  absltest.main()
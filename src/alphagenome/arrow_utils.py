@@ -0,0 +1,301 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utility functions for converting variant scores and tensors to Apache Arrow.
+
+Each `AnnData` returned by `score_variant` is converted to a record batch with
+one row per `obs` entry (e.g. gene). The score matrix is exposed as a
+fixed-size list column backed directly by the NumPy buffer of `X`, and the
+`var` (track) metadata is attached to the schema metadata as an embedded Arrow
+IPC table, so that it is written once per stream or Parquet file.
+
+Unpacked tensors (see `tensor_utils`) are exposed as Arrow arrays without
+copying by `tensor_to_arrow`, and converted back by `tensor_from_arrow`.
+"""
+
+from collections.abc import Iterable
+import functools
+import json
+import math
+import os
+
+import anndata
+import ml_dtypes
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Media type for Arrow IPC streams, see
+# https://www.iana.org/assignments/media-types/application/vnd.apache.arrow.stream
+ARROW_STREAM_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+PARQUET_MEDIA_TYPE = 'application/vnd.apache.parquet'
+
+_VAR_METADATA_KEY = b'alphagenome:var'
+_UNS_METADATA_KEY = b'alphagenome:uns'
+
+SCORES_COLUMN = 'scores'
+OBS_NAME_COLUMN = 'obs_name'
+VARIANT_COLUMN = 'variant'
+
+
+def _zero_copy_array(values: np.ndarray) -> pa.Array:
+  """Wraps a contiguous 1D NumPy array as an Arrow array without copying."""
+  values = np.ascontiguousarray(values)
+  return pa.Array.from_buffers(
+      pa.from_numpy_dtype(values.dtype),
+      values.size,
+      [None, pa.py_buffer(values)],
+  )
+
+
+def _table_to_ipc(table: pa.Table) -> bytes:
+  sink = pa.BufferOutputStream()
+  with pa.ipc.new_stream(sink, table.schema) as writer:
+    writer.write_table(table)
+  return sink.getvalue().to_pybytes()
+
+
+def anndata_to_record_batch(
+    adata: anndata.AnnData, *, variant: str | None = None
+) -> pa.RecordBatch:
+  """Converts an AnnData of variant scores to an Arrow record batch.
+
+  Args:
+    adata: AnnData with a dense `X` of shape [num_obs, num_var].
+    variant: Optional variant identifier added as a dictionary-encoded column,
+      so batches for different variants can be written to the same table.
+
+  Returns:
+    Record batch with an optional `variant` column, an `obs_name` column, one
+    column per `obs` column, and a fixed-size list `scores` column of length
+    `num_var` that shares memory with `adata.X`.
+  """
+  x = adata.X
+  if not isinstance(x, np.ndarray):
+    # Sparse or backed matrices need to be materialized once.
+    x = x.toarray() if hasattr(x, 'toarray') else np.asarray(x)
+  x = np.ascontiguousarray(x)
+
+  columns = {}
+  if variant is not None:
+    columns[VARIANT_COLUMN] = pa.DictionaryArray.from_arrays(
+        pa.array(np.zeros(adata.n_obs, dtype=np.int32)), pa.array([variant])
+    )
+  columns[OBS_NAME_COLUMN] = pa.array(adata.obs_names.astype(str))
+  obs = pa.Table.from_pandas(adata.obs, preserve_index=False)
+  for name, column in zip(obs.column_names, obs.columns):
+    columns[name] = column.combine_chunks()
+  columns[SCORES_COLUMN] = pa.FixedSizeListArray.from_arrays(
+      _zero_copy_array(x.reshape(-1)), adata.n_vars
+  )
+
+  var = pa.Table.from_pandas(adata.var, preserve_index=True)
+  metadata = {
+      _VAR_METADATA_KEY: _table_to_ipc(var),
+      _UNS_METADATA_KEY: json.dumps(
+          {str(key): str(value) for key, value in adata.uns.items()}
+      ).encode(),
+  }
+  return pa.RecordBatch.from_pydict(columns, metadata=metadata)
+
+
+def var_metadata(schema: pa.Schema) -> pd.DataFrame:
+  """Returns the `var` metadata stored in the schema of a score table."""
+  reader = pa.ipc.open_stream(schema.metadata[_VAR_METADATA_KEY])
+  return reader.read_all().to_pandas()
+
+
+def uns_metadata(schema: pa.Schema) -> dict[str, str]:
+  """Returns the stringified `uns` entries stored in the schema."""
+  return json.loads(schema.metadata.get(_UNS_METADATA_KEY, b'{}'))
+
+
+def score_matrix(batch: pa.RecordBatch | pa.Table) -> np.ndarray:
+  """Returns the [num_obs, num_var] score matrix of a batch or table.
+
+  For a single record batch the returned array is a view of the Arrow buffer.
+  """
+  scores = batch.column(SCORES_COLUMN)
+  if isinstance(scores, pa.ChunkedArray):
+    scores = scores.combine_chunks()
+  values = scores.flatten().to_numpy(zero_copy_only=False)
+  return values.reshape(len(scores), scores.type.list_size)
+
+
+def to_ipc_stream(batches: Iterable[pa.RecordBatch]) -> bytes:
+  """Serializes record batches sharing a schema to an Arrow IPC stream."""
+  sink = pa.BufferOutputStream()
+  writer = None
+  for batch in batches:
+    if writer is None:
+      writer = pa.ipc.new_stream(sink, batch.schema)
+    writer.write_batch(batch)
+  if writer is None:
+    raise ValueError('At least one record batch is required.')
+  writer.close()
+  return sink.getvalue().to_pybytes()
+
+
+def scores_to_ipc_stream(
+    adata: anndata.AnnData, *, variant: str | None = None
+) -> bytes:
+  """Converts an AnnData of variant scores to Arrow IPC stream bytes."""
+  return to_ipc_stream([anndata_to_record_batch(adata, variant=variant)])
+
+
+def read_ipc_stream(data: bytes) -> pa.Table:
+  """Reads an Arrow IPC stream produced by `to_ipc_stream`."""
+  register_extension_types()
+  return pa.ipc.open_stream(data).read_all()
+
+
+class ParquetScoreWriter:
+  """Appends variant scores for a single scorer to a Parquet file.
+
+  Intended for batch scoring, where many variants are scored with the same
+  scorer and hence share `var` metadata and schema. The file is opened lazily
+  with the schema of the first batch.
+
+  Usage:
+    with ParquetScoreWriter('scores.parquet') as writer:
+      for variant, scores in results:
+        writer.write(scores[0], variant=str(variant))
+  """
+
+  def __init__(
+      self, path: str | os.PathLike[str], *, compression: str = 'zstd'
+  ):
+    self._path = path
+    self._compression = compression
+    self._writer = None
+
+  def write(
+      self, adata: anndata.AnnData, *, variant: str | None = None
+  ) -> None:
+    """Appends the scores of a single variant as a row group."""
+    batch = anndata_to_record_batch(adata, variant=variant)
+    if self._writer is None:
+      self._writer = pq.ParquetWriter(
+          self._path, batch.schema, compression=self._compression
+      )
+    self._writer.write_batch(batch)
+
+  def close(self) -> None:
+    if self._writer is not None:
+      self._writer.close()
+      self._writer = None
+
+  def __enter__(self) -> 'ParquetScoreWriter':
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+
+class BFloat16Type(pa.ExtensionType):
+  """Arrow extension type for `ml_dtypes.bfloat16`, stored as uint16."""
+
+  def __init__(self):
+    super().__init__(pa.uint16(), 'ml_dtypes.bfloat16')
+
+  def __arrow_ext_serialize__(self) -> bytes:
+    return b''
+
+  @classmethod
+  def __arrow_ext_deserialize__(cls, storage_type, serialized):
+    del storage_type, serialized  # Unused.
+    return cls()
+
+
+@functools.cache
+def register_extension_types() -> None:
+  """Registers `BFloat16Type`, so that Arrow can read it back from IPC data.
+
+  Called by `tensor_to_arrow` and `read_ipc_stream`. Call it before reading
+  bfloat16 tensors from IPC streams or Parquet files by other means.
+  """
+  try:
+    pa.register_extension_type(BFloat16Type())
+  except pa.ArrowKeyError:
+    pass  # Already registered, e.g. by this module imported under another name.
+
+
+def _tensor_values(value: np.ndarray) -> pa.Array:
+  """Wraps the buffer of a C-contiguous array as a flat Arrow array."""
+  flat = value.reshape(-1)
+  if value.dtype == ml_dtypes.bfloat16:
+    storage = pa.Array.from_buffers(
+        pa.uint16(), flat.size, [None, pa.py_buffer(flat.view(np.uint16))]
+    )
+    return pa.ExtensionArray.from_storage(BFloat16Type(), storage)
+  if value.dtype == bool:
+    # Arrow booleans are bit-packed, so these are the one copy.
+    return pa.array(flat)
+  return _zero_copy_array(flat)
+
+
+def tensor_to_arrow(value: np.ndarray) -> pa.Array:
+  """Exposes an unpacked tensor as an Arrow array without copying.
+
+  The Arrow array shares memory with `value`, which can be the output of
+  `tensor_utils.unpack_proto`, a preallocated `out` buffer,
+  `tensor_utils.TensorAssembler.result` or a memory-mapped file, and keeps it
+  alive. bfloat16 values use the `BFloat16Type` extension type. Boolean tensors
+  are copied, as Arrow booleans are bit-packed.
+
+  Args:
+    value: C-contiguous array.
+
+  Returns:
+    For 1D arrays, a primitive array. Otherwise, a FixedShapeTensorArray with
+    one [*value.shape[1:]] tensor per row of `value`.
+
+  Raises:
+    ValueError: If `value` is not C-contiguous, as wrapping it would copy.
+  """
+  if not value.flags.c_contiguous:
+    raise ValueError('Only C-contiguous arrays can be exported without copies.')
+  register_extension_types()
+  values = _tensor_values(value)
+  if value.ndim <= 1:
+    return values
+  tensor_type = pa.fixed_shape_tensor(values.type, value.shape[1:])
+  storage = pa.FixedSizeListArray.from_arrays(
+      values, math.prod(value.shape[1:])
+  )
+  return pa.ExtensionArray.from_storage(tensor_type, storage)
+
+
+def tensor_from_arrow(array: pa.Array) -> np.ndarray:
+  """Inverse of `tensor_to_arrow`, returning a view of the Arrow buffer.
+
+  Args:
+    array: Array as returned by `tensor_to_arrow`, without nulls.
+
+  Returns:
+    Read-only NumPy array sharing memory with `array` (except for booleans).
+  """
+  if isinstance(array.type, pa.FixedShapeTensorType):
+    shape = (len(array), *array.type.shape)
+    values = array.storage.flatten()
+  else:
+    shape = (len(array),)
+    values = array
+  if isinstance(values.type, BFloat16Type):
+    flat = values.storage.to_numpy().view(ml_dtypes.bfloat16)
+  else:
+    flat = values.to_numpy(zero_copy_only=values.type != pa.bool_())
+  return flat.reshape(shape)
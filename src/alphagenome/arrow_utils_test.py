@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import anndata
+import ml_dtypes
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from . import arrow_utils
+
+
+class TensorToArrowTest(parameterized.TestCase):
+
+  @parameterized.parameters(
+      (np.float32, (5,)),
+      (np.float32, (2, 3, 4)),
+      (ml_dtypes.bfloat16, (4, 3)),
+      (np.int8, (6, 2)),
+  )
+  def test_round_trip_shares_memory(self, dtype, shape):
+    value = np.arange(np.prod(shape)).reshape(shape).astype(dtype)
+    array = arrow_utils.tensor_to_arrow(value)
+    self.assertLen(array, shape[0])
+    restored = arrow_utils.tensor_from_arrow(array)
+    np.testing.assert_array_equal(restored, value)
+    self.assertEqual(restored.dtype, value.dtype)
+    self.assertTrue(np.shares_memory(restored, value))
+
+  def test_bool_is_copied(self):
+    value = np.array([[True, False], [False, True]])
+    restored = arrow_utils.tensor_from_arrow(arrow_utils.tensor_to_arrow(value))
+    np.testing.assert_array_equal(restored, value)
+
+  def test_non_contiguous_raises(self):
+    with self.assertRaises(ValueError):
+      arrow_utils.tensor_to_arrow(np.zeros((4, 4), np.float32)[:, ::2])
+
+  def test_bfloat16_survives_ipc(self):
+    value = np.linspace(0, 1, 6).astype(ml_dtypes.bfloat16).reshape(3, 2)
+    table = pa.table({'x': arrow_utils.tensor_to_arrow(value)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+      writer.write_table(table)
+    restored = arrow_utils.read_ipc_stream(sink.getvalue().to_pybytes())
+    np.testing.assert_array_equal(
+        arrow_utils.tensor_from_arrow(restored.column('x').combine_chunks()),
+        value,
+    )
+
+
+class ScoresToArrowTest(absltest.TestCase):
+
+  def test_ipc_round_trip(self):
+    adata = anndata.AnnData(
+        np.arange(6, dtype=np.float32).reshape(2, 3),
+        obs=pd.DataFrame({'gene_type': ['a', 'b']}, index=['g1', 'g2']),
+        var=pd.DataFrame({'strand': ['+', '-', '.']}, index=['t1', 't2', 't3']),
+    )
+    table = arrow_utils.read_ipc_stream(
+        arrow_utils.scores_to_ipc_stream(adata, variant='chr1:10:A>T')
+    )
+    np.testing.assert_array_equal(arrow_utils.score_matrix(table), adata.X)
+    self.assertEqual(table.column('obs_name').to_pylist(), ['g1', 'g2'])
+    self.assertEqual(
+        table.column('variant').to_pylist(), ['chr1:10:A>T', 'chr1:10:A>T']
+    )
+    self.assertEqual(
+        list(arrow_utils.var_metadata(table.schema)['strand']), ['+', '-', '.']
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,330 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk scoring of BED regions using shared prediction windows.
+
+Scoring each region of a BED file with its own `ScoreInterval` call repeats
+the model forward pass for every overlapping region. Instead, regions are
+sorted and packed into fixed-width prediction windows, each window is predicted
+once, and the per-region aggregations are computed from the shared window output
+with vectorized masks.
+
+The width and aggregation type of a `GeneMaskIntervalScorer` are honoured, but
+not its gene masks: no gene annotation is available here, so each region is
+aggregated over all of its bins, as if the region itself were the gene mask.
+Scores therefore have one row per region rather than one per gene.
+"""
+
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+import dataclasses
+
+import numpy as np
+
+from .protos import dna_model_pb2
+
+
+# Widest sequence accepted by the model (1 MiB).
+DEFAULT_WINDOW_WIDTH = 2**20
+
+_BED_HEADER_PREFIXES = ('#', 'track', 'browser')
+
+
+@dataclasses.dataclass(frozen=True)
+class BedRegion:
+  """A single region of a BED file.
+
+  Attributes:
+    chromosome: Chromosome name.
+    start: 0-based start position (inclusive).
+    end: 0-based end position (exclusive).
+    name: Optional region name (4th BED column).
+    index: Position of the region within the input, used to keep output rows
+      traceable to their input line after sorting.
+  """
+
+  chromosome: str
+  start: int
+  end: int
+  name: str = ''
+  index: int = 0
+
+  @property
+  def width(self) -> int:
+    return self.end - self.start
+
+
+@dataclasses.dataclass(frozen=True)
+class PredictionWindow:
+  """A fixed-width interval that is predicted once for all of its regions."""
+
+  chromosome: str
+  start: int
+  end: int
+  regions: tuple[BedRegion, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class WindowPrediction:
+  """Track predictions for a single prediction window.
+
+  Attributes:
+    values: Array of shape [num_bins, num_tracks], where each bin covers
+      `resolution` base pairs starting at the window start.
+    resolution: Number of base pairs per bin.
+    track_names: Optional names for each of the tracks.
+  """
+
+  values: np.ndarray
+  resolution: int = 1
+  track_names: Sequence[str] | None = None
+
+
+def read_bed(lines: Iterable[str]) -> list[BedRegion]:
+  """Parses BED formatted lines into regions.
+
+  Comment, `track` and `browser` lines are skipped. Only the first four columns
+  are used.
+
+  Args:
+    lines: Iterable of BED formatted lines.
+
+  Returns:
+    List of regions in input order.
+
+  Raises:
+    ValueError: If a line has fewer than three columns or an empty range.
+  """
+  regions = []
+  for line_number, line in enumerate(lines, start=1):
+    line = line.strip()
+    if not line or line.startswith(_BED_HEADER_PREFIXES):
+      continue
+    fields = line.split('\t') if '\t' in line else line.split()
+    if len(fields) < 3:
+      raise ValueError(f'Line {line_number} has fewer than 3 columns: {line!r}')
+    region = BedRegion(
+        chromosome=fields[0],
+        start=int(fields[1]),
+        end=int(fields[2]),
+        name=fields[3] if len(fields) > 3 else '',
+        index=len(regions),
+    )
+    if region.end <= region.start:
+      raise ValueError(f'Line {line_number} has an empty range: {line!r}')
+    regions.append(region)
+  return regions
+
+
+def merge_regions(
+    regions: Iterable[BedRegion],
+    *,
+    window_width: int = DEFAULT_WINDOW_WIDTH,
+    chromosome_lengths: Mapping[str, int] | None = None,
+) -> list[PredictionWindow]:
+  """Sorts regions and packs them into shared prediction windows.
+
+  Regions are sorted by chromosome and start, then greedily grouped while the
+  span of the group fits within `window_width`. Overlapping regions (as in peak
+  sets) therefore always share a window when they fit. Each window is centered
+  on the span of its regions, and shifted to lie within its chromosome. Windows
+  always keep their full width.
+
+  Args:
+    regions: Regions to pack.
+    window_width: Width of each prediction window in base pairs.
+    chromosome_lengths: Length of each chromosome, e.g. from
+      `reference_genome.ReferenceGenome.chromosome_lengths`. If given, windows
+      end at the chromosome end at the latest, except on chromosomes shorter
+      than `window_width` (such as chrM): their windows start at 0 and extend
+      past the chromosome end, to be padded with N (see
+      `reference_genome.ReferenceGenome.fetch` with `pad=True`).
+
+  Returns:
+    List of prediction windows, sorted by chromosome and start.
+
+  Raises:
+    ValueError: If a region is wider than `window_width`, or extends past the
+      end of its chromosome.
+  """
+  windows = []
+  group = []
+  group_end = 0
+
+  def _flush():
+    span_start = group[0].start
+    center = (span_start + group_end) // 2
+    start = max(0, center - window_width // 2)
+    end = start + window_width
+    if chromosome_lengths is not None:
+      # Shift the window back from the chromosome end, as far as its start.
+      length = chromosome_lengths[group[0].chromosome]
+      start = max(0, min(start, length - window_width))
+      end = start + window_width
+    windows.append(
+        PredictionWindow(
+            chromosome=group[0].chromosome,
+            start=start,
+            end=end,
+            regions=tuple(group),
+        )
+    )
+
+  for region in sorted(regions, key=lambda r: (r.chromosome, r.start, r.end)):
+    if region.width > window_width:
+      raise ValueError(
+          f'Region {region.chromosome}:{region.start}-{region.end} is wider'
+          f' than {window_width=}.'
+      )
+    if chromosome_lengths is not None:
+      if region.chromosome not in chromosome_lengths:
+        raise ValueError(f'Unknown chromosome: {region.chromosome}')
+      if region.end > chromosome_lengths[region.chromosome]:
+        raise ValueError(
+            f'Region {region.chromosome}:{region.start}-{region.end} extends'
+            ' past the end of its chromosome'
+            f' ({chromosome_lengths[region.chromosome]}).'
+        )
+    if group and (
+        region.chromosome == group[0].chromosome
+        and max(group_end, region.end) - group[0].start <= window_width
+    ):
+      group.append(region)
+      group_end = max(group_end, region.end)
+      continue
+    if group:
+      _flush()
+    group = [region]
+    group_end = region.end
+  if group:
+    _flush()
+  return windows
+
+
+def region_masks(
+    window: PredictionWindow, num_bins: int, resolution: int = 1
+) -> np.ndarray:
+  """Returns a [num_regions, num_bins] mask of the bins covered by each region.
+
+  A bin is covered if it overlaps the region by at least one base pair.
+
+  Args:
+    window: Prediction window containing the regions.
+    num_bins: Number of bins in the window prediction.
+    resolution: Number of base pairs per bin.
+  """
+  starts = np.array([r.start for r in window.regions]) - window.start
+  ends = np.array([r.end for r in window.regions]) - window.start
+  lower = starts // resolution
+  upper = -(-ends // resolution)
+  bins = np.arange(num_bins)
+  return (bins >= lower[:, None]) & (bins < upper[:, None])
+
+
+def aggregate_regions(
+    window: PredictionWindow,
+    prediction: WindowPrediction,
+    scorer: dna_model_pb2.GeneMaskIntervalScorer,
+) -> np.ndarray:
+  """Aggregates the predictions over every region of a window.
+
+  If `scorer.width` is set, only the central `width` base pairs of each region
+  are aggregated, matching the interval scorer semantics. The scorer's gene
+  masks are not applied; each region is its own mask (see the module
+  docstring).
+
+  Args:
+    window: Prediction window containing the regions.
+    prediction: Model predictions for the window.
+    scorer: Interval scorer defining the width and aggregation type.
+
+  Returns:
+    Array of shape [num_regions, num_tracks] with the aggregated scores.
+  """
+  if scorer.width > 0:
+    window = dataclasses.replace(
+        window, regions=tuple(_center(r, scorer.width) for r in window.regions)
+    )
+  values = np.asarray(prediction.values, dtype=np.float32)
+  masks = region_masks(window, values.shape[0], prediction.resolution)
+  sums = masks.astype(np.float32) @ values
+  match scorer.aggregation_type:
+    case dna_model_pb2.IntervalAggregationType.INTERVAL_AGGREGATION_TYPE_SUM:
+      return sums
+    case _:
+      counts = masks.sum(axis=1, keepdims=True)
+      return sums / np.maximum(counts, 1)
+
+
+def _center(region: BedRegion, width: int) -> BedRegion:
+  if region.width <= width:
+    return region
+  start = region.start + (region.width - width) // 2
+  return dataclasses.replace(region, start=start, end=start + width)
+
+
+def score_regions(
+    regions: Iterable[BedRegion],
+    predict_fn: Callable[[PredictionWindow], WindowPrediction],
+    scorer: dna_model_pb2.GeneMaskIntervalScorer,
+    *,
+    window_width: int = DEFAULT_WINDOW_WIDTH,
+    chromosome_lengths: Mapping[str, int] | None = None,
+) -> Iterator[tuple[PredictionWindow, WindowPrediction, np.ndarray]]:
+  """Scores regions, running a single prediction per shared window.
+
+  Args:
+    regions: Regions to score.
+    predict_fn: Function returning the model predictions for a window.
+    scorer: Interval scorer to apply to each region.
+    window_width: Width of each prediction window in base pairs.
+    chromosome_lengths: Length of each chromosome, to keep windows within
+      their chromosome; see `merge_regions`.
+
+  Yields:
+    Tuples of (window, window prediction, [num_regions, num_tracks] scores),
+    lazily as each window is predicted.
+  """
+  windows = merge_regions(
+      regions, window_width=window_width, chromosome_lengths=chromosome_lengths
+  )
+  for window in windows:
+    prediction = predict_fn(window)
+    yield window, prediction, aggregate_regions(window, prediction, scorer)
+
+
+def iter_table(
+    results: Iterable[tuple[PredictionWindow, WindowPrediction, np.ndarray]],
+) -> Iterator[str]:
+  """Yields a tab-separated table of region scores, one window per chunk."""
+  header_written = False
+  for window, prediction, scores in results:
+    if not header_written:
+      track_names = prediction.track_names or [
+          f'track_{i}' for i in range(scores.shape[1])
+      ]
+      columns = ['chromosome', 'start', 'end', 'name', 'index', *track_names]
+      yield '\t'.join(columns) + '\n'
+      header_written = True
+    rows = []
+    for region, row in zip(window.regions, scores):
+      fields = [
+          region.chromosome,
+          str(region.start),
+          str(region.end),
+          region.name,
+          str(region.index),
+      ]
+      fields.extend(np.char.mod('%.6g', row))
+      rows.append('\t'.join(fields))
+    yield '\n'.join(rows) + '\n'
@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+import numpy as np
+
+from . import bed_scoring
+from .protos import dna_model_pb2
+
+
+class MergeRegionsTest(absltest.TestCase):
+
+  def test_overlapping_regions_share_a_window(self):
+    regions = bed_scoring.read_bed(
+        ['chr1\t100\t200\ta', 'chr1\t150\t300\tb', 'chr2\t0\t10\tc']
+    )
+    windows = bed_scoring.merge_regions(regions, window_width=1000)
+    self.assertLen(windows, 2)
+    self.assertEqual([r.name for r in windows[0].regions], ['a', 'b'])
+    self.assertEqual(windows[0].end - windows[0].start, 1000)
+
+  def test_windows_are_shifted_into_chromosome(self):
+    regions = [
+        bed_scoring.BedRegion('chr1', 0, 10),
+        bed_scoring.BedRegion('chr2', 4990, 5000),
+        bed_scoring.BedRegion('chrM', 10, 20),
+    ]
+    windows = bed_scoring.merge_regions(
+        regions,
+        window_width=1000,
+        chromosome_lengths={'chr1': 10_000, 'chr2': 5000, 'chrM': 500},
+    )
+    spans = [(w.chromosome, w.start, w.end) for w in windows]
+    self.assertEqual(
+        spans, [('chr1', 0, 1000), ('chr2', 4000, 5000), ('chrM', 0, 1000)]
+    )
+
+  def test_region_past_chromosome_end_raises(self):
+    with self.assertRaisesRegex(ValueError, 'past the end'):
+      bed_scoring.merge_regions(
+          [bed_scoring.BedRegion('chr1', 90, 110)],
+          chromosome_lengths={'chr1': 100},
+      )
+
+
+class AggregateRegionsTest(absltest.TestCase):
+
+  def test_mean_and_sum(self):
+    window = bed_scoring.PredictionWindow(
+        'chr1',
+        0,
+        8,
+        regions=(
+            bed_scoring.BedRegion('chr1', 0, 4),
+            bed_scoring.BedRegion('chr1', 2, 8),
+        ),
+    )
+    prediction = bed_scoring.WindowPrediction(
+        values=np.arange(8, dtype=np.float32)[:, None], resolution=1
+    )
+    scorer = dna_model_pb2.GeneMaskIntervalScorer(
+        aggregation_type=dna_model_pb2.INTERVAL_AGGREGATION_TYPE_SUM
+    )
+    np.testing.assert_array_equal(
+        bed_scoring.aggregate_regions(window, prediction, scorer), [[6], [27]]
+    )
+    scorer.aggregation_type = dna_model_pb2.INTERVAL_AGGREGATION_TYPE_MEAN
+    scorer.width = 2
+    np.testing.assert_array_equal(
+        bed_scoring.aggregate_regions(window, prediction, scorer),
+        [[1.5], [4.5]],
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
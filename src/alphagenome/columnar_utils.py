@@ -0,0 +1,356 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar encoding of splice junctions and track metadata.
+
+`JunctionData.junctions` and the `metadata` fields of `TrackData` and
+`JunctionData` hold one sub-message per junction or track, which is slow to
+build and parse for large outputs. The columnar alternatives store junctions as
+an `IntervalColumns` message of compressed tensors, and metadata as a
+`MetadataTable` holding an Arrow IPC stream. Both convert to and from pandas
+without creating a Python object per row.
+
+Streams of outputs usually repeat the same metadata in every response.
+`MetadataDeduplicator` sends each distinct table once per stream and refers to
+it by content hash afterwards; `MetadataCache` re-attaches it on the client.
+"""
+
+import collections
+from collections.abc import Iterable, Iterator
+import hashlib
+
+from google.protobuf import json_format
+from google.protobuf import message
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from . import tensor_utils
+from .protos import dna_model_pb2
+from .protos import tensor_pb2
+
+
+# Strand symbols used in DataFrames, matching `genome.Interval`.
+_STRAND_SYMBOLS = ('.', '+', '-')
+# Maps Strand values to indices of _STRAND_SYMBOLS and back.
+_STRAND_TO_SYMBOL_INDEX = np.array([0, 1, 2, 0], dtype=np.int8)
+_SYMBOL_INDEX_TO_STRAND = np.array(
+    [
+        dna_model_pb2.Strand.STRAND_UNSTRANDED,
+        dna_model_pb2.Strand.STRAND_POSITIVE,
+        dna_model_pb2.Strand.STRAND_NEGATIVE,
+    ],
+    dtype=np.int32,
+)
+
+
+def _pack_column(
+    values: np.ndarray, dtype: np.dtype, compression_type
+) -> tensor_pb2.Tensor:
+  packed, _ = tensor_utils.pack_tensor(
+      np.asarray(values, dtype=dtype), compression_type=compression_type
+  )
+  return packed
+
+
+def intervals_to_columns(
+    intervals: pd.DataFrame,
+    *,
+    compression_type: tensor_pb2.CompressionType = (
+        tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD
+    ),
+) -> dna_model_pb2.IntervalColumns:
+  """Encodes intervals as columns.
+
+  Args:
+    intervals: DataFrame with `chromosome`, `start` and `end` columns and an
+      optional `strand` column of '+', '-' or '.'.
+    compression_type: Compression type of the column tensors.
+
+  Returns:
+    IntervalColumns proto.
+
+  Raises:
+    ValueError: If a strand is not one of '+', '-' or '.'.
+  """
+  codes, names = pd.factorize(intervals['chromosome'], sort=False)
+  if 'strand' in intervals:
+    strand_index = pd.Categorical(
+        intervals['strand'], categories=_STRAND_SYMBOLS
+    ).codes
+    if (strand_index < 0).any():
+      raise ValueError(f'Strands must be one of {_STRAND_SYMBOLS}.')
+    strand = _SYMBOL_INDEX_TO_STRAND[strand_index]
+  else:
+    strand = np.full(
+        len(intervals), dna_model_pb2.Strand.STRAND_UNSTRANDED, np.int32
+    )
+  return dna_model_pb2.IntervalColumns(
+      chromosome_names=[str(name) for name in names],
+      chromosome_index=_pack_column(codes, np.int32, compression_type),
+      start=_pack_column(intervals['start'], np.int64, compression_type),
+      end=_pack_column(intervals['end'], np.int64, compression_type),
+      strand=_pack_column(strand, np.int32, compression_type),
+  )
+
+
+def intervals_from_columns(
+    columns: dna_model_pb2.IntervalColumns,
+) -> pd.DataFrame:
+  """Decodes IntervalColumns to a DataFrame.
+
+  Args:
+    columns: IntervalColumns proto.
+
+  Returns:
+    DataFrame with categorical `chromosome` and `strand` columns and int64
+    `start` and `end` columns.
+  """
+  strand = tensor_utils.unpack_proto(columns.strand)
+  return pd.DataFrame({
+      'chromosome': pd.Categorical.from_codes(
+          tensor_utils.unpack_proto(columns.chromosome_index),
+          categories=list(columns.chromosome_names),
+      ),
+      'start': tensor_utils.unpack_proto(columns.start),
+      'end': tensor_utils.unpack_proto(columns.end),
+      'strand': pd.Categorical.from_codes(
+          _STRAND_TO_SYMBOL_INDEX[strand], categories=_STRAND_SYMBOLS
+      ),
+  })
+
+
+def intervals_from_protos(
+    intervals: Iterable[dna_model_pb2.Interval],
+) -> pd.DataFrame:
+  """Converts repeated Interval protos to the `intervals_from_columns` form."""
+  chromosome, start, end, strand = [], [], [], []
+  for interval in intervals:
+    chromosome.append(interval.chromosome)
+    start.append(interval.start)
+    end.append(interval.end)
+    strand.append(interval.strand)
+  return pd.DataFrame({
+      'chromosome': pd.Categorical(chromosome),
+      'start': np.array(start, dtype=np.int64),
+      'end': np.array(end, dtype=np.int64),
+      'strand': pd.Categorical.from_codes(
+          _STRAND_TO_SYMBOL_INDEX[np.array(strand, dtype=np.int32)],
+          categories=_STRAND_SYMBOLS,
+      ),
+  })
+
+
+def metadata_to_table(metadata: pd.DataFrame) -> dna_model_pb2.MetadataTable:
+  """Encodes a metadata DataFrame as a MetadataTable.
+
+  Args:
+    metadata: DataFrame with one row per track. The index is not stored.
+
+  Returns:
+    MetadataTable proto.
+  """
+  table = pa.Table.from_pandas(metadata, preserve_index=False)
+  sink = pa.BufferOutputStream()
+  with pa.ipc.new_stream(sink, table.schema) as writer:
+    writer.write_table(table)
+  return dna_model_pb2.MetadataTable(arrow_ipc=sink.getvalue().to_pybytes())
+
+
+def metadata_from_table(table: dna_model_pb2.MetadataTable) -> pd.DataFrame:
+  """Decodes a MetadataTable to a DataFrame with one row per track."""
+  return pa.ipc.open_stream(table.arrow_ipc).read_all().to_pandas()
+
+
+def metadata_from_protos(metadata: Iterable[message.Message]) -> pd.DataFrame:
+  """Converts repeated metadata protos to a DataFrame.
+
+  Nested messages are flattened to dotted column names, e.g.
+  `ontology_term.id`, and enums are kept as their names.
+
+  Args:
+    metadata: TrackMetadata or JunctionMetadata protos.
+
+  Returns:
+    DataFrame with one row per proto.
+  """
+  return pd.json_normalize([
+      json_format.MessageToDict(item, preserving_proto_field_name=True)
+      for item in metadata
+  ])
+
+
+def to_columnar(
+    data: dna_model_pb2.TrackData | dna_model_pb2.JunctionData,
+) -> None:
+  """Replaces repeated metadata and junction fields by their columnar form.
+
+  Args:
+    data: TrackData or JunctionData proto, modified in place.
+  """
+  if data.metadata:
+    data.metadata_table.CopyFrom(
+        metadata_to_table(metadata_from_protos(data.metadata))
+    )
+    del data.metadata[:]
+  if isinstance(data, dna_model_pb2.JunctionData) and data.junctions:
+    data.junction_columns.CopyFrom(
+        intervals_to_columns(intervals_from_protos(data.junctions))
+    )
+    del data.junctions[:]
+
+
+def metadata_dataframe(
+    data: dna_model_pb2.TrackData | dna_model_pb2.JunctionData,
+) -> pd.DataFrame:
+  """Returns the metadata of TrackData or JunctionData in either encoding."""
+  if data.HasField('metadata_table'):
+    return metadata_from_table(data.metadata_table)
+  return metadata_from_protos(data.metadata)
+
+
+def junctions_dataframe(data: dna_model_pb2.JunctionData) -> pd.DataFrame:
+  """Returns the junctions of JunctionData in either encoding."""
+  if data.HasField('junction_columns'):
+    return intervals_from_columns(data.junction_columns)
+  return intervals_from_protos(data.junctions)
+
+
+def metadata_hash(table: dna_model_pb2.MetadataTable) -> str:
+  """Returns the content hash of the Arrow IPC data of a MetadataTable."""
+  return hashlib.blake2b(table.arrow_ipc, digest_size=16).hexdigest()
+
+
+def _outputs(response: message.Message) -> list[dna_model_pb2.Output]:
+  """Returns the Output messages set on a response (or the Output itself)."""
+  if isinstance(response, dna_model_pb2.Output):
+    return [response]
+  return [
+      value
+      for _, value in response.ListFields()
+      if isinstance(value, dna_model_pb2.Output)
+  ]
+
+
+def _output_data(
+    output: dna_model_pb2.Output,
+) -> dna_model_pb2.TrackData | dna_model_pb2.JunctionData | None:
+  match output.WhichOneof('payload'):
+    case 'track_data':
+      return output.track_data
+    case 'junction_data':
+      return output.junction_data
+    case _:
+      return None
+
+
+class MetadataDeduplicator:
+  """Replaces metadata already sent on a stream by its content hash.
+
+  Use one instance per response stream. Metadata is converted to its columnar
+  form (see `to_columnar`); the first occurrence of each distinct table is sent
+  in full with its hash set, and later occurrences only carry the hash.
+
+  Usage:
+    deduplicator = MetadataDeduplicator()
+    for response in responses:
+      deduplicator.deduplicate(response)
+      yield response
+  """
+
+  def __init__(self, max_entries: int = 1024):
+    """Initializes the deduplicator.
+
+    Args:
+      max_entries: Maximum number of hashes to remember. Tables evicted from
+        this LRU set are sent in full again.
+    """
+    self._max_entries = max_entries
+    self._sent = collections.OrderedDict()
+    self.bytes_saved = 0
+
+  def deduplicate(self, response: message.Message) -> None:
+    """Deduplicates the metadata of a response or Output in place."""
+    for output in _outputs(response):
+      data = _output_data(output)
+      if data is None:
+        continue
+      to_columnar(data)
+      table = data.metadata_table
+      if not table.arrow_ipc:
+        continue
+      key = metadata_hash(table)
+      table.content_hash = key
+      if key in self._sent:
+        self._sent.move_to_end(key)
+        self.bytes_saved += len(table.arrow_ipc)
+        table.ClearField('arrow_ipc')
+      else:
+        self._sent[key] = None
+        if len(self._sent) > self._max_entries:
+          self._sent.popitem(last=False)
+
+
+class MetadataCache:
+  """Re-attaches metadata deduplicated by `MetadataDeduplicator`.
+
+  Use one instance per response stream, or share one across streams. Tables
+  are kept for the lifetime of the cache.
+  """
+
+  def __init__(self):
+    self._tables = {}
+
+  def reattach(self, response: message.Message) -> None:
+    """Restores the metadata of a response or Output in place.
+
+    Args:
+      response: Response or Output received from a deduplicating stream.
+
+    Raises:
+      KeyError: If the response refers to a table not seen before.
+    """
+    for output in _outputs(response):
+      data = _output_data(output)
+      if data is None or not data.metadata_table.content_hash:
+        continue
+      table = data.metadata_table
+      if table.arrow_ipc:
+        self._tables[table.content_hash] = table.arrow_ipc
+      else:
+        try:
+          table.arrow_ipc = self._tables[table.content_hash]
+        except KeyError:
+          raise KeyError(
+              f'Unknown metadata table {table.content_hash}; responses must be'
+              ' passed to the cache in stream order.'
+          ) from None
+
+
+def reattach_metadata(
+    responses: Iterable[message.Message], cache: MetadataCache | None = None
+) -> Iterator[message.Message]:
+  """Yields responses of a deduplicating stream with their metadata restored.
+
+  Args:
+    responses: Responses in stream order, e.g. a gRPC response iterator.
+    cache: Optional cache to share across streams.
+
+  Yields:
+    The responses, modified in place.
+  """
+  cache = MetadataCache() if cache is None else cache
+  for response in responses:
+    cache.reattach(response)
+    yield response
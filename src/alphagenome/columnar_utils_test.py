@@ -0,0 +1,167 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import numpy as np
+import pandas as pd
+
+from . import columnar_utils
+from .protos import dna_model_pb2
+from .protos import tensor_pb2
+
+_Strand = dna_model_pb2.Strand
+
+
+def _track_metadata(names):
+  return [
+      dna_model_pb2.TrackMetadata(
+          name=name,
+          strand=_Strand.STRAND_POSITIVE if i % 2 else _Strand.STRAND_NEGATIVE,
+          ontology_term=dna_model_pb2.OntologyTerm(id=i + 1),
+          assay='DNase-seq' if i % 2 else 'ATAC-seq',
+      )
+      for i, name in enumerate(names)
+  ]
+
+
+def _track_output(names):
+  return dna_model_pb2.Output(
+      track_data=dna_model_pb2.TrackData(metadata=_track_metadata(names))
+  )
+
+
+class IntervalColumnsTest(parameterized.TestCase):
+
+  @parameterized.parameters(
+      tensor_pb2.CompressionType.COMPRESSION_TYPE_NONE,
+      tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD,
+  )
+  def test_round_trip(self, compression_type):
+    intervals = pd.DataFrame({
+        'chromosome': ['chr1', 'chr2', 'chr1', 'chrX'],
+        'start': [0, 10, 2**40, 5],
+        'end': [100, 20, 2**40 + 1, 6],
+        'strand': ['+', '-', '.', '+'],
+    })
+    restored = columnar_utils.intervals_from_columns(
+        columnar_utils.intervals_to_columns(
+            intervals, compression_type=compression_type
+        )
+    )
+    pd.testing.assert_frame_equal(
+        restored.astype({'chromosome': str, 'strand': str}), intervals
+    )
+
+  def test_missing_strand_is_unstranded(self):
+    intervals = pd.DataFrame({'chromosome': ['chr1'], 'start': [1], 'end': [2]})
+    restored = columnar_utils.intervals_from_columns(
+        columnar_utils.intervals_to_columns(intervals)
+    )
+    self.assertEqual(list(restored['strand']), ['.'])
+
+  def test_unknown_strand_raises(self):
+    intervals = pd.DataFrame(
+        {'chromosome': ['chr1'], 'start': [1], 'end': [2], 'strand': ['?']}
+    )
+    with self.assertRaises(ValueError):
+      columnar_utils.intervals_to_columns(intervals)
+
+  def test_matches_protos(self):
+    junctions = [
+        dna_model_pb2.Interval(
+            chromosome='chr1', start=10, end=20, strand=_Strand.STRAND_POSITIVE
+        ),
+        dna_model_pb2.Interval(
+            chromosome='chr2', start=5, end=8, strand=_Strand.STRAND_NEGATIVE
+        ),
+    ]
+    data = dna_model_pb2.JunctionData(junctions=junctions)
+    expected = columnar_utils.junctions_dataframe(data)
+    columnar_utils.to_columnar(data)
+    self.assertEmpty(data.junctions)
+    self.assertTrue(data.HasField('junction_columns'))
+    pd.testing.assert_frame_equal(
+        columnar_utils.junctions_dataframe(data).astype({'chromosome': str}),
+        expected.astype({'chromosome': str}),
+    )
+
+
+class MetadataTableTest(absltest.TestCase):
+
+  def test_round_trip(self):
+    metadata = pd.DataFrame({
+        'name': ['a', 'b', 'c'],
+        'id': np.array([1, 2, 3], dtype=np.int64),
+        'score': [0.5, np.nan, 2.0],
+        'assay': ['DNase-seq', None, 'ATAC-seq'],
+    })
+    table = columnar_utils.metadata_to_table(metadata)
+    pd.testing.assert_frame_equal(
+        columnar_utils.metadata_from_table(table), metadata
+    )
+
+  def test_to_columnar(self):
+    data = _track_output(['a', 'b', 'c']).track_data
+    expected = columnar_utils.metadata_dataframe(data)
+    self.assertEqual(list(expected['ontology_term.id']), ['1', '2', '3'])
+    columnar_utils.to_columnar(data)
+    self.assertEmpty(data.metadata)
+    pd.testing.assert_frame_equal(
+        columnar_utils.metadata_dataframe(data), expected
+    )
+
+
+class MetadataDeduplicatorTest(absltest.TestCase):
+
+  def test_sends_each_table_once(self):
+    deduplicator = columnar_utils.MetadataDeduplicator()
+    first, second = _track_output(['a', 'b']), _track_output(['a', 'b'])
+    deduplicator.deduplicate(first)
+    deduplicator.deduplicate(second)
+    first_table = first.track_data.metadata_table
+    second_table = second.track_data.metadata_table
+    self.assertNotEmpty(first_table.arrow_ipc)
+    self.assertEqual(
+        first_table.content_hash, columnar_utils.metadata_hash(first_table)
+    )
+    self.assertEmpty(second_table.arrow_ipc)
+    self.assertEqual(second_table.content_hash, first_table.content_hash)
+    self.assertEqual(deduplicator.bytes_saved, len(first_table.arrow_ipc))
+
+    responses = list(columnar_utils.reattach_metadata([first, second]))
+    self.assertEqual(responses, [first, second])
+    self.assertEqual(second_table.arrow_ipc, first_table.arrow_ipc)
+
+  def test_evicted_tables_are_sent_again(self):
+    deduplicator = columnar_utils.MetadataDeduplicator(max_entries=1)
+    outputs = [_track_output(names) for names in ('a', 'b', 'a', 'a')]
+    for output in outputs:
+      deduplicator.deduplicate(output)
+    self.assertEqual(
+        [bool(o.track_data.metadata_table.arrow_ipc) for o in outputs],
+        [True, True, True, False],
+    )
+
+  def test_unknown_hash_raises(self):
+    deduplicator = columnar_utils.MetadataDeduplicator()
+    first, second = _track_output(['a']), _track_output(['a'])
+    deduplicator.deduplicate(first)
+    deduplicator.deduplicate(second)
+    with self.assertRaisesRegex(KeyError, 'Unknown metadata table'):
+      list(columnar_utils.reattach_metadata([second]))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -4,8 +4,21 @@ import logging
 import requests
 import os
 import base64
+import dataclasses
+import hashlib
+import ipaddress
 import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from google.protobuf.json_format import MessageToDict, ParseDict
+from src.alphagenome import admission
+from src.alphagenome import columnar_utils
+from src.alphagenome import message_stream
+from src.alphagenome import sequence_codec
+from src.alphagenome import upstream
+from src.alphagenome import variant_score_index
 from src.alphagenome.protos import dna_model_pb2, dna_model_service_pb2_grpc
 
 # Configure logging first
@@ -32,11 +45,160 @@ except ImportError:
     logger.warning("python-dotenv not available, using system environment variables")
 
 # Configuration
-JSON_SERVICE_BASE_URL = os.getenv("JSON_SERVICE_BASE_URL", "http://127.0.0.1:8000")
+# Comma-separated list of JSON service endpoints
+JSON_SERVICE_BASE_URLS = [
+    url.strip() for url in os.getenv("JSON_SERVICE_BASE_URL", "http://127.0.0.1:8000").split(",") if url.strip()
+]
 API_KEY = os.getenv("ALPHAGENOME_API_KEY", "")
 API_KEY_HEADER = os.getenv("API_KEY_HEADER", "Authorization")
 API_KEY_PREFIX = os.getenv("API_KEY_PREFIX", "Bearer ")
 
+# Clients opt into columnar (Arrow IPC) score results with this gRPC metadata key
+OUTPUT_FORMAT_METADATA_KEY = "x-alphagenome-output-format"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Clients opt into quantized track values (bfloat16, float16, int8 or uint8) with this gRPC
+# metadata key; it is forwarded to the JSON service as an HTTP header
+QUANTIZATION_METADATA_KEY = "x-alphagenome-quantization"
+QUANTIZATION_HEADER = "X-AlphaGenome-Quantization"
+
+# Clients that re-attach metadata (columnar_utils.MetadataCache) opt into receiving each distinct
+# metadata table once per stream, and only its content hash afterwards, with this gRPC metadata key.
+# Only PredictSequence and PredictInterval outputs carry metadata; the service's predict_variant
+# JSON has none, so PredictVariant streams are not deduplicated
+METADATA_DEDUP_METADATA_KEY = "x-alphagenome-metadata-dedup"
+
+
+def _metadata_deduplicator(context):
+    """Per-stream metadata deduplicator, if the client asked for one"""
+    metadata = dict(context.invocation_metadata() or ())
+    if metadata.get(METADATA_DEDUP_METADATA_KEY) == 'stream':
+        return columnar_utils.MetadataDeduplicator()
+    return None
+
+# Optional memory-mapped index of precomputed ScoreVariant responses, checked before going upstream
+VARIANT_SCORE_INDEX_PATH = os.getenv("VARIANT_SCORE_INDEX_PATH", "")
+VARIANT_SCORE_INDEX = (
+    variant_score_index.ReloadingVariantScoreIndex(VARIANT_SCORE_INDEX_PATH)
+    if VARIANT_SCORE_INDEX_PATH else None
+)
+
+# Admission control: upstream calls are limited to PROXY_MAX_CONCURRENCY at a time and shared
+# between tenants (client API keys) by weighted fair queuing, so one batch job cannot starve
+# interactive users. PROXY_TENANT_WEIGHTS is a comma separated list of tenant=weight.
+# Each tenant's queue runs the cheapest expected request first, aged by PROXY_SJF_AGING seconds
+# of cost per second queued; expected costs are learned online from upstream latencies.
+# PROXY_CONCURRENCY_LIMIT=gradient|aimd adapts the limit (starting at PROXY_MAX_CONCURRENCY, at
+# most PROXY_MAX_CONCURRENCY_LIMIT) to upstream latency and errors; calls queued for longer than
+# PROXY_QUEUE_TIMEOUT seconds are shed
+TENANT_METADATA_KEY = "x-alphagenome-tenant"
+# Callers without an API key may only name their tenant in TENANT_METADATA_KEY when they connect
+# from PROXY_TRUSTED_TENANT_NETWORKS (comma separated CIDRs, e.g. of an internal gateway)
+TRUSTED_TENANT_NETWORKS = [
+    ipaddress.ip_network(network.strip())
+    for network in os.getenv("PROXY_TRUSTED_TENANT_NETWORKS", "").split(",") if network.strip()
+]
+GRPC_MAX_WORKERS = int(os.getenv("PROXY_GRPC_WORKERS", "32"))
+STATS_INTERVAL = float(os.getenv("PROXY_STATS_INTERVAL", "60"))
+METRICS_PORT = int(os.getenv("PROXY_METRICS_PORT", "0"))
+QUEUE_TIMEOUT = float(os.getenv("PROXY_QUEUE_TIMEOUT", "5")) or None
+
+
+def _concurrency_limit():
+    initial = int(os.getenv("PROXY_MAX_CONCURRENCY", "8"))
+    max_limit = int(os.getenv("PROXY_MAX_CONCURRENCY_LIMIT", "64"))
+    algorithm = os.getenv("PROXY_CONCURRENCY_LIMIT", "gradient")
+    if algorithm == "gradient":
+        return admission.GradientLimit(initial, max_limit=max_limit)
+    if algorithm == "aimd":
+        return admission.AimdLimit(initial, max_limit=max_limit)
+    return initial
+
+
+SCHEDULER = admission.FairScheduler(
+    _concurrency_limit(),
+    weights={
+        tenant.strip(): float(weight)
+        for tenant, _, weight in (
+            item.partition("=") for item in os.getenv("PROXY_TENANT_WEIGHTS", "").split(",") if item.strip()
+        )
+    },
+    max_queue_depth=int(os.getenv("PROXY_MAX_QUEUE_DEPTH", "64")),
+    rate=float(os.getenv("PROXY_TENANT_RATE", "0")),
+    burst=float(os.getenv("PROXY_TENANT_BURST", "0")),
+    aging=float(os.getenv("PROXY_SJF_AGING", "1"))
+)
+# Until upstream latencies are observed, costs are seeded with rough seconds per unit of work
+# (a 1 MiB interval with one output or scorer), and no call is expected to be cheaper than the
+# round trip to the model
+COST_MODEL = admission.CostModel(
+    priors={
+        "predict_sequence": 1.0,
+        "predict_interval": 1.0,
+        "predict_variant": 2.0,
+        "score_interval": 1.0,
+        "score_variant": 2.0,
+        "score_ism_variant": 2.0,
+    },
+    min_costs={"metadata": 0.05},
+    default_min_cost=float(os.getenv("PROXY_MIN_REQUEST_COST", "0.5")),
+)
+
+
+UPSTREAM_RPCS = (
+    "predict_sequence",
+    "predict_interval",
+    "predict_variant",
+    "score_interval",
+    "score_variant",
+    "score_ism_variant",
+    "metadata",
+)
+
+
+def _retry_policies():
+    """Per-RPC retry policies; latency-sensitive RPCs are hedged"""
+    max_attempts = int(os.getenv("PROXY_RETRY_MAX_ATTEMPTS", "3"))
+    hedge_quantile = float(os.getenv("PROXY_HEDGE_QUANTILE", "0.95")) or None
+    hedged = {rpc.strip() for rpc in os.getenv("PROXY_HEDGED_RPCS", "predict_sequence,predict_interval,metadata").split(",")}
+    policies = {
+        rpc: upstream.RetryPolicy(
+            max_attempts=max_attempts,
+            hedge_quantile=hedge_quantile if rpc in hedged else None,
+        )
+        for rpc in UPSTREAM_RPCS
+    }
+    # ISM calls are the most expensive; retry them at most once
+    policies["score_ism_variant"] = dataclasses.replace(
+        policies["score_ism_variant"], max_attempts=min(max_attempts, 2)
+    )
+    return policies
+
+
+UPSTREAM = upstream.UpstreamClient(
+    upstream.LoadBalancer(
+        JSON_SERVICE_BASE_URLS,
+        strategy=os.getenv("PROXY_LB_STRATEGY", "least_loaded"),
+        max_utilization=float(os.getenv("PROXY_LB_MAX_UTILIZATION", "2")) or None,
+        # Each endpoint has its own breaker, so a failing endpoint is ejected on its own
+        breaker_factory=lambda: upstream.CircuitBreaker(
+            failure_threshold=int(os.getenv("PROXY_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("PROXY_BREAKER_RESET", "30")),
+        ),
+    ),
+    policies=_retry_policies(),
+    # Hedged calls use up to two threads, and each gRPC worker makes one call at a time
+    max_hedge_workers=2 * GRPC_MAX_WORKERS,
+)
+HEALTH_CHECK_INTERVAL = float(os.getenv("PROXY_HEALTH_CHECK_INTERVAL", "10"))
+
+
+def _affinity_key(rpc, json_payload):
+    """Canonical key of a request, so identical requests reach the backend that cached them"""
+    if rpc == "score_variant":
+        return variant_score_index.key_from_request(json_payload)
+    return json.dumps([rpc, json_payload], sort_keys=True, separators=(",", ":"))
+
 # Check API key configuration
 if API_KEY:
     logger.info(f"API key configured, will be sent in {API_KEY_HEADER} header")
@@ -44,11 +206,15 @@ else:
     logger.warning("No API key configured. Set ALPHAGENOME_API_KEY environment variable if needed.")
 
 
-def _get_headers(content_type='application/json'):
+def _get_headers(content_type='application/json', accept=None, quantization=None):
     """Build request headers including API key"""
     headers = {
         'Content-Type': content_type,
     }
+    if accept:
+        headers['Accept'] = accept
+    if quantization:
+        headers[QUANTIZATION_HEADER] = quantization
     
     if API_KEY:
         if API_KEY_HEADER == "Authorization":
@@ -59,6 +225,183 @@ def _get_headers(content_type='application/json'):
     return headers
 
 
+def _peer_address(context):
+    """IP address of the caller, or None if it did not connect over IP"""
+    # e.g. "ipv4:10.0.0.5:53412" or "ipv6:%5B::1%5D:53412"
+    kind, _, address = urllib.parse.unquote(context.peer() or "").partition(":")
+    if kind not in ("ipv4", "ipv6"):
+        return None
+    try:
+        return ipaddress.ip_address(address.rpartition(":")[0].strip("[]"))
+    except ValueError:
+        return None
+
+
+def _tenant(context):
+    """Tenant of a call: a hash of the client's API key, else the x-alphagenome-tenant metadata
+    of trusted callers, else anonymous"""
+    metadata = dict(context.invocation_metadata() or ())
+    api_key = metadata.get(API_KEY_HEADER.lower()) or metadata.get("x-api-key")
+    if api_key:
+        return "key-" + hashlib.sha256(api_key.encode()).hexdigest()[:12]
+    tenant = metadata.get(TENANT_METADATA_KEY)
+    if tenant and TRUSTED_TENANT_NETWORKS:
+        address = _peer_address(context)
+        if address is not None and any(address in network for network in TRUSTED_TENANT_NETWORKS):
+            return tenant
+    return "anonymous"
+
+
+def _cancellation(context):
+    """Event set once the RPC terminates, e.g. the client cancels or goes away.
+
+    Create one per RPC rather than per streamed request: gRPC keeps every callback until the
+    RPC terminates.
+    """
+    cancel = threading.Event()
+    # add_callback returns False once the RPC has terminated
+    if not context.add_callback(cancel.set):
+        cancel.set()
+    return cancel
+
+
+def _post_upstream(context, cancel, path, json_payload, headers, timeout=None):
+    """POST to the JSON service once the call is admitted by the fair scheduler,
+    retrying and hedging according to the RPC's policy.
+
+    The gRPC deadline, if any, bounds the queueing timeout, replaces the HTTP timeout
+    (`timeout` only applies to clients without one) and is propagated to the service. Once
+    `cancel`, from `_cancellation`, is set the upstream call is aborted.
+    """
+    remaining = context.time_remaining()
+    deadline = None if remaining is None else time.monotonic() + remaining
+    if cancel.is_set():
+        UPSTREAM.counters["cancelled"] += 1
+        raise upstream.Cancelled(f"Client went away before calling {path}")
+    queue_timeout = QUEUE_TIMEOUT if remaining is None else min(QUEUE_TIMEOUT or remaining, remaining)
+    tenant = _tenant(context)
+    features = admission.request_features(path.strip("/"), json_payload)
+    with SCHEDULER.admit(tenant, cost=COST_MODEL.estimate(features), timeout=queue_timeout) as admitted:
+        if admitted.queue_time > 1:
+            logger.info(f"Tenant {tenant} queued {admitted.queue_time:.2f}s for {path}")
+        start = time.monotonic()
+        # Retries and hedges run within the admitted slot, so they count towards the concurrency limit
+        rpc = path.strip("/")
+        try:
+            response = UPSTREAM.post(
+                rpc,
+                path,
+                key=_affinity_key(rpc, json_payload),
+                deadline=deadline,
+                cancel=cancel,
+                json=json_payload,
+                headers=headers,
+                timeout=timeout,
+            )
+        except upstream.CallAborted:
+            # The client gave up, which says nothing about the upstream's health
+            admitted.mark_aborted()
+            raise
+        # Overload signals from the upstream shrink the adaptive concurrency limit
+        if response.status_code == 429 or response.status_code >= 500:
+            admitted.mark_dropped()
+    if response.ok:
+        COST_MODEL.observe(features, time.monotonic() - start)
+    return response
+
+
+def _set_rejected(context, error):
+    logger.warning(f"Rejecting request: {error}")
+    context.set_details(f"Too many requests: {error}")
+    context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+
+
+def _set_aborted(context, error):
+    logger.info(f"Upstream call aborted: {error}")
+    context.set_details(str(error))
+    if isinstance(error, upstream.DeadlineExceeded):
+        context.set_code(grpc.StatusCode.DEADLINE_EXCEEDED)
+    else:
+        context.set_code(grpc.StatusCode.CANCELLED)
+
+
+def _log_admission_stats():
+    """Periodically log per-tenant admission counts and queue times"""
+    while True:
+        time.sleep(STATS_INTERVAL)
+        for tenant, stats in SCHEDULER.stats().items():
+            logger.info(
+                f"Tenant {tenant}: {stats.admitted} admitted, {stats.rejected} rejected, queue time"
+                f" p50 {stats.queue_time_quantile(0.5) * 1000:.0f}ms p99 {stats.queue_time_quantile(0.99) * 1000:.0f}ms"
+                f" max {stats.queue_time_max * 1000:.0f}ms"
+            )
+        logger.info(f"Learned upstream seconds per unit of work: {COST_MODEL.seconds_per_work()}")
+        logger.info(f"Upstream concurrency limit {SCHEDULER.max_concurrency}, in flight {SCHEDULER.in_flight}, queued {SCHEDULER.queue_depth}")
+        logger.info(f"Upstream retry budget {UPSTREAM.budget.tokens:.1f}, {dict(UPSTREAM.counters)}")
+        for endpoint in UPSTREAM.balancer.endpoints:
+            logger.info(
+                f"Upstream {endpoint.url}: {'healthy' if endpoint.healthy else 'unhealthy'}, circuit {endpoint.breaker.state}, "
+                f"{endpoint.outstanding} outstanding, {endpoint.requests} requests, {endpoint.errors} errors, "
+                f"p50 {endpoint.latency_quantile(0.5):.3f}s, p99 {endpoint.latency_quantile(0.99):.3f}s, "
+                f"load score {endpoint.load_score:.2f}"
+            )
+
+
+def _label_value(value):
+    """Escapes a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _metrics_text():
+    """Admission metrics in the Prometheus text format"""
+    lines = [
+        f"alphagenome_proxy_concurrency_limit {SCHEDULER.max_concurrency}",
+        f"alphagenome_proxy_in_flight {SCHEDULER.in_flight}",
+        f"alphagenome_proxy_queue_depth {SCHEDULER.queue_depth}",
+        f"alphagenome_proxy_retry_budget_tokens {UPSTREAM.budget.tokens}",
+    ]
+    # Cancelled and deadline_exceeded count upstream work avoided; cancels_sent the aborts sent to the service
+    for counter in (
+        "retries", "retries_throttled", "hedges", "circuit_open", "cancelled", "deadline_exceeded", "cancels_sent"
+    ):
+        lines.append(f"alphagenome_proxy_upstream_{counter}_total {UPSTREAM.counters[counter]}")
+    for endpoint in UPSTREAM.balancer.endpoints:
+        labels = f'endpoint="{_label_value(endpoint.url)}"'
+        lines.append(f"alphagenome_proxy_upstream_healthy{{{labels}}} {int(endpoint.healthy)}")
+        lines.append(f"alphagenome_proxy_upstream_circuit_open{{{labels}}} {int(endpoint.breaker.state != 'closed')}")
+        lines.append(f"alphagenome_proxy_upstream_outstanding{{{labels}}} {endpoint.outstanding}")
+        lines.append(f"alphagenome_proxy_upstream_load_score{{{labels}}} {endpoint.load_score}")
+        lines.append(f"alphagenome_proxy_upstream_requests_total{{{labels}}} {endpoint.requests}")
+        lines.append(f"alphagenome_proxy_upstream_errors_total{{{labels}}} {endpoint.errors}")
+        lines.append(f"alphagenome_proxy_upstream_latency_seconds_sum{{{labels}}} {endpoint.latency_total}")
+        for q in (0.5, 0.99):
+            lines.append(f'alphagenome_proxy_upstream_latency_seconds{{{labels},quantile="{q}"}} {endpoint.latency_quantile(q)}')
+    for tenant, stats in SCHEDULER.stats().items():
+        labels = f'tenant="{_label_value(tenant)}"'
+        lines.append(f"alphagenome_proxy_admitted_total{{{labels}}} {stats.admitted}")
+        lines.append(f"alphagenome_proxy_rejected_total{{{labels}}} {stats.rejected}")
+        lines.append(f"alphagenome_proxy_queue_seconds_sum{{{labels}}} {stats.queue_time_total}")
+        for q in (0.5, 0.99):
+            lines.append(f'alphagenome_proxy_queue_seconds{{{labels},quantile="{q}"}} {stats.queue_time_quantile(q)}')
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = _metrics_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
 def _handle_binary_response(response):
     """Handle binary responses including images and other binary data"""
     content_type = response.headers.get('content-type', '')
@@ -66,7 +409,8 @@ def _handle_binary_response(response):
     # Check if response is binary data
     if any(binary_type in content_type.lower() for binary_type in [
         'image/', 'application/octet-stream', 'application/pdf', 
-        'audio/', 'video/', 'application/zip', 'application/x-binary'
+        'audio/', 'video/', 'application/zip', 'application/x-binary',
+        ARROW_STREAM_MEDIA_TYPE
     ]):
         logger.info(f"Detected binary response with content-type: {content_type}")
         
@@ -136,31 +480,59 @@ def _convert_binary_to_protobuf(response_data, grpc_response):
                     grpc_response.output.output_type = response_data['output'].get('output_type', 1)
 
 
+def _prediction_responses(response, response_type):
+    """gRPC responses of a prediction: one per output for quantized (binary) responses, else one"""
+    if response.headers.get('content-type', '').startswith(message_stream.MEDIA_TYPE):
+        return list(message_stream.read_delimited(response.content, response_type))
+    grpc_response = response_type()
+    _convert_binary_to_protobuf(_handle_binary_response(response), grpc_response)
+    return [grpc_response]
+
+
 class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServicer):
     def PredictSequence(self, request_iterator, context):
         logging.info("Proxying streaming PredictSequence request")
+        cancel = _cancellation(context)
+        deduplicator = _metadata_deduplicator(context)
         try:
             # Process each request from the client
             for request in request_iterator:
+                # Reject bad input here instead of spending an upstream call on it
+                try:
+                    packed_sequence = sequence_codec.pack_sequence(request.sequence)
+                except ValueError as e:
+                    logger.error(f"Rejecting PredictSequence request: {e}")
+                    context.set_details(f"Invalid sequence: {e}")
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    continue
+
+                # Send the sequence 2-bit packed rather than as a JSON string
+                request.ClearField('sequence')
                 request_dict = MessageToDict(request, preserving_proto_field_name=True)
+                request_dict.update(sequence_codec.to_wire(packed_sequence))
+                logger.info(f"PredictSequence sequence: {packed_sequence.length} bp, key {sequence_codec.sequence_key(packed_sequence)}")
                 
                 # Use predict_sequence endpoint for sequence prediction
-                json_service_url = f"{JSON_SERVICE_BASE_URL}/predict_sequence"
-                logger.info(f"PredictSequence calling endpoint: {json_service_url}") 
+                logger.info("PredictSequence calling endpoint: /predict_sequence")
                 
-                headers = _get_headers()
-                response = requests.post(json_service_url, json=request_dict, headers=headers)
+                metadata = dict(context.invocation_metadata() or ())
+                headers = _get_headers(quantization=metadata.get(QUANTIZATION_METADATA_KEY))
+                try:
+                    response = _post_upstream(context, cancel, "/predict_sequence", request_dict, headers)
+                except admission.AdmissionRejected as e:
+                    _set_rejected(context, e)
+                    continue
+                except upstream.CallAborted as e:
+                    # The client is gone or out of time, so the rest of the stream is abandoned too
+                    _set_aborted(context, e)
+                    return
                 response.raise_for_status()
                 
-                # Handle response (binary or JSON)
-                response_data = _handle_binary_response(response)
-                logger.info(f"PredictSequence response data: {response_data}")
-
-                grpc_response = dna_model_pb2.PredictSequenceResponse()
-                _convert_binary_to_protobuf(response_data, grpc_response)
-                
-                # Use yield to stream each response
-                yield grpc_response
+                for grpc_response in _prediction_responses(response, dna_model_pb2.PredictSequenceResponse):
+                    if deduplicator is not None:
+                        deduplicator.deduplicate(grpc_response)
+                    # Use yield to stream each response
+                    yield grpc_response
         except Exception as e:
             logging.error(f"Error in PredictSequence stream: {e}")
             context.set_details(f"Error in PredictSequence stream: {e}")
@@ -168,24 +540,31 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
 
     def PredictInterval(self, request_iterator, context):
         logging.info("Proxying streaming PredictInterval request")
+        cancel = _cancellation(context)
+        deduplicator = _metadata_deduplicator(context)
         try:
             # Process each request from the client
             for request in request_iterator:
                 request_dict = MessageToDict(request, preserving_proto_field_name=True)
-                json_service_url = f"{JSON_SERVICE_BASE_URL}/predict_interval"
                 
-                headers = _get_headers()
-                response = requests.post(json_service_url, json=request_dict, headers=headers)
+                metadata = dict(context.invocation_metadata() or ())
+                headers = _get_headers(quantization=metadata.get(QUANTIZATION_METADATA_KEY))
+                try:
+                    response = _post_upstream(context, cancel, "/predict_interval", request_dict, headers)
+                except admission.AdmissionRejected as e:
+                    _set_rejected(context, e)
+                    continue
+                except upstream.CallAborted as e:
+                    # The client is gone or out of time, so the rest of the stream is abandoned too
+                    _set_aborted(context, e)
+                    return
                 response.raise_for_status()
                 
-                # Handle response (binary or JSON)
-                response_data = _handle_binary_response(response)
-
-                grpc_response = dna_model_pb2.PredictIntervalResponse()
-                _convert_binary_to_protobuf(response_data, grpc_response)
-
-                # Use yield to stream each response
-                yield grpc_response
+                for grpc_response in _prediction_responses(response, dna_model_pb2.PredictIntervalResponse):
+                    if deduplicator is not None:
+                        deduplicator.deduplicate(grpc_response)
+                    # Use yield to stream each response
+                    yield grpc_response
         except Exception as e:
             logging.error(f"Error in PredictInterval stream: {e}")
             context.set_details(f"Error in PredictInterval stream: {e}")
@@ -193,6 +572,7 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
 
     def PredictVariant(self, request_iterator, context):
         logging.info("Proxying streaming PredictVariant request")
+        cancel = _cancellation(context)
         try:
             # Process each request from the client
             for request in request_iterator:
@@ -207,14 +587,16 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
 
                 try:
                     headers = _get_headers()
-                    response = requests.post(
-                        f"{JSON_SERVICE_BASE_URL}/predict_variant",
-                        json=json_payload,
-                        headers=headers,
-                        timeout=10
-                    )
+                    response = _post_upstream(context, cancel, "/predict_variant", json_payload, headers, timeout=10)
                     response.raise_for_status()
                     logger.info(f"Received HTTP PredictVariant response with content-type: {response.headers.get('content-type', 'unknown')}")
+                except admission.AdmissionRejected as e:
+                    _set_rejected(context, e)
+                    continue
+                except upstream.CallAborted as e:
+                    # The client is gone or out of time, so the rest of the stream is abandoned too
+                    _set_aborted(context, e)
+                    return
                 except requests.RequestException as e:
                     logger.error(f"HTTP request failed (PredictVariant): {e}")
                     context.set_details(f"HTTP request error: {e}")
@@ -242,6 +624,7 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
 
     def ScoreInterval(self, request_iterator, context):
         logging.info("Proxying streaming ScoreInterval request")
+        cancel = _cancellation(context)
         try:
             # Process each request from the client
             for request in request_iterator:
@@ -256,14 +639,16 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
 
                 try:
                     headers = _get_headers()
-                    response = requests.post(
-                        f"{JSON_SERVICE_BASE_URL}/score_interval",
-                        json=json_payload,
-                        headers=headers,
-                        timeout=10
-                    )
+                    response = _post_upstream(context, cancel, "/score_interval", json_payload, headers, timeout=10)
                     response.raise_for_status()
                     logger.info(f"Received HTTP ScoreInterval response with content-type: {response.headers.get('content-type', 'unknown')}")
+                except admission.AdmissionRejected as e:
+                    _set_rejected(context, e)
+                    continue
+                except upstream.CallAborted as e:
+                    # The client is gone or out of time, so the rest of the stream is abandoned too
+                    _set_aborted(context, e)
+                    return
                 except requests.RequestException as e:
                     logger.error(f"HTTP request failed (ScoreInterval): {e}")
                     context.set_details(f"HTTP request error: {e}")
@@ -291,6 +676,7 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
 
     def ScoreVariant(self, request_iterator, context):
         logging.info("Proxying streaming ScoreVariant request")
+        cancel = _cancellation(context)
         try:
             for request in request_iterator:
                 try:
@@ -302,16 +688,30 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
                     context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
                     continue
 
+                metadata = dict(context.invocation_metadata() or ())
+                accept = ARROW_STREAM_MEDIA_TYPE if metadata.get(OUTPUT_FORMAT_METADATA_KEY) == 'arrow' else None
+
+                if VARIANT_SCORE_INDEX is not None and accept is None:
+                    cached = VARIANT_SCORE_INDEX.lookup(variant_score_index.key_from_request(json_payload))
+                    if cached is not None:
+                        logger.info("Returning gRPC ScoreVariant response from precomputed score index")
+                        grpc_response = dna_model_pb2.ScoreVariantResponse()
+                        _convert_binary_to_protobuf(json.loads(cached), grpc_response)
+                        yield grpc_response
+                        continue
+
                 try:
-                    headers = _get_headers()
-                    response = requests.post(
-                        f"{JSON_SERVICE_BASE_URL}/score_variant",
-                        json=json_payload,
-                        headers=headers,
-                        timeout=10
-                    )
+                    headers = _get_headers(accept=accept)
+                    response = _post_upstream(context, cancel, "/score_variant", json_payload, headers, timeout=10)
                     response.raise_for_status()
                     logger.info(f"Received HTTP ScoreVariant response with content-type: {response.headers.get('content-type', 'unknown')}")
+                except admission.AdmissionRejected as e:
+                    _set_rejected(context, e)
+                    continue
+                except upstream.CallAborted as e:
+                    # The client is gone or out of time, so the rest of the stream is abandoned too
+                    _set_aborted(context, e)
+                    return
                 except requests.RequestException as e:
                     logger.error(f"HTTP request failed (ScoreVariant): {e}")
                     context.set_details(f"HTTP request error: {e}")
@@ -319,9 +719,12 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
                     continue
 
                 try:
-                    response_data = _handle_binary_response(response)
                     grpc_response = dna_model_pb2.ScoreVariantResponse()
-                    _convert_binary_to_protobuf(response_data, grpc_response)
+                    if response.headers.get('content-type', '').startswith(ARROW_STREAM_MEDIA_TYPE):
+                        # Columnar scores are passed through as is, without an output message
+                        grpc_response.arrow_ipc_stream = response.content
+                    else:
+                        _convert_binary_to_protobuf(_handle_binary_response(response), grpc_response)
                     logger.info("Returning gRPC ScoreVariant response")
                     yield grpc_response
                 except Exception as e:
@@ -336,6 +739,7 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
 
     def ScoreIsmVariant(self, request_iterator, context):
         logging.info("Proxying streaming ScoreIsmVariant request")
+        cancel = _cancellation(context)
         try:
             for request in request_iterator:
                 try:
@@ -349,14 +753,16 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
 
                 try:
                     headers = _get_headers()
-                    response = requests.post(
-                        f"{JSON_SERVICE_BASE_URL}/score_ism_variant",
-                        json=json_payload,
-                        headers=headers,
-                        timeout=10
-                    )
+                    response = _post_upstream(context, cancel, "/score_ism_variant", json_payload, headers, timeout=10)
                     response.raise_for_status()
                     logger.info(f"Received HTTP ScoreIsmVariant response with content-type: {response.headers.get('content-type', 'unknown')}")
+                except admission.AdmissionRejected as e:
+                    _set_rejected(context, e)
+                    continue
+                except upstream.CallAborted as e:
+                    # The client is gone or out of time, so the rest of the stream is abandoned too
+                    _set_aborted(context, e)
+                    return
                 except requests.RequestException as e:
                     logger.error(f"HTTP request failed (ScoreIsmVariant): {e}")
                     context.set_details(f"HTTP request error: {e}")
@@ -392,12 +798,7 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
                 return
 
             headers = _get_headers()
-            response = requests.post(
-                f"{JSON_SERVICE_BASE_URL}/metadata",
-                json=json_payload,
-                headers=headers,
-                timeout=10
-            )
+            response = _post_upstream(context, _cancellation(context), "/metadata", json_payload, headers, timeout=10)
             response.raise_for_status()
             logger.info(f"Received HTTP GetMetadata response with content-type: {response.headers.get('content-type', 'unknown')}")
 
@@ -405,6 +806,10 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
             grpc_response = dna_model_pb2.MetadataResponse()
             _convert_binary_to_protobuf(response_data, grpc_response)
             yield grpc_response
+        except admission.AdmissionRejected as e:
+            _set_rejected(context, e)
+        except upstream.CallAborted as e:
+            _set_aborted(context, e)
         except requests.RequestException as e:
             logger.error(f"HTTP request failed (GetMetadata): {e}")
             context.set_details(f"HTTP request error: {e}")
@@ -414,9 +819,19 @@ class CommunicationProxyServicer(dna_model_service_pb2_grpc.DnaModelServiceServi
             context.set_details(f"Response conversion error: {e}")
             context.set_code(grpc.StatusCode.INTERNAL)
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    # More threads than upstream slots, so queued batch calls do not hold every thread
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=GRPC_MAX_WORKERS))
     dna_model_service_pb2_grpc.add_DnaModelServiceServicer_to_server(CommunicationProxyServicer(), server)
     server.add_insecure_port('[::]:50051')
     logger.info("Starting gRPC Communication Proxy on port 50051...")
+    if STATS_INTERVAL > 0:
+        threading.Thread(target=_log_admission_stats, daemon=True).start()
+    if HEALTH_CHECK_INTERVAL > 0:
+        UPSTREAM.balancer.start_health_checks(HEALTH_CHECK_INTERVAL)
+    logger.info(f"Balancing upstream calls over {JSON_SERVICE_BASE_URLS} ({UPSTREAM.balancer.strategy})")
+    if METRICS_PORT:
+        metrics_server = ThreadingHTTPServer(("", METRICS_PORT), _MetricsHandler)
+        threading.Thread(target=metrics_server.serve_forever, daemon=True).start()
+        logger.info(f"Serving proxy metrics on port {METRICS_PORT} at /metrics")
     server.start()
     server.wait_for_termination() 
\ No newline at end of file
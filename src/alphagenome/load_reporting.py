@@ -0,0 +1,333 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Live load signals of a prediction service.
+
+`LoadMonitor` runs blocking model calls on a bounded worker pool and tracks the
+requests in flight, the pool's queue depth, recent request latency, and the CPU
+and memory utilization of the process. `LoadMonitor.report` snapshots these as
+a `LoadReport`, which can be served as JSON, attached to every response as
+headers (`LoadReport.headers`) and parsed back by load balancers
+(`LoadReport.from_headers`), or exported to Prometheus for autoscaling.
+"""
+
+import asyncio
+import collections
+from collections.abc import Callable, Iterator, Mapping
+from concurrent import futures
+import contextlib
+import dataclasses
+import os
+import threading
+import time
+from typing import Any, TypeVar
+
+import numpy as np
+
+
+_T = TypeVar('_T')
+
+HEADER_PREFIX = 'X-AlphaGenome-Load-'
+
+
+def _header_name(field: str) -> str:
+  return HEADER_PREFIX + field.replace('_', '-').title()
+
+
+class Overloaded(Exception):
+  """Raised when the worker pool's queue is full."""
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadReport:
+  """Snapshot of the load of a service replica.
+
+  Attributes:
+    in_flight: Requests being handled, including those waiting for a worker.
+    queue_depth: Model calls waiting for a worker.
+    busy_workers: Workers running a model call.
+    max_workers: Size of the worker pool.
+    latency_p50: Median latency of recent requests, seconds.
+    latency_p95: 95th percentile latency of recent requests, seconds.
+    cpu_utilization: CPU time used by the process per available CPU since the
+      previous sample, from 0 to 1.
+    memory_utilization: Resident memory of the process relative to the memory
+      limit of its cgroup, or physical memory if unlimited. NaN if unknown.
+  """
+
+  in_flight: int
+  queue_depth: int
+  busy_workers: int
+  max_workers: int
+  latency_p50: float
+  latency_p95: float
+  cpu_utilization: float
+  memory_utilization: float
+
+  @property
+  def utilization(self) -> float:
+    """Busy and queued model calls relative to the worker pool size."""
+    return (self.busy_workers + self.queue_depth) / self.max_workers
+
+  def as_dict(self) -> dict[str, float]:
+    return dataclasses.asdict(self) | {'utilization': self.utilization}
+
+  def headers(self) -> dict[str, str]:
+    """Returns the report as HTTP response headers."""
+    return {
+        _header_name(name): (
+            str(value) if isinstance(value, int) else f'{value:.4g}'
+        )
+        for name, value in dataclasses.asdict(self).items()
+    }
+
+  @classmethod
+  def from_headers(cls, headers: Mapping[str, str]) -> 'LoadReport | None':
+    """Parses a report from HTTP response headers.
+
+    Args:
+      headers: Case-insensitive headers, e.g. `requests.Response.headers`.
+
+    Returns:
+      The report, or None if the headers do not carry a complete one.
+    """
+    values = {}
+    for field in dataclasses.fields(cls):
+      value = headers.get(_header_name(field.name))
+      if value is None:
+        return None
+      try:
+        values[field.name] = field.type(value)
+      except ValueError:
+        return None
+    if values['max_workers'] <= 0:
+      return None
+    return cls(**values)
+
+  def prometheus(self, prefix: str = 'alphagenome_service') -> str:
+    """Returns the report as gauges in the Prometheus text format."""
+    return ''.join(
+        f'{prefix}_{name} {value}\n' for name, value in self.as_dict().items()
+    )
+
+
+def _available_cpus() -> int:
+  if hasattr(os, 'sched_getaffinity'):
+    return len(os.sched_getaffinity(0))
+  return os.cpu_count() or 1
+
+
+def _read_int(path: str) -> int | None:
+  try:
+    with open(path) as f:
+      return int(f.read().split()[0])
+  except (OSError, ValueError, IndexError):
+    return None
+
+
+def _memory_utilization() -> float:
+  """Returns the resident memory relative to the memory limit, or NaN."""
+  page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 0
+  try:
+    with open('/proc/self/statm') as f:
+      resident = int(f.read().split()[1]) * page_size
+  except (OSError, ValueError, IndexError):
+    return float('nan')
+  # cgroup v2, then v1; 'max' or a huge v1 value means unlimited.
+  limit = _read_int('/sys/fs/cgroup/memory.max') or _read_int(
+      '/sys/fs/cgroup/memory/memory.limit_in_bytes'
+  )
+  physical = page_size * os.sysconf('SC_PHYS_PAGES')
+  if not limit or limit > physical:
+    limit = physical
+  return resident / limit if limit else float('nan')
+
+
+class _CpuSampler:
+  """CPU utilization of the process between samples."""
+
+  def __init__(self, min_interval: float = 1.0):
+    self._min_interval = min_interval
+    self._cpus = _available_cpus()
+    self._last_wall = time.monotonic()
+    self._last_cpu = time.process_time()
+    self._utilization = 0.0
+    self._lock = threading.Lock()
+
+  def utilization(self) -> float:
+    with self._lock:
+      wall = time.monotonic()
+      if wall - self._last_wall >= self._min_interval:
+        cpu = time.process_time()
+        self._utilization = (cpu - self._last_cpu) / (
+            (wall - self._last_wall) * self._cpus
+        )
+        self._last_wall, self._last_cpu = wall, cpu
+      return self._utilization
+
+
+class LoadMonitor:
+  """Runs model calls on a bounded worker pool and reports load.
+
+  Usage:
+    monitor = LoadMonitor(max_workers=4, max_queue_depth=16)
+
+    async def handler():
+      with monitor.track_request():
+        return await monitor.run(client.predict_interval, interval=interval)
+
+    monitor.report().headers()
+  """
+
+  def __init__(
+      self,
+      max_workers: int = 4,
+      *,
+      max_queue_depth: int | None = None,
+      latency_window: int = 1000,
+  ):
+    """Initializes the monitor.
+
+    Args:
+      max_workers: Number of worker threads running model calls.
+      max_queue_depth: Maximum number of model calls waiting for a worker, or
+        None for no limit.
+      latency_window: Number of recent requests the latency quantiles cover.
+    """
+    self._max_workers = max_workers
+    self._max_queue_depth = max_queue_depth
+    self._executor = futures.ThreadPoolExecutor(
+        max_workers, thread_name_prefix='model'
+    )
+    self._in_flight = 0
+    self._queued = 0
+    self._busy = 0
+    self._latencies = collections.deque(maxlen=latency_window)
+    self._cpu = _CpuSampler()
+    # Calls dropped from the queue before running, and running calls whose
+    # result was no longer wanted.
+    self.counters = collections.Counter()
+    self._lock = threading.Lock()
+
+  @contextlib.contextmanager
+  def track_request(self) -> Iterator[None]:
+    """Counts a request as in flight, and records its latency."""
+    start = time.monotonic()
+    with self._lock:
+      self._in_flight += 1
+    try:
+      yield
+    finally:
+      with self._lock:
+        self._in_flight -= 1
+        self._latencies.append(time.monotonic() - start)
+
+  def submit(
+      self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any
+  ) -> futures.Future[_T]:
+    """Queues a blocking call on the worker pool.
+
+    Args:
+      fn: Function to call.
+      *args: Positional arguments of `fn`.
+      **kwargs: Keyword arguments of `fn`.
+
+    Returns:
+      Future of the result of `fn`. Cancel it through `cancel` so that the
+      queue depth stays accurate.
+
+    Raises:
+      Overloaded: If `max_queue_depth` calls are already waiting for a worker.
+    """
+    with self._lock:
+      if (
+          self._max_queue_depth is not None
+          and self._queued >= self._max_queue_depth
+      ):
+        raise Overloaded(
+            f'{self._queued} model calls are already waiting for a worker.'
+        )
+      self._queued += 1
+
+    def work():
+      with self._lock:
+        self._queued -= 1
+        self._busy += 1
+      try:
+        return fn(*args, **kwargs)
+      finally:
+        with self._lock:
+          self._busy -= 1
+
+    future = self._executor.submit(work)
+    future.add_done_callback(self._on_done)
+    return future
+
+  def _on_done(self, future: futures.Future[Any]) -> None:
+    # However a queued call is cancelled, it leaves the queue.
+    if future.cancelled():
+      with self._lock:
+        self._queued -= 1
+        self.counters['dropped'] += 1
+
+  def cancel(self, future: futures.Future[Any]) -> bool:
+    """Drops a call that has not started yet from the queue.
+
+    Running calls cannot be interrupted; they run to completion and their
+    result is discarded.
+
+    Returns:
+      Whether the call was dropped before running.
+    """
+    if future.cancel():
+      return True
+    if not future.done():
+      with self._lock:
+        self.counters['abandoned'] += 1
+    return False
+
+  async def run(
+      self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any
+  ) -> _T:
+    """Runs a blocking call on the worker pool; see `submit`."""
+    future = self.submit(fn, *args, **kwargs)
+    try:
+      return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+      self.cancel(future)
+      raise
+
+  def call(self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+    """Runs a blocking call on the worker pool from a thread; see `submit`."""
+    return self.submit(fn, *args, **kwargs).result()
+
+  def report(self) -> LoadReport:
+    """Returns the current load."""
+    with self._lock:
+      latencies = np.fromiter(self._latencies, float)
+      in_flight, queued, busy = self._in_flight, self._queued, self._busy
+    if latencies.size:
+      p50, p95 = np.quantile(latencies, [0.5, 0.95])
+    else:
+      p50 = p95 = 0.0
+    return LoadReport(
+        in_flight=in_flight,
+        queue_depth=queued,
+        busy_workers=busy,
+        max_workers=self._max_workers,
+        latency_p50=float(p50),
+        latency_p95=float(p95),
+        cpu_utilization=self._cpu.utilization(),
+        memory_utilization=_memory_utilization(),
+    )
@@ -0,0 +1,126 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from absl.testing import absltest
+import requests
+
+from . import load_reporting
+
+_REPORT = load_reporting.LoadReport(
+    in_flight=5,
+    queue_depth=2,
+    busy_workers=3,
+    max_workers=4,
+    latency_p50=0.25,
+    latency_p95=1.5,
+    cpu_utilization=0.75,
+    memory_utilization=0.5,
+)
+
+
+class LoadReportTest(absltest.TestCase):
+
+  def test_headers_round_trip(self):
+    headers = _REPORT.headers()
+    self.assertEqual(headers['X-AlphaGenome-Load-Queue-Depth'], '2')
+    # Response headers are case-insensitive.
+    headers = requests.structures.CaseInsensitiveDict(
+        {name.lower(): value for name, value in headers.items()}
+    )
+    self.assertEqual(load_reporting.LoadReport.from_headers(headers), _REPORT)
+    self.assertAlmostEqual(_REPORT.utilization, 1.25)
+
+  def test_incomplete_headers(self):
+    headers = _REPORT.headers()
+    del headers['X-AlphaGenome-Load-Latency-P95']
+    self.assertIsNone(load_reporting.LoadReport.from_headers(headers))
+    self.assertIsNone(load_reporting.LoadReport.from_headers({}))
+
+  def test_invalid_headers(self):
+    for name, value in (
+        ('X-AlphaGenome-Load-Max-Workers', '0'),
+        ('X-AlphaGenome-Load-In-Flight', 'many'),
+    ):
+      headers = _REPORT.headers() | {name: value}
+      self.assertIsNone(load_reporting.LoadReport.from_headers(headers))
+
+
+class LoadMonitorTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.release = threading.Event()
+    self.addCleanup(self.release.set)
+
+  def _wait_for_busy(self, monitor, busy):
+    deadline = time.monotonic() + 5
+    while monitor.report().busy_workers != busy:
+      self.assertLess(time.monotonic(), deadline)
+      time.sleep(0.01)
+
+  def test_submit_raises_when_queue_is_full(self):
+    monitor = load_reporting.LoadMonitor(max_workers=1, max_queue_depth=2)
+    running = monitor.submit(self.release.wait)
+    self._wait_for_busy(monitor, 1)
+    queued = [monitor.submit(lambda: 1) for _ in range(2)]
+    with self.assertRaises(load_reporting.Overloaded):
+      monitor.submit(lambda: 1)
+    self.assertEqual(monitor.report().queue_depth, 2)
+    self.release.set()
+    self.assertTrue(running.result())
+    self.assertEqual([future.result() for future in queued], [1, 1])
+    self._wait_for_busy(monitor, 0)
+    self.assertEqual(monitor.report().queue_depth, 0)
+
+  def test_cancel(self):
+    monitor = load_reporting.LoadMonitor(max_workers=1)
+    running = monitor.submit(self.release.wait)
+    self._wait_for_busy(monitor, 1)
+    queued = monitor.submit(lambda: 1)
+    self.assertEqual(monitor.report().queue_depth, 1)
+    # Queued calls are dropped; running calls are not interrupted.
+    self.assertTrue(monitor.cancel(queued))
+    self.assertFalse(monitor.cancel(running))
+    report = monitor.report()
+    self.assertEqual((report.queue_depth, report.busy_workers), (0, 1))
+    self.release.set()
+    self._wait_for_busy(monitor, 0)
+    self.assertEqual(monitor.report().queue_depth, 0)
+
+  def test_track_request(self):
+    monitor = load_reporting.LoadMonitor()
+    with monitor.track_request():
+      self.assertEqual(monitor.report().in_flight, 1)
+      self.assertEqual(monitor.call(lambda x: x + 1, 1), 2)
+    report = monitor.report()
+    self.assertEqual(report.in_flight, 0)
+    self.assertGreater(report.latency_p95, 0)
+
+  def test_cancel_counts_dropped_and_abandoned_calls(self):
+    monitor = load_reporting.LoadMonitor(max_workers=1)
+    running = monitor.submit(self.release.wait)
+    self._wait_for_busy(monitor, 1)
+    queued = monitor.submit(lambda: 1)
+    # Cancelling the future directly also leaves the queue.
+    self.assertTrue(queued.cancel())
+    self.assertFalse(monitor.cancel(running))
+    self.assertEqual(monitor.counters, {'dropped': 1, 'abandoned': 1})
+    self.assertEqual(monitor.report().queue_depth, 0)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,88 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streams of length-delimited protocol buffer messages over HTTP.
+
+Each message is serialized and prefixed with its size as a varint, the framing
+of `writeDelimitedTo` in the Java and C++ protobuf libraries. This lets an HTTP
+response carry several messages of a gRPC response stream, e.g. one `Output`
+per requested output type, as binary rather than base64 encoded JSON.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+from google.protobuf import message
+
+
+MEDIA_TYPE = 'application/x-protobuf-stream'
+
+_M = TypeVar('_M', bound=message.Message)
+
+
+def _varint(value: int) -> bytes:
+  out = bytearray()
+  while value > 0x7F:
+    out.append((value & 0x7F) | 0x80)
+    value >>= 7
+  out.append(value)
+  return bytes(out)
+
+
+def iter_delimited(messages: Iterable[message.Message]) -> Iterator[bytes]:
+  """Serializes messages lazily, yielding each one with its size prefix.
+
+  Suited to a streaming HTTP response body, which then only holds one message
+  at a time.
+  """
+  for msg in messages:
+    data = msg.SerializeToString()
+    yield _varint(len(data)) + data
+
+
+def write_delimited(messages: Iterable[message.Message]) -> bytes:
+  """Serializes messages as a length-delimited stream."""
+  return b''.join(iter_delimited(messages))
+
+
+def read_delimited(data: bytes, message_type: type[_M]) -> Iterator[_M]:
+  """Parses a length-delimited stream written by `write_delimited`.
+
+  Args:
+    data: The stream.
+    message_type: Type of the messages in the stream.
+
+  Yields:
+    The messages, in order.
+
+  Raises:
+    ValueError: If the stream is truncated.
+  """
+  view = memoryview(data)
+  position = 0
+  while position < len(view):
+    size = shift = 0
+    while True:
+      if position >= len(view):
+        raise ValueError('Truncated message size.')
+      byte = view[position]
+      position += 1
+      size |= (byte & 0x7F) << shift
+      shift += 7
+      if not byte & 0x80:
+        break
+    if position + size > len(view):
+      raise ValueError('Truncated message.')
+    yield message_type.FromString(view[position : position + size])
+    position += size
@@ -0,0 +1,66 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+
+from . import message_stream
+from .protos import dna_model_pb2
+from .protos import tensor_pb2
+
+
+class MessageStreamTest(absltest.TestCase):
+
+  def test_round_trip(self):
+    messages = [
+        dna_model_pb2.PredictIntervalResponse(
+            output=dna_model_pb2.Output(
+                output_type=dna_model_pb2.OUTPUT_TYPE_RNA_SEQ
+            )
+        ),
+        dna_model_pb2.PredictIntervalResponse(),
+        dna_model_pb2.PredictIntervalResponse(
+            tensor_chunk=tensor_pb2.TensorChunk(data=b'x' * 300)
+        ),
+    ]
+    data = message_stream.write_delimited(messages)
+    self.assertEqual(
+        list(
+            message_stream.read_delimited(
+                data, dna_model_pb2.PredictIntervalResponse
+            )
+        ),
+        messages,
+    )
+
+  def test_iter_delimited_yields_one_message_at_a_time(self):
+    messages = [tensor_pb2.TensorChunk(data=b'x' * n) for n in (0, 5, 300)]
+    parts = list(message_stream.iter_delimited(iter(messages)))
+    self.assertLen(parts, 3)
+    self.assertEqual(b''.join(parts), message_stream.write_delimited(messages))
+    self.assertEqual(
+        list(message_stream.read_delimited(parts[2], tensor_pb2.TensorChunk)),
+        messages[2:],
+    )
+
+  def test_truncated_stream_raises(self):
+    data = message_stream.write_delimited(
+        [tensor_pb2.TensorChunk(data=b'x' * 300)]
+    )
+    for end in (1, len(data) - 1):
+      with self.assertRaises(ValueError):
+        list(message_stream.read_delimited(data[:end], tensor_pb2.TensorChunk))
+
+
+if __name__ == '__main__':
+  absltest.main()
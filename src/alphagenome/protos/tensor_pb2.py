@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1f\x61lphagenome/protos/tensor.proto\x12(google.gdm.gdmscience.alphagenome.v1main\"\xc8\x01\n\x06Tensor\x12\r\n\x05shape\x18\x01 \x03(\x05\x12\x45\n\tdata_type\x18\x02 \x01(\x0e\x32\x32.google.gdm.gdmscience.alphagenome.v1main.DataType\x12\x46\n\x05\x61rray\x18\x03 \x01(\x0b\x32\x35.google.gdm.gdmscience.alphagenome.v1main.TensorChunkH\x00\x12\x15\n\x0b\x63hunk_count\x18\x04 \x01(\x03H\x00\x42\t\n\x07payload\"p\n\x0bTensorChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12S\n\x10\x63ompression_type\x18\x02 \x01(\x0e\x32\x39.google.gdm.gdmscience.alphagenome.v1main.CompressionType*\x95\x02\n\x08\x44\x61taType\x12\x19\n\x15\x44\x41TA_TYPE_UNSPECIFIED\x10\x00\x12\x16\n\x12\x44\x41TA_TYPE_BFLOAT16\x10\x01\x12\x15\n\x11\x44\x41TA_TYPE_FLOAT16\x10\x0b\x12\x15\n\x11\x44\x41TA_TYPE_FLOAT32\x10\x02\x12\x15\n\x11\x44\x41TA_TYPE_FLOAT64\x10\x03\x12\x12\n\x0e\x44\x41TA_TYPE_INT8\x10\x04\x12\x13\n\x0f\x44\x41TA_TYPE_INT32\x10\x05\x12\x13\n\x0f\x44\x41TA_TYPE_INT64\x10\x06\x12\x13\n\x0f\x44\x41TA_TYPE_UINT8\x10\x07\x12\x14\n\x10\x44\x41TA_TYPE_UINT32\x10\x08\x12\x14\n\x10\x44\x41TA_TYPE_UINT64\x10\t\x12\x12\n\x0e\x44\x41TA_TYPE_BOOL\x10\n*G\n\x0f\x43ompressionType\x12\x19\n\x15\x43OMPRESSION_TYPE_NONE\x10\x00\x12\x19\n\x15\x43OMPRESSION_TYPE_ZSTD\x10\x01\x42\x92\x01\n,com.google.gdm.gdmscience.alphagenome.v1mainB\x0bTensorProtoP\x01ZSgoogle.golang.org/genproto/googleapis/gdm/gdmscience/alphagenome/v1main;alphagenomeb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1f\x61lphagenome/protos/tensor.proto\x12(google.gdm.gdmscience.alphagenome.v1main\"\xf7\x02\n\x06Tensor\x12\r\n\x05shape\x18\x01 \x03(\x05\x12\x45\n\tdata_type\x18\x02 \x01(\x0e\x32\x32.google.gdm.gdmscience.alphagenome.v1main.DataType\x12\x46\n\x06layout\x18\x07 \x01(\x0e\x32\x36.google.gdm.gdmscience.alphagenome.v1main.TensorLayout\x12\x46\n\x05\x61rray\x18\x03 \x01(\x0b\x32\x35.google.gdm.gdmscience.alphagenome.v1main.TensorChunkH\x00\x12\x15\n\x0b\x63hunk_count\x18\x04 \x01(\x03H\x00\x12L\n\x0cquantization\x18\x05 \x01(\x0b\x32\x36.google.gdm.gdmscience.alphagenome.v1main.Quantization\x12\x17\n\x0fitems_per_chunk\x18\x06 \x01(\x03\x42\t\n\x07payload\"\x8f\x01\n\x0cQuantization\x12N\n\x12original_data_type\x18\x01 \x01(\x0e\x32\x32.google.gdm.gdmscience.alphagenome.v1main.DataType\x12\x0c\n\x04\x61xis\x18\x02 \x01(\x05\x12\r\n\x05scale\x18\x03 \x03(\x02\x12\x12\n\nzero_point\x18\x04 \x03(\x02\"p\n\x0bTensorChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12S\n\x10\x63ompression_type\x18\x02 \x01(\x0e\x32\x39.google.gdm.gdmscience.alphagenome.v1main.CompressionType*\x95\x02\n\x08\x44\x61taType\x12\x19\n\x15\x44\x41TA_TYPE_UNSPECIFIED\x10\x00\x12\x16\n\x12\x44\x41TA_TYPE_BFLOAT16\x10\x01\x12\x15\n\x11\x44\x41TA_TYPE_FLOAT16\x10\x0b\x12\x15\n\x11\x44\x41TA_TYPE_FLOAT32\x10\x02\x12\x15\n\x11\x44\x41TA_TYPE_FLOAT64\x10\x03\x12\x12\n\x0e\x44\x41TA_TYPE_INT8\x10\x04\x12\x13\n\x0f\x44\x41TA_TYPE_INT32\x10\x05\x12\x13\n\x0f\x44\x41TA_TYPE_INT64\x10\x06\x12\x13\n\x0f\x44\x41TA_TYPE_UINT8\x10\x07\x12\x14\n\x10\x44\x41TA_TYPE_UINT32\x10\x08\x12\x14\n\x10\x44\x41TA_TYPE_UINT64\x10\t\x12\x12\n\x0e\x44\x41TA_TYPE_BOOL\x10\n*S\n\x0cTensorLayout\x12\x17\n\x13TENSOR_LAYOUT_DENSE\x10\x00\x12*\n&TENSOR_LAYOUT_SYMMETRIC_UPPER_TRIANGLE\x10\x01*\xa6\x01\n\x10QuantizationType\x12\x1a\n\x16QUANTIZATION_TYPE_NONE\x10\x00\x12\x1e\n\x1aQUANTIZATION_TYPE_BFLOAT16\x10\x01\x12\x1d\n\x19QUANTIZATION_TYPE_FLOAT16\x10\x02\x12\x1a\n\x16QUANTIZATION_TYPE_INT8\x10\x03\x12\x1b\n\x17QUANTIZATION_TYPE_UINT8\x10\x04*\xf3\x01\n\x0f\x43ompressionType\x12\x19\n\x15\x43OMPRESSION_TYPE_NONE\x10\x00\x12\x19\n\x15\x43OMPRESSION_TYPE_ZSTD\x10\x01\x12\x18\n\x14\x43OMPRESSION_TYPE_LZ4\x10\x02\x12!\n\x1d\x43OMPRESSION_TYPE_ZSTD_SHUFFLE\x10\x03\x12%\n!COMPRESSION_TYPE_ZSTD_XOR_SHUFFLE\x10\x04\x12 \n\x1c\x43OMPRESSION_TYPE_LZ4_SHUFFLE\x10\x05\x12$\n COMPRESSION_TYPE_LZ4_XOR_SHUFFLE\x10\x06\x42\x92\x01\n,com.google.gdm.gdmscience.alphagenome.v1mainB\x0bTensorProtoP\x01ZSgoogle.golang.org/genproto/googleapis/gdm/gdmscience/alphagenome/v1main;alphagenomeb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -32,12 +32,18 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'alphagenome.protos.tensor_p
 if not _descriptor._USE_C_DESCRIPTORS:
   _globals['DESCRIPTOR']._loaded_options = None
   _globals['DESCRIPTOR']._serialized_options = b'\n,com.google.gdm.gdmscience.alphagenome.v1mainB\013TensorProtoP\001ZSgoogle.golang.org/genproto/googleapis/gdm/gdmscience/alphagenome/v1main;alphagenome'
-  _globals['_DATATYPE']._serialized_start=395
-  _globals['_DATATYPE']._serialized_end=672
-  _globals['_COMPRESSIONTYPE']._serialized_start=674
-  _globals['_COMPRESSIONTYPE']._serialized_end=745
+  _globals['_DATATYPE']._serialized_start=716
+  _globals['_DATATYPE']._serialized_end=993
+  _globals['_TENSORLAYOUT']._serialized_start=995
+  _globals['_TENSORLAYOUT']._serialized_end=1078
+  _globals['_QUANTIZATIONTYPE']._serialized_start=1081
+  _globals['_QUANTIZATIONTYPE']._serialized_end=1247
+  _globals['_COMPRESSIONTYPE']._serialized_start=1250
+  _globals['_COMPRESSIONTYPE']._serialized_end=1493
   _globals['_TENSOR']._serialized_start=78
-  _globals['_TENSOR']._serialized_end=278
-  _globals['_TENSORCHUNK']._serialized_start=280
-  _globals['_TENSORCHUNK']._serialized_end=392
+  _globals['_TENSOR']._serialized_end=453
+  _globals['_QUANTIZATION']._serialized_start=456
+  _globals['_QUANTIZATION']._serialized_end=599
+  _globals['_TENSORCHUNK']._serialized_start=601
+  _globals['_TENSORCHUNK']._serialized_end=713
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,419 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local access to reference genome sequences.
+
+Two on-disk formats are supported, both memory-mapped so that only the pages
+covering a requested slice are read:
+
+  * FASTA with a samtools-style `.fai` index (`FastaReference`).
+  * UCSC `.2bit` files (`TwoBitReference`), which store 4 bases per byte and
+    therefore need a quarter of the resident memory of FASTA.
+
+Use `open_reference` to pick the reader based on the file extension.
+"""
+
+import abc
+from collections.abc import Mapping
+import dataclasses
+import functools
+import mmap
+import os
+import struct
+from typing import Protocol
+
+import numpy as np
+
+
+_TWOBIT_SIGNATURE = 0x1A412743
+# UCSC .2bit base encoding: T=0, C=1, A=2, G=3, most significant bits first.
+_TWOBIT_BASES = np.frombuffer(b'TCAG', dtype=np.uint8)
+_TWOBIT_CODES = np.full(256, 255, dtype=np.uint8)
+for _code, _base in enumerate(b'TCAG'):
+  _TWOBIT_CODES[_base] = _code
+  _TWOBIT_CODES[ord(chr(_base).lower())] = _code
+
+_COMPLEMENT = bytes.maketrans(b'ACGTNacgtn', b'TGCANtgcan')
+
+
+class IntervalLike(Protocol):
+  """Any object with `chromosome`, `start`, `end` and optionally `strand`."""
+
+  chromosome: str
+  start: int
+  end: int
+
+
+@dataclasses.dataclass(frozen=True)
+class FastaIndexEntry:
+  """A single line of a `.fai` index."""
+
+  name: str
+  length: int
+  offset: int
+  line_bases: int
+  line_width: int
+
+
+def read_fai(path: str | os.PathLike[str]) -> dict[str, FastaIndexEntry]:
+  """Reads a samtools `.fai` index."""
+  entries = {}
+  with open(path) as f:
+    for line in f:
+      if not line.strip():
+        continue
+      name, length, offset, line_bases, line_width = line.split('\t')[:5]
+      entries[name] = FastaIndexEntry(
+          name=name,
+          length=int(length),
+          offset=int(offset),
+          line_bases=int(line_bases),
+          line_width=int(line_width),
+      )
+  return entries
+
+
+def index_fasta(
+    path: str | os.PathLike[str], fai_path: str | os.PathLike[str] | None = None
+) -> dict[str, FastaIndexEntry]:
+  """Creates a `.fai` index for an uncompressed FASTA file.
+
+  Args:
+    path: Path to the FASTA file.
+    fai_path: Path of the index to write. Defaults to `path` + '.fai'.
+
+  Returns:
+    The index entries.
+
+  Raises:
+    ValueError: If a record has lines of inconsistent width.
+  """
+  entries = {}
+  name = None
+  length = offset = line_bases = line_width = 0
+  last_line_short = False
+
+  def _flush():
+    if name is not None:
+      entries[name] = FastaIndexEntry(
+          name, length, offset, line_bases, line_width
+      )
+
+  position = 0
+  with open(path, 'rb') as f:
+    for line in f:
+      if line.startswith(b'>'):
+        _flush()
+        name = line[1:].split()[0].decode()
+        length = line_bases = line_width = 0
+        offset = position + len(line)
+        last_line_short = False
+      elif name is not None:
+        bases = len(line.rstrip(b'\r\n'))
+        if bases:
+          if last_line_short:
+            raise ValueError(f'Record {name} has lines of inconsistent width.')
+          if not line_bases:
+            line_bases, line_width = bases, len(line)
+          elif bases != line_bases:
+            last_line_short = bases < line_bases
+            if not last_line_short:
+              raise ValueError(
+                  f'Record {name} has lines of inconsistent width.'
+              )
+          length += bases
+      position += len(line)
+  _flush()
+
+  with open(fai_path or f'{os.fspath(path)}.fai', 'w') as f:
+    for entry in entries.values():
+      f.write(
+          f'{entry.name}\t{entry.length}\t{entry.offset}\t'
+          f'{entry.line_bases}\t{entry.line_width}\n'
+      )
+  return entries
+
+
+class ReferenceGenome(abc.ABC):
+  """Random access to the sequences of a reference genome."""
+
+  @property
+  @abc.abstractmethod
+  def chromosome_lengths(self) -> Mapping[str, int]:
+    """Mapping of chromosome names to their lengths."""
+
+  @abc.abstractmethod
+  def _fetch(self, chromosome: str, start: int, end: int) -> bytes:
+    """Returns upper-case bases in [start, end), which is within bounds."""
+
+  @abc.abstractmethod
+  def close(self) -> None:
+    """Releases the memory mapping."""
+
+  def fetch(
+      self, chromosome: str, start: int, end: int, *, pad: bool = False
+  ) -> bytes:
+    """Returns the upper-case sequence of `chromosome` in [start, end).
+
+    Args:
+      chromosome: Chromosome name.
+      start: 0-based start position (inclusive).
+      end: 0-based end position (exclusive).
+      pad: If True, positions outside of the chromosome are returned as 'N'
+        (e.g. for model inputs centered near chromosome ends). Otherwise, out of
+        bounds requests raise an error.
+
+    Returns:
+      Sequence as ASCII bytes.
+
+    Raises:
+      KeyError: If the chromosome is unknown.
+      ValueError: If the range is invalid or out of bounds and `pad` is False.
+    """
+    length = self.chromosome_lengths[chromosome]
+    if end < start:
+      raise ValueError(f'Invalid range {chromosome}:{start}-{end}.')
+    if not pad and (start < 0 or end > length):
+      raise ValueError(
+          f'Range {chromosome}:{start}-{end} is outside of [0, {length}).'
+      )
+    clipped_start, clipped_end = max(start, 0), min(end, length)
+    sequence = (
+        self._fetch(chromosome, clipped_start, clipped_end)
+        if clipped_start < clipped_end
+        else b''
+    )
+    if pad:
+      before = max(min(end, 0) - start, 0)
+      after = max(end - max(start, length), 0)
+      sequence = b'N' * before + sequence + b'N' * after
+    return sequence
+
+  def sequence(self, interval: IntervalLike, *, pad: bool = False) -> str:
+    """Returns the sequence of an interval, reverse complemented if negative.
+
+    Args:
+      interval: An object with `chromosome`, `start`, `end` and optionally
+        `strand` attributes, such as `dna_model_pb2.Interval`.
+      pad: Whether to pad positions outside of the chromosome with 'N'.
+    """
+    sequence = self.fetch(
+        interval.chromosome, interval.start, interval.end, pad=pad
+    )
+    # STRAND_NEGATIVE in dna_model.proto, or '-' for string strands.
+    if getattr(interval, 'strand', None) in (2, '-'):
+      sequence = sequence.translate(_COMPLEMENT)[::-1]
+    return sequence.decode('ascii')
+
+  def __enter__(self) -> 'ReferenceGenome':
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+
+class FastaReference(ReferenceGenome):
+  """Reference genome backed by a memory-mapped, `.fai` indexed FASTA file."""
+
+  def __init__(
+      self,
+      path: str | os.PathLike[str],
+      fai_path: str | os.PathLike[str] | None = None,
+  ):
+    fai_path = fai_path or f'{os.fspath(path)}.fai'
+    if os.path.exists(fai_path):
+      self._index = read_fai(fai_path)
+    else:
+      self._index = index_fasta(path, fai_path)
+    with open(path, 'rb') as f:
+      self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    self._lengths = {name: e.length for name, e in self._index.items()}
+
+  @property
+  def chromosome_lengths(self) -> Mapping[str, int]:
+    return self._lengths
+
+  def _fetch(self, chromosome: str, start: int, end: int) -> bytes:
+    entry = self._index[chromosome]
+
+    def _file_offset(position: int) -> int:
+      line, column = divmod(position, entry.line_bases)
+      return entry.offset + line * entry.line_width + column
+
+    data = self._mmap[_file_offset(start) : _file_offset(end - 1) + 1]
+    return data.translate(None, b'\r\n').upper()
+
+  def close(self) -> None:
+    self._mmap.close()
+
+
+@dataclasses.dataclass(frozen=True)
+class _TwoBitRecord:
+  length: int
+  n_starts: np.ndarray
+  n_ends: np.ndarray
+  dna_offset: int
+
+
+class TwoBitReference(ReferenceGenome):
+  """Reference genome backed by a memory-mapped UCSC `.2bit` file.
+
+  Soft-masking (lower-case) blocks are ignored; N blocks are restored.
+  """
+
+  def __init__(self, path: str | os.PathLike[str]):
+    with open(path, 'rb') as f:
+      self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    signature, version, count, _ = struct.unpack_from('<4I', self._mmap, 0)
+    if signature != _TWOBIT_SIGNATURE or version != 0:
+      raise ValueError(f'{path} is not a version 0 .2bit file.')
+
+    self._offsets = {}
+    position = 16
+    for _ in range(count):
+      name_size = self._mmap[position]
+      name = self._mmap[position + 1 : position + 1 + name_size].decode()
+      (self._offsets[name],) = struct.unpack_from(
+          '<I', self._mmap, position + 1 + name_size
+      )
+      position += 1 + name_size + 4
+    self._records = {}
+    self._lengths = {
+        name: struct.unpack_from('<I', self._mmap, offset)[0]
+        for name, offset in self._offsets.items()
+    }
+
+  @property
+  def chromosome_lengths(self) -> Mapping[str, int]:
+    return self._lengths
+
+  def _record(self, chromosome: str) -> _TwoBitRecord:
+    # Records are parsed lazily, since the N block tables can be large.
+    if (record := self._records.get(chromosome)) is None:
+      position = self._offsets[chromosome]
+      length, n_count = struct.unpack_from('<2I', self._mmap, position)
+      position += 8
+      n_blocks = np.frombuffer(
+          self._mmap, dtype='<u4', count=2 * n_count, offset=position
+      ).astype(np.int64)
+      position += 8 * n_count
+      (mask_count,) = struct.unpack_from('<I', self._mmap, position)
+      position += 4 + 8 * mask_count + 4
+      record = _TwoBitRecord(
+          length=length,
+          n_starts=n_blocks[:n_count],
+          n_ends=n_blocks[:n_count] + n_blocks[n_count:],
+          dna_offset=position,
+      )
+      self._records[chromosome] = record
+    return record
+
+  def _fetch(self, chromosome: str, start: int, end: int) -> bytes:
+    record = self._record(chromosome)
+    first_byte, last_byte = start // 4, (end + 3) // 4
+    packed = np.frombuffer(
+        self._mmap,
+        dtype=np.uint8,
+        count=last_byte - first_byte,
+        offset=record.dna_offset + first_byte,
+    )
+    shifts = np.array([6, 4, 2, 0], dtype=np.uint8)
+    codes = (packed[:, None] >> shifts) & 3
+    bases = _TWOBIT_BASES[codes.ravel()]
+    bases = bases[start - 4 * first_byte : end - 4 * first_byte]
+
+    # Restore N blocks overlapping the requested range.
+    lo = np.searchsorted(record.n_ends, start, side='right')
+    hi = np.searchsorted(record.n_starts, end, side='left')
+    for n_start, n_end in zip(record.n_starts[lo:hi], record.n_ends[lo:hi]):
+      bases[max(n_start, start) - start : min(n_end, end) - start] = ord('N')
+    return bases.tobytes()
+
+  def close(self) -> None:
+    self._mmap.close()
+
+
+def write_twobit(
+    reference: ReferenceGenome, path: str | os.PathLike[str]
+) -> None:
+  """Converts a reference genome to the UCSC `.2bit` format.
+
+  Sequences are converted one chromosome at a time. Soft-masking is not
+  preserved.
+
+  Args:
+    reference: Source reference genome, typically a `FastaReference`.
+    path: Path of the `.2bit` file to write.
+  """
+  names = list(reference.chromosome_lengths)
+  encoded_names = [name.encode() for name in names]
+  index_size = sum(1 + len(name) + 4 for name in encoded_names)
+
+  with open(path, 'wb') as f:
+    f.write(struct.pack('<4I', _TWOBIT_SIGNATURE, 0, len(names), 0))
+    index_position = f.tell()
+    f.write(b'\0' * index_size)
+
+    offsets = []
+    for name in names:
+      offsets.append(f.tell())
+      length = reference.chromosome_lengths[name]
+      bases = np.frombuffer(reference.fetch(name, 0, length), dtype=np.uint8)
+
+      is_n = _TWOBIT_CODES[bases] == 255
+      edges = np.flatnonzero(np.diff(np.concatenate([[0], is_n, [0]])))
+      n_starts, n_ends = edges[0::2], edges[1::2]
+
+      codes = np.where(is_n, 0, _TWOBIT_CODES[bases])
+      codes = np.pad(codes, (0, -length % 4)).reshape(-1, 4)
+      packed = (
+          (codes[:, 0] << 6) | (codes[:, 1] << 4) | (codes[:, 2] << 2)
+      ) | codes[:, 3]
+
+      f.write(struct.pack('<2I', length, len(n_starts)))
+      f.write(n_starts.astype('<u4').tobytes())
+      f.write((n_ends - n_starts).astype('<u4').tobytes())
+      f.write(struct.pack('<2I', 0, 0))  # No mask blocks, reserved.
+      f.write(packed.astype(np.uint8).tobytes())
+
+    f.seek(index_position)
+    for name, offset in zip(encoded_names, offsets):
+      f.write(bytes([len(name)]) + name + struct.pack('<I', offset))
+
+
+def open_reference(path: str | os.PathLike[str]) -> ReferenceGenome:
+  """Opens a `.2bit` or FASTA reference genome based on the file extension."""
+  if os.fspath(path).endswith('.2bit'):
+    return TwoBitReference(path)
+  return FastaReference(path)
+
+
+@functools.cache
+def reference_from_env(
+    variable: str = 'REFERENCE_GENOME_PATH',
+) -> ReferenceGenome | None:
+  """Returns the reference genome configured by an environment variable.
+
+  The reference is opened once per process and shared, so the proxy and the
+  service can both resolve intervals without re-mapping the file per request.
+
+  Args:
+    variable: Name of the environment variable holding the path.
+
+  Returns:
+    The opened reference genome, or None if the variable is not set.
+  """
+  if path := os.environ.get(variable):
+    return open_reference(path)
+  return None
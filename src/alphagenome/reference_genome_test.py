@@ -0,0 +1,99 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+from . import reference_genome
+from .protos import dna_model_pb2
+
+_SEQUENCES = {'chr1': 'ACGTacgtNNNNACGTTGCA', 'chr2': 'NNGATTACANN'}
+
+
+class ReferenceGenomeTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    directory = self.enter_context(tempfile.TemporaryDirectory())
+    fasta_path = os.path.join(directory, 'genome.fa')
+    with open(fasta_path, 'w') as f:
+      for name, sequence in _SEQUENCES.items():
+        f.write(f'>{name} description\n')
+        for i in range(0, len(sequence), 6):
+          f.write(sequence[i : i + 6] + '\n')
+    self.fasta = reference_genome.open_reference(fasta_path)
+    self.addCleanup(self.fasta.close)
+    twobit_path = os.path.join(directory, 'genome.2bit')
+    reference_genome.write_twobit(self.fasta, twobit_path)
+    self.twobit = reference_genome.open_reference(twobit_path)
+    self.addCleanup(self.twobit.close)
+
+  def _reference(self, name):
+    return self.fasta if name == 'fasta' else self.twobit
+
+  @parameterized.parameters('fasta', 'twobit')
+  def test_fetch(self, name):
+    reference = self._reference(name)
+    self.assertEqual(
+        reference.chromosome_lengths, {k: len(v) for k, v in _SEQUENCES.items()}
+    )
+    for chromosome, sequence in _SEQUENCES.items():
+      for start in range(len(sequence)):
+        for end in range(start, len(sequence) + 1):
+          self.assertEqual(
+              reference.fetch(chromosome, start, end),
+              sequence[start:end].upper().encode(),
+          )
+
+  @parameterized.product(
+      name=['fasta', 'twobit'],
+      start_end_expected=[
+          (-3, 4, b'NNNACGT'),
+          (16, 23, b'TGCANNN'),
+          (-2, 22, b'NN' + _SEQUENCES['chr1'].upper().encode() + b'NN'),
+          (-5, -2, b'NNN'),
+          (25, 27, b'NN'),
+          (3, 3, b''),
+      ],
+  )
+  def test_fetch_pads_outside_chromosome(self, name, start_end_expected):
+    start, end, expected = start_end_expected
+    self.assertEqual(
+        self._reference(name).fetch('chr1', start, end, pad=True), expected
+    )
+
+  @parameterized.parameters((-1, 4), (16, 21), (5, 4))
+  def test_fetch_out_of_bounds_raises(self, start, end):
+    with self.assertRaises(ValueError):
+      self.fasta.fetch('chr1', start, end)
+
+  def test_unknown_chromosome_raises(self):
+    with self.assertRaises(KeyError):
+      self.twobit.fetch('chrX', 0, 1)
+
+  def test_sequence_reverse_complements_negative_strand(self):
+    interval = dna_model_pb2.Interval(
+        chromosome='chr2',
+        start=0,
+        end=6,
+        strand=dna_model_pb2.STRAND_NEGATIVE,
+    )
+    self.assertEqual(self.twobit.sequence(interval), 'AATCNN')
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,163 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Vectorized 2-bit packing of DNA sequences.
+
+Sequences are packed as A=0, C=1, G=2, T=3 with four bases per byte (first base
+in the most significant bits). Runs of N are stored separately as half-open
+[start, end) ranges and packed as A. Packing is case-insensitive, so soft-masked
+and upper-case sequences share the same packed form and cache key.
+"""
+
+import base64
+from collections.abc import Mapping
+import dataclasses
+import hashlib
+from typing import Any
+
+import numpy as np
+
+
+_BASES = np.frombuffer(b'ACGT', dtype=np.uint8)
+_INVALID = 255
+_N_CODE = 4
+# Maps ASCII bytes to 2-bit codes, _N_CODE for N/n, and _INVALID otherwise.
+_CODES = np.full(256, _INVALID, dtype=np.uint8)
+for _code, _base in enumerate(b'ACGT'):
+  _CODES[_base] = _CODES[_base + 32] = _code
+_CODES[ord('N')] = _CODES[ord('n')] = _N_CODE
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+
+# Field names used when sending packed sequences in JSON requests.
+WIRE_SEQUENCE_FIELD = 'sequence_2bit'
+WIRE_LENGTH_FIELD = 'sequence_length'
+WIRE_N_RUNS_FIELD = 'sequence_n_runs'
+
+
+@dataclasses.dataclass(frozen=True)
+class PackedSequence:
+  """A 2-bit packed DNA sequence.
+
+  Attributes:
+    length: Number of bases in the sequence.
+    data: Packed bases, 4 per byte.
+    n_runs: Array of shape [num_runs, 2] with the [start, end) ranges of N.
+  """
+
+  length: int
+  data: bytes
+  n_runs: np.ndarray
+
+  @property
+  def nbytes(self) -> int:
+    return len(self.data) + self.n_runs.nbytes
+
+
+def _as_uint8(sequence: str | bytes) -> np.ndarray:
+  if isinstance(sequence, str):
+    sequence = sequence.encode('ascii', errors='replace')
+  return np.frombuffer(sequence, dtype=np.uint8)
+
+
+def validate_sequence(sequence: str | bytes) -> None:
+  """Checks that a sequence only contains A, C, G, T and N (any case).
+
+  Args:
+    sequence: Sequence to validate.
+
+  Raises:
+    ValueError: If the sequence contains any other character, reporting the
+      first offending position.
+  """
+  invalid = np.flatnonzero(_CODES[_as_uint8(sequence)] == _INVALID)
+  if invalid.size:
+    position = int(invalid[0])
+    raise ValueError(
+        f'Invalid base {sequence[position:position + 1]!r} at position'
+        f' {position}; only A, C, G, T and N are supported.'
+    )
+
+
+def pack_sequence(sequence: str | bytes) -> PackedSequence:
+  """Packs a DNA sequence to 2 bits per base.
+
+  Args:
+    sequence: Sequence of A, C, G, T and N (any case).
+
+  Returns:
+    The packed sequence.
+
+  Raises:
+    ValueError: If the sequence contains invalid characters.
+  """
+  validate_sequence(sequence)
+  codes = _CODES[_as_uint8(sequence)]
+  length = codes.size
+
+  is_n = codes == _N_CODE
+  edges = np.flatnonzero(np.diff(is_n, prepend=False, append=False))
+  n_runs = edges.reshape(-1, 2).astype(np.int64)
+
+  codes = np.where(is_n, 0, codes)
+  codes = np.pad(codes, (0, -length % 4)).reshape(-1, 4)
+  packed = np.bitwise_or.reduce(codes << _SHIFTS, axis=1).astype(np.uint8)
+  return PackedSequence(length=length, data=packed.tobytes(), n_runs=n_runs)
+
+
+def unpack_sequence(packed: PackedSequence) -> str:
+  """Unpacks a sequence packed by `pack_sequence` to upper-case bases."""
+  data = np.frombuffer(packed.data, dtype=np.uint8)
+  bases = _BASES[((data[:, None] >> _SHIFTS) & 3).ravel()[: packed.length]]
+  if packed.n_runs.size:
+    # Mark N runs with +1/-1 at their boundaries and take the running sum.
+    boundaries = np.zeros(packed.length + 1, dtype=np.int32)
+    np.add.at(boundaries, packed.n_runs[:, 0], 1)
+    np.add.at(boundaries, packed.n_runs[:, 1], -1)
+    bases[np.cumsum(boundaries[:-1]) > 0] = ord('N')
+  return bases.tobytes().decode('ascii')
+
+
+def sequence_key(sequence: str | bytes | PackedSequence) -> str:
+  """Returns a case-insensitive content hash of a sequence for cache keys.
+
+  The hash is computed over the packed representation, so it reads a quarter of
+  the bytes of hashing the sequence text.
+  """
+  if not isinstance(sequence, PackedSequence):
+    sequence = pack_sequence(sequence)
+  digest = hashlib.blake2b(digest_size=16)
+  digest.update(sequence.length.to_bytes(8, 'little'))
+  digest.update(sequence.data)
+  digest.update(sequence.n_runs.astype('<i8').tobytes())
+  return digest.hexdigest()
+
+
+def to_wire(packed: PackedSequence) -> dict[str, Any]:
+  """Returns the JSON fields used to send a packed sequence to the service."""
+  return {
+      WIRE_SEQUENCE_FIELD: base64.b64encode(packed.data).decode('ascii'),
+      WIRE_LENGTH_FIELD: packed.length,
+      WIRE_N_RUNS_FIELD: packed.n_runs.ravel().tolist(),
+  }
+
+
+def from_wire(fields: Mapping[str, Any]) -> PackedSequence:
+  """Inverse of `to_wire`."""
+  return PackedSequence(
+      length=int(fields[WIRE_LENGTH_FIELD]),
+      data=base64.b64decode(fields[WIRE_SEQUENCE_FIELD]),
+      n_runs=np.asarray(
+          fields.get(WIRE_N_RUNS_FIELD, ()), dtype=np.int64
+      ).reshape(-1, 2),
+  )
@@ -0,0 +1,66 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import numpy as np
+
+from . import sequence_codec
+
+
+class SequenceCodecTest(parameterized.TestCase):
+
+  @parameterized.parameters(
+      '',
+      'A',
+      'ACGTACG',
+      'NNNN',
+      'NACGTN',
+      'ACNNGTNA',
+      'acgtNNnnACGT',
+  )
+  def test_round_trip(self, sequence):
+    packed = sequence_codec.pack_sequence(sequence)
+    self.assertLen(packed.data, -(-len(sequence) // 4))
+    self.assertEqual(sequence_codec.unpack_sequence(packed), sequence.upper())
+
+  def test_wire_round_trip(self):
+    rng = np.random.default_rng(0)
+    sequence = ''.join(rng.choice(list('ACGTN'), size=1001))
+    packed = sequence_codec.from_wire(
+        sequence_codec.to_wire(sequence_codec.pack_sequence(sequence))
+    )
+    self.assertEqual(sequence_codec.unpack_sequence(packed), sequence)
+
+  def test_n_runs(self):
+    packed = sequence_codec.pack_sequence('NNACNGTNN')
+    np.testing.assert_array_equal(packed.n_runs, [[0, 2], [4, 5], [7, 9]])
+
+  def test_sequence_key_is_case_insensitive(self):
+    self.assertEqual(
+        sequence_codec.sequence_key('ACGTN'),
+        sequence_codec.sequence_key(b'acgtn'),
+    )
+    self.assertNotEqual(
+        sequence_codec.sequence_key('ACGT'),
+        sequence_codec.sequence_key('ACGTA'),
+    )
+
+  def test_invalid_base_raises(self):
+    with self.assertRaisesRegex(ValueError, 'position 2'):
+      sequence_codec.pack_sequence('ACXT')
+
+
+if __name__ == '__main__':
+  absltest.main()
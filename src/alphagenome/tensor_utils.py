@@ -14,14 +14,23 @@
 
 """Utility functions for converting NumPy arrays to Tensor protocol buffers."""
 
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent import futures
+import dataclasses
+import functools
+import math
+import operator
+import os
+import threading
+from typing import Any
 
-from alphagenome.protos import tensor_pb2
 import immutabledict
 import ml_dtypes
 import numpy as np
 import zstandard
 
+from .protos import tensor_pb2
+
 
 _TENSOR_DTYPE_TO_NUMPY_DTYPE = immutabledict.immutabledict({
     tensor_pb2.DataType.DATA_TYPE_BFLOAT16: np.dtype(ml_dtypes.bfloat16),
@@ -41,29 +50,742 @@ _NUMPY_DTYPE_TO_TENSOR_DTYPE = immutabledict.immutabledict(
     {value: key for key, value in _TENSOR_DTYPE_TO_NUMPY_DTYPE.items()}
 )
 
+_QUANTIZATION_TYPE_TO_NUMPY_DTYPE = immutabledict.immutabledict({
+    tensor_pb2.QuantizationType.QUANTIZATION_TYPE_BFLOAT16: np.dtype(
+        ml_dtypes.bfloat16
+    ),
+    tensor_pb2.QuantizationType.QUANTIZATION_TYPE_FLOAT16: np.dtype(np.float16),
+    tensor_pb2.QuantizationType.QUANTIZATION_TYPE_INT8: np.dtype(np.int8),
+    tensor_pb2.QuantizationType.QUANTIZATION_TYPE_UINT8: np.dtype(np.uint8),
+})
+
+_ZSTD = tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD
+_LZ4 = tensor_pb2.CompressionType.COMPRESSION_TYPE_LZ4
+
+# Maps byte-shuffled compression types to their final compression stage and
+# whether elements are XOR-ed with the previous position before shuffling.
+_SHUFFLE_COMPRESSION_TYPES = immutabledict.immutabledict({
+    tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD_SHUFFLE: (_ZSTD, False),
+    tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD_XOR_SHUFFLE: (_ZSTD, True),
+    tensor_pb2.CompressionType.COMPRESSION_TYPE_LZ4_SHUFFLE: (_LZ4, False),
+    tensor_pb2.CompressionType.COMPRESSION_TYPE_LZ4_XOR_SHUFFLE: (_LZ4, True),
+})
+
+# Quantized tensors are dequantized to files in blocks of about this size.
+_FILE_BLOCK_BYTES = 64 * 2**20
+
+# Tensors smaller than this are always (de)compressed serially, as the thread
+# pool overhead outweighs the speedup.
+_MIN_PARALLEL_BYTES = 4 * 2**20
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def default_executor() -> futures.ThreadPoolExecutor:
+  """Returns the thread pool shared by `pack_tensor` and `unpack_proto`.
+
+  zstd releases the GIL while (de)compressing, so chunks are processed in
+  parallel by threads. The pool is created on first use with one worker per CPU.
+  """
+  global _default_executor
+  with _default_executor_lock:
+    if _default_executor is None:
+      _default_executor = futures.ThreadPoolExecutor(
+          max_workers=os.cpu_count(), thread_name_prefix='tensor_utils'
+      )
+    return _default_executor
+
+
+def _get_executor(
+    parallel: bool | futures.Executor, num_chunks: int, num_bytes: int
+) -> futures.Executor | None:
+  """Returns the executor to use, or None to run serially."""
+  if not parallel or num_chunks < 2 or num_bytes < _MIN_PARALLEL_BYTES:
+    return None
+  if isinstance(parallel, futures.Executor):
+    return parallel
+  return default_executor()
+
+
+@dataclasses.dataclass(frozen=True)
+class CompressionOptions:
+  """Options for compressing tensor data.
+
+  Attributes:
+    level: zstd compression level. Higher levels trade speed for ratio;
+      negative levels enable zstd's fast modes. LZ4 always uses its default
+      (fastest) level.
+    threads: Number of zstd worker threads used to compress each chunk. 0
+      compresses on the calling thread, -1 uses one thread per CPU.
+    write_checksum: Whether to append a checksum to each frame, verified on
+      decompression.
+    write_content_size: Whether to store the decompressed size in each frame
+      header. Required to decompress chunks in parallel.
+  """
+
+  level: int = 3
+  threads: int = 0
+  write_checksum: bool = False
+  write_content_size: bool = True
+
+
+_DEFAULT_COMPRESSION_OPTIONS = CompressionOptions()
+
+# zstd contexts are expensive to create and not thread-safe, so they are cached
+# per thread (and per set of options for compressors).
+_thread_local = threading.local()
+
+
+def _zstd_compressor(options: CompressionOptions) -> zstandard.ZstdCompressor:
+  compressors = _thread_local.__dict__.setdefault('compressors', {})
+  if (compressor := compressors.get(options)) is None:
+    compressor = compressors[options] = zstandard.ZstdCompressor(
+        level=options.level,
+        threads=options.threads,
+        write_checksum=options.write_checksum,
+        write_content_size=options.write_content_size,
+    )
+  return compressor
+
+
+def _zstd_decompressor() -> zstandard.ZstdDecompressor:
+  if (decompressor := getattr(_thread_local, 'decompressor', None)) is None:
+    decompressor = _thread_local.decompressor = zstandard.ZstdDecompressor()
+  return decompressor
+
+
+def _lz4_frame():
+  """Returns the `lz4.frame` module, which is an optional dependency."""
+  try:
+    import lz4.frame  # pylint: disable=g-import-not-at-top
+  except ImportError as e:
+    raise ImportError(
+        'LZ4 compression requires the lz4 package: pip install lz4'
+    ) from e
+  return lz4.frame
+
+
+def _uint_dtype(itemsize: int) -> np.dtype:
+  return np.dtype(f'u{itemsize}')
+
+
+def _row_stride(shape: Sequence[int]) -> int:
+  """Returns the number of elements per position along the first axis."""
+  return max(int(np.prod(shape[1:], dtype=np.int64)), 1)
+
+
+def _shuffle(data: memoryview, itemsize: int, xor_stride: int) -> np.ndarray:
+  """Byte-shuffles elements, optionally XOR-ing them with the previous row.
+
+  Args:
+    data: Contiguous buffer of elements.
+    itemsize: Number of bytes per element.
+    xor_stride: If non-zero, each element is XOR-ed with the element this many
+      elements earlier before shuffling.
+
+  Returns:
+    1D uint8 array holding byte 0 of every element, then byte 1, and so on.
+  """
+  items = np.frombuffer(data, dtype=_uint_dtype(itemsize))
+  if xor_stride:
+    xored = items.copy()
+    np.bitwise_xor(
+        items[xor_stride:], items[:-xor_stride], out=xored[xor_stride:]
+    )
+    items = xored
+  # Copying one byte plane at a time is much faster than a transpose.
+  item_bytes = items.view(np.uint8).reshape(-1, itemsize)
+  planes = np.empty((itemsize, items.size), dtype=np.uint8)
+  for i in range(itemsize):
+    planes[i] = item_bytes[:, i]
+  return planes.reshape(-1)
+
+
+def _unshuffle_into(
+    data: bytes, out: np.ndarray, itemsize: int, xor_stride: int
+) -> int:
+  """Inverse of `_shuffle`, writing into the start of a uint8 array."""
+  if len(data) > out.size:
+    raise ValueError('Decompressed data is larger than the tensor.')
+  target = out[: len(data)]
+  planes = np.frombuffer(data, dtype=np.uint8).reshape(itemsize, -1)
+  item_bytes = target.reshape(-1, itemsize)
+  for i in range(itemsize):
+    item_bytes[:, i] = planes[i]
+  if xor_stride:
+    items = target.view(_uint_dtype(itemsize))
+    num_rows = items.size // xor_stride
+    rows = items[: num_rows * xor_stride].reshape(num_rows, xor_stride)
+    np.bitwise_xor.accumulate(rows, axis=0, out=rows)
+    if num_rows:
+      tail = items[num_rows * xor_stride :]
+      tail ^= rows[-1, : tail.size]
+  return len(data)
+
 
 def _compress_bytes(
-    array: np.ndarray, compression_type: tensor_pb2.CompressionType
+    data: memoryview,
+    compression_type: tensor_pb2.CompressionType,
+    options: CompressionOptions = _DEFAULT_COMPRESSION_OPTIONS,
+    *,
+    itemsize: int = 1,
+    stride: int = 1,
 ):
-  """Compresses a c-contiguous array to the specified compression type."""
-  assert array.flags.c_contiguous
-  array = array.view(np.uint8)
+  """Compresses a contiguous buffer to the specified compression type.
+
+  Args:
+    data: Contiguous buffer of whole elements.
+    compression_type: The compression type to apply.
+    options: Compression options.
+    itemsize: Number of bytes per element, used by byte-shuffling types.
+    stride: Number of elements per position along the first axis, used by XOR
+      types.
+
+  Returns:
+    The compressed bytes.
+  """
+  if (shuffled := _SHUFFLE_COMPRESSION_TYPES.get(compression_type)) is not None:
+    compression_type, xor = shuffled
+    data = _shuffle(data, itemsize, stride if xor else 0)
   match compression_type:
     case tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD:
-      return zstandard.compress(array.data)
+      return _zstd_compressor(options).compress(data)
+    case tensor_pb2.CompressionType.COMPRESSION_TYPE_LZ4:
+      return _lz4_frame().compress(
+          data,
+          store_size=options.write_content_size,
+          content_checksum=options.write_checksum,
+      )
     case tensor_pb2.CompressionType.COMPRESSION_TYPE_NONE:
-      return bytes(array.data)
+      return bytes(data)
+    case _:
+      raise ValueError(f'Unsupported compression type: {compression_type}')
+
+
+def _byte_view(value: np.ndarray) -> memoryview:
+  """Returns a flat byte memoryview of a C-contiguous array without copying."""
+  assert value.flags.c_contiguous
+  return memoryview(value.reshape(-1).view(np.uint8))
+
+
+def _chunk_views(
+    value: np.ndarray, bytes_per_chunk: int
+) -> tuple[int, Iterator[memoryview]]:
+  """Splits a C-contiguous array into whole-item byte slices.
+
+  Args:
+    value: Array to split.
+    bytes_per_chunk: Maximum number of bytes per slice, rounded down to a
+      multiple of the item size.
+
+  Returns:
+    Tuple of the number of slices and an iterator over them. Slices are views
+    into `value`, and an empty array yields a single empty slice.
+
+  Raises:
+    ValueError: If `bytes_per_chunk` is smaller than the item size.
+  """
+  if bytes_per_chunk < value.itemsize:
+    raise ValueError(f'{bytes_per_chunk=} must be >= {value.itemsize=}.')
+  view = _byte_view(value)
+  step = bytes_per_chunk // value.itemsize * value.itemsize
+  starts = range(0, max(len(view), 1), step)
+  return len(starts), (view[start : start + step] for start in starts)
 
 
 def _decompress_bytes(
     data: bytes, compression_type: tensor_pb2.CompressionType
 ):
-  """Decompress bytes using the specified compression type."""
+  """Decompress bytes using the specified (unshuffled) compression type."""
   match compression_type:
     case tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD:
-      return zstandard.decompress(data)
+      # Unlike decompress(), decompressobj() supports frames without a stored
+      # content size.
+      return _zstd_decompressor().decompressobj().decompress(data)
+    case tensor_pb2.CompressionType.COMPRESSION_TYPE_LZ4:
+      return _lz4_frame().decompress(data)
     case tensor_pb2.CompressionType.COMPRESSION_TYPE_NONE:
       return data
+    case _:
+      raise ValueError(f'Unsupported compression type: {compression_type}')
+
+
+def _decompress_into(
+    data: bytes,
+    compression_type: tensor_pb2.CompressionType,
+    out: np.ndarray,
+    *,
+    itemsize: int = 1,
+    stride: int = 1,
+) -> int:
+  """Decompresses bytes into the start of a uint8 array.
+
+  zstd and uncompressed data are written without intermediate copies.
+  Byte-shuffled types are decompressed into a temporary chunk-sized buffer and
+  unshuffled into `out`.
+
+  Args:
+    data: Compressed bytes.
+    compression_type: The compression type of `data`.
+    out: 1D, C-contiguous uint8 array to write the decompressed bytes into.
+    itemsize: Number of bytes per element, used by byte-shuffling types.
+    stride: Number of elements per position along the first axis, used by XOR
+      types.
+
+  Returns:
+    The number of bytes written.
+
+  Raises:
+    ValueError: If the decompressed data does not fit into `out`.
+  """
+  if (shuffled := _SHUFFLE_COMPRESSION_TYPES.get(compression_type)) is not None:
+    compression_type, xor = shuffled
+    return _unshuffle_into(
+        _decompress_bytes(data, compression_type),
+        out,
+        itemsize,
+        stride if xor else 0,
+    )
+  match compression_type:
+    case tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD:
+      view = memoryview(out)
+      written = 0
+      with _zstd_decompressor().stream_reader(data) as reader:
+        while written < len(view) and (read := reader.readinto(view[written:])):
+          written += read
+        overflow = reader.read(1)
+    case (
+        tensor_pb2.CompressionType.COMPRESSION_TYPE_NONE
+        | tensor_pb2.CompressionType.COMPRESSION_TYPE_LZ4
+    ):
+      data = _decompress_bytes(data, compression_type)
+      written = min(len(data), out.size)
+      out[:written] = np.frombuffer(data, dtype=np.uint8, count=written)
+      overflow = len(data) > written
+    case _:
+      raise ValueError(f'Unsupported compression type: {compression_type}')
+  if overflow:
+    raise ValueError('Decompressed data is larger than the tensor.')
+  return written
+
+
+def _decompressed_size(chunk: tensor_pb2.TensorChunk) -> int | None:
+  """Returns the decompressed size of a chunk if known without decompressing."""
+  compression_type, _ = _SHUFFLE_COMPRESSION_TYPES.get(
+      chunk.compression_type, (chunk.compression_type, False)
+  )
+  match compression_type:
+    case tensor_pb2.CompressionType.COMPRESSION_TYPE_NONE:
+      return len(chunk.data)
+    case tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD:
+      size = zstandard.frame_content_size(chunk.data)
+      return size if size >= 0 else None
+    case tensor_pb2.CompressionType.COMPRESSION_TYPE_LZ4:
+      # A content size of 0 means it was not stored.
+      size = _lz4_frame().get_frame_info(chunk.data)['content_size']
+      return size or None
+    case _:
+      return None
+
+
+def _parallel_decompress_into(
+    chunks: Sequence[tensor_pb2.TensorChunk],
+    buffer: np.ndarray,
+    executor: futures.Executor,
+    *,
+    itemsize: int,
+    stride: int,
+) -> int | None:
+  """Decompresses chunks into their slices of `buffer` in parallel.
+
+  Returns:
+    The number of bytes written, or None if the chunk offsets cannot be
+    determined up front (in which case nothing is written).
+  """
+  sizes = [_decompressed_size(chunk) for chunk in chunks]
+  if None in sizes or sum(sizes) != buffer.size:
+    return None
+  offsets = np.cumsum([0, *sizes])
+  tasks = [
+      executor.submit(
+          _decompress_into,
+          chunk.data,
+          chunk.compression_type,
+          buffer[start:end],
+          itemsize=itemsize,
+          stride=stride,
+      )
+      for chunk, start, end in zip(chunks, offsets[:-1], offsets[1:])
+  ]
+  return sum(task.result() for task in tasks)
+
+
+def _output_array(
+    proto: tensor_pb2.Tensor, out: np.ndarray | None
+) -> np.ndarray:
+  """Returns `out` after validation, or a newly allocated output array."""
+  dtype = _TENSOR_DTYPE_TO_NUMPY_DTYPE[proto.data_type]
+  shape = tuple(proto.shape)
+  if out is None:
+    return np.empty(shape, dtype=dtype)
+  if out.shape != shape or out.dtype != dtype:
+    raise ValueError(
+        f'Expected out with {shape=} and {dtype=}, got {out.shape=} and'
+        f' {out.dtype=}.'
+    )
+  if not out.flags.c_contiguous or not out.flags.writeable:
+    raise ValueError('out must be C-contiguous and writeable.')
+  return out
+
+
+def _is_floating(dtype: np.dtype) -> bool:
+  return np.issubdtype(dtype, np.floating) or dtype == ml_dtypes.bfloat16
+
+
+def _broadcast_shape(ndim: int, axis: int) -> list[int]:
+  shape = [1] * ndim
+  shape[axis] = -1
+  return shape
+
+
+def quantize_array(
+    value: np.ndarray,
+    quantization_type: tensor_pb2.QuantizationType,
+    *,
+    axis: int = -1,
+) -> tuple[np.ndarray, tensor_pb2.Quantization]:
+  """Quantizes a floating point array for transport.
+
+  Integer quantization is affine with a scale and zero point per index along
+  `axis`, mapping the minimum and maximum of each track to the ends of the
+  integer range. NaN and infinite values would corrupt these parameters, so they
+  are only accepted by the floating point quantizations, which carry them
+  through unchanged.
+
+  Args:
+    value: Floating point array to quantize.
+    quantization_type: The quantization to apply.
+    axis: Axis to compute integer quantization parameters along, by default
+      the track axis.
+
+  Returns:
+    Tuple of the quantized array and the parameters to dequantize it.
+
+  Raises:
+    ValueError: If `value` is not floating point, or integer quantization is
+      requested and `value` is a scalar or has non-finite values.
+  """
+  value = np.asarray(value)
+  if not _is_floating(value.dtype):
+    raise ValueError(
+        f'Only floating point arrays can be quantized: {value.dtype}'
+    )
+  if quantization_type not in _QUANTIZATION_TYPE_TO_NUMPY_DTYPE:
+    raise ValueError(f'Unsupported quantization type: {quantization_type}')
+  dtype = _QUANTIZATION_TYPE_TO_NUMPY_DTYPE[quantization_type]
+  quantization = tensor_pb2.Quantization(
+      original_data_type=_NUMPY_DTYPE_TO_TENSOR_DTYPE[value.dtype]
+  )
+  if _is_floating(dtype):
+    return value.astype(dtype), quantization
+
+  if not value.ndim:
+    raise ValueError('Integer quantization requires at least one dimension.')
+  if num_non_finite := value.size - np.count_nonzero(np.isfinite(value)):
+    raise ValueError(
+        f'Integer quantization requires finite values, got {num_non_finite}'
+        ' NaN or infinite values.'
+    )
+  axis = axis % value.ndim
+  reduce_axes = tuple(i for i in range(value.ndim) if i != axis)
+  info = np.iinfo(dtype)
+  if value.size:
+    low = value.min(axis=reduce_axes).astype(np.float32)
+    high = value.max(axis=reduce_axes).astype(np.float32)
+  else:
+    low = high = np.zeros(value.shape[axis], dtype=np.float32)
+  scale = (high - low) / np.float32(int(info.max) - int(info.min))
+  scale = np.where(scale > 0, scale, np.float32(1))
+  zero_point = np.float32(info.min) - low / scale
+
+  shape = _broadcast_shape(value.ndim, axis)
+  quantized = np.divide(value, scale.reshape(shape), dtype=np.float32)
+  quantized += zero_point.reshape(shape)
+  np.rint(quantized, out=quantized)
+  np.clip(quantized, info.min, info.max, out=quantized)
+
+  quantization.axis = axis
+  quantization.scale[:] = scale
+  quantization.zero_point[:] = zero_point
+  return quantized.astype(dtype), quantization
+
+
+def dequantize_array(
+    value: np.ndarray,
+    quantization: tensor_pb2.Quantization,
+    *,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+  """Restores an array quantized by `quantize_array` to its original dtype.
+
+  Args:
+    value: Quantized array.
+    quantization: Parameters returned by `quantize_array`.
+    out: Optional array with the shape of `value` and the original dtype to
+      write into.
+
+  Returns:
+    The dequantized array (`out` if provided).
+  """
+  dtype = _TENSOR_DTYPE_TO_NUMPY_DTYPE[quantization.original_data_type]
+  if out is not None and (out.shape != value.shape or out.dtype != dtype):
+    raise ValueError(
+        f'Expected out with shape={value.shape} and {dtype=}, got'
+        f' {out.shape=} and {out.dtype=}.'
+    )
+  if not quantization.scale:
+    if out is None:
+      return upcast_floating(value).astype(dtype, copy=False)
+    np.copyto(out, value, casting='unsafe')
+    return out
+
+  shape = _broadcast_shape(value.ndim, quantization.axis)
+  scale = np.asarray(quantization.scale, dtype=np.float32).reshape(shape)
+  zero_point = np.asarray(quantization.zero_point, dtype=np.float32)
+  if out is None:
+    out = np.empty(value.shape, dtype=dtype)
+  np.subtract(value, zero_point.reshape(shape), out=out, dtype=np.float32)
+  np.multiply(out, scale, out=out)
+  return out
+
+
+@functools.lru_cache(maxsize=8)
+def _triu_indices(n: int) -> tuple[np.ndarray, np.ndarray]:
+  rows, cols = np.triu_indices(n)
+  rows.flags.writeable = cols.flags.writeable = False
+  return rows, cols
+
+
+def _triangle_size(num_items: int) -> int:
+  """Returns N such that N * (N + 1) / 2 == num_items."""
+  n = (math.isqrt(8 * num_items + 1) - 1) // 2
+  if n * (n + 1) // 2 != num_items:
+    raise ValueError(f'{num_items} is not the size of an upper triangle.')
+  return n
+
+
+def pack_upper_triangle(value: np.ndarray) -> np.ndarray:
+  """Gathers the upper triangles of symmetric matrices.
+
+  Args:
+    value: Array of shape [N, N, ...] whose first two axes index symmetric
+      matrices. Only the upper triangle is read; symmetry is not checked.
+
+  Returns:
+    Array of shape [N * (N + 1) / 2, ...] holding the upper triangle, including
+    the diagonal, row by row.
+  """
+  value = np.asarray(value)
+  if value.ndim < 2 or value.shape[0] != value.shape[1]:
+    raise ValueError(f'Expected shape [N, N, ...], got {value.shape}.')
+  rows, cols = _triu_indices(value.shape[0])
+  return value[rows, cols]
+
+
+def unpack_upper_triangle(
+    packed: np.ndarray, *, out: np.ndarray | None = None
+) -> np.ndarray:
+  """Rebuilds symmetric matrices from `pack_upper_triangle` output.
+
+  Args:
+    packed: Array of shape [N * (N + 1) / 2, ...].
+    out: Optional array of shape [N, N, ...] to write into.
+
+  Returns:
+    Array of shape [N, N, ...] (`out` if provided).
+  """
+  n = _triangle_size(packed.shape[0])
+  shape = (n, n, *packed.shape[1:])
+  if out is None:
+    out = np.empty(shape, dtype=packed.dtype)
+  elif out.shape != shape:
+    raise ValueError(f'Expected out with {shape=}, got {out.shape=}.')
+  rows, cols = _triu_indices(n)
+  out[rows, cols] = packed
+  out[cols, rows] = packed
+  return out
+
+
+class SymmetricMatrixView:
+  """Lazy, read-only view of symmetric matrices stored as upper triangles.
+
+  Indexing reads only the requested entries from the packed data. The first
+  two axes accept integers, slices, integer arrays and boolean masks, and are
+  indexed orthogonally (like `np.ix_`) when both select several entries.
+  `np.asarray(view)` materializes the full array.
+  """
+
+  def __init__(self, packed: np.ndarray):
+    """Initializes the view.
+
+    Args:
+      packed: Array of shape [N * (N + 1) / 2, ...] as returned by
+        `pack_upper_triangle`.
+    """
+    self._packed = packed
+    self._size = _triangle_size(packed.shape[0])
+
+  @property
+  def packed(self) -> np.ndarray:
+    return self._packed
+
+  @property
+  def shape(self) -> tuple[int, ...]:
+    return (self._size, self._size, *self._packed.shape[1:])
+
+  @property
+  def ndim(self) -> int:
+    return self._packed.ndim + 1
+
+  @property
+  def dtype(self) -> np.dtype:
+    return self._packed.dtype
+
+  def __len__(self) -> int:
+    return self._size
+
+  def __getitem__(self, key: Any) -> np.ndarray:
+    key = key if isinstance(key, tuple) else (key,)
+    ellipses = [i for i, k in enumerate(key) if k is Ellipsis]
+    if ellipses:
+      position = ellipses[0]
+      fill = (slice(None),) * (self.ndim - len(key) + 1)
+      key = key[:position] + fill + key[position + 1 :]
+    key = key + (slice(None),) * (2 - len(key))
+    positions = np.arange(self._size)
+    rows, cols = positions[key[0]], positions[key[1]]
+    if rows.ndim and cols.ndim:
+      rows, cols = rows[:, None], cols[None, :]
+    low, high = np.minimum(rows, cols), np.maximum(rows, cols)
+    index = low * (2 * self._size - low + 1) // 2 + high - low
+    return self._packed[(index, *key[2:])]
+
+  def __array__(self, dtype=None, copy=None) -> np.ndarray:
+    del copy  # A new array is always returned.
+    full = unpack_upper_triangle(self._packed)
+    return full if dtype is None else full.astype(dtype)
+
+
+def _prepare_value(
+    value: ...,
+    quantization_type: tensor_pb2.QuantizationType,
+    layout: tensor_pb2.TensorLayout,
+) -> tuple[np.ndarray, tensor_pb2.Tensor]:
+  """Applies the layout and quantization to a value.
+
+  Returns:
+    Tuple of the C-contiguous data to store and the Tensor header without a
+    payload.
+  """
+  packed = tensor_pb2.Tensor(layout=layout)
+  match layout:
+    case tensor_pb2.TensorLayout.TENSOR_LAYOUT_DENSE:
+      pass
+    case tensor_pb2.TensorLayout.TENSOR_LAYOUT_SYMMETRIC_UPPER_TRIANGLE:
+      value = pack_upper_triangle(value)
+    case _:
+      raise ValueError(f'Unsupported layout: {layout}')
+  value = np.ascontiguousarray(value)
+  if quantization_type != tensor_pb2.QuantizationType.QUANTIZATION_TYPE_NONE:
+    value, quantization = quantize_array(value, quantization_type)
+    packed.quantization.CopyFrom(quantization)
+  packed.shape[:] = value.shape
+  packed.data_type = _NUMPY_DTYPE_TO_TENSOR_DTYPE[value.dtype]
+  return value, packed
+
+
+def _restore_value(
+    proto: tensor_pb2.Tensor,
+    value: np.ndarray,
+    *,
+    out: np.ndarray | None,
+    dequantize: bool,
+    symmetric_view: bool,
+) -> np.ndarray | SymmetricMatrixView:
+  """Inverse of `_prepare_value` for unpacked stored data."""
+  symmetric = (
+      proto.layout
+      == tensor_pb2.TensorLayout.TENSOR_LAYOUT_SYMMETRIC_UPPER_TRIANGLE
+  )
+  if dequantize and proto.HasField('quantization'):
+    value = dequantize_array(
+        value, proto.quantization, out=None if symmetric else out
+    )
+  if not symmetric:
+    return value
+  if symmetric_view:
+    return SymmetricMatrixView(value)
+  return unpack_upper_triangle(value, out=out)
+
+
+def pack_tensor_stream(
+    value: ...,
+    *,
+    bytes_per_chunk: int,
+    compression_type: tensor_pb2.CompressionType = (
+        tensor_pb2.CompressionType.COMPRESSION_TYPE_NONE
+    ),
+    compression_options: CompressionOptions = _DEFAULT_COMPRESSION_OPTIONS,
+    quantization_type: tensor_pb2.QuantizationType = (
+        tensor_pb2.QuantizationType.QUANTIZATION_TYPE_NONE
+    ),
+    layout: tensor_pb2.TensorLayout = (
+        tensor_pb2.TensorLayout.TENSOR_LAYOUT_DENSE
+    ),
+) -> tuple[tensor_pb2.Tensor, Iterator[tensor_pb2.TensorChunk]]:
+  """Encodes the value as a Tensor header and a lazy stream of chunks.
+
+  Unlike `pack_tensor`, chunks are compressed one at a time as the returned
+  iterator is consumed, so a response generator can send a tensor while only
+  holding a single compressed chunk in memory. The header, including
+  `chunk_count`, is complete before any chunk is produced.
+
+  Args:
+    value: An array-like object to pack. C-contiguous NumPy arrays, including
+      `np.memmap` arrays, are sliced in place without copying; the array must
+      not be modified until the iterator is exhausted.
+    bytes_per_chunk: The maximum number of bytes in each chunk before
+      compression. Must be at least the item size of `value`.
+    compression_type: The type of compression to apply to each chunk.
+    compression_options: Compression level, zstd worker threads and frame
+      options.
+    quantization_type: Lossy quantization to apply before compression. See
+      `pack_tensor`.
+    layout: How to lay out the elements. See `pack_tensor`.
+
+  Returns:
+    Tuple of Tensor protocol buffer and an iterator of TensorChunk protos.
+  """
+  value, packed = _prepare_value(value, quantization_type, layout)
+  packed.chunk_count, views = _chunk_views(value, bytes_per_chunk)
+  packed.items_per_chunk = bytes_per_chunk // value.itemsize
+  stride = _row_stride(value.shape)
+
+  def _chunks():
+    for view in views:
+      yield tensor_pb2.TensorChunk(
+          data=_compress_bytes(
+              view,
+              compression_type,
+              compression_options,
+              itemsize=value.itemsize,
+              stride=stride,
+          ),
+          compression_type=compression_type,
+      )
+
+  return packed, _chunks()
 
 
 def pack_tensor(
@@ -73,45 +795,75 @@ def pack_tensor(
     compression_type: tensor_pb2.CompressionType = (
         tensor_pb2.CompressionType.COMPRESSION_TYPE_NONE
     ),
+    compression_options: CompressionOptions = _DEFAULT_COMPRESSION_OPTIONS,
+    quantization_type: tensor_pb2.QuantizationType = (
+        tensor_pb2.QuantizationType.QUANTIZATION_TYPE_NONE
+    ),
+    layout: tensor_pb2.TensorLayout = (
+        tensor_pb2.TensorLayout.TENSOR_LAYOUT_DENSE
+    ),
+    parallel: bool | futures.Executor = False,
 ) -> tuple[tensor_pb2.Tensor, Sequence[tensor_pb2.TensorChunk]]:
   """Encodes the value as a Tensor and optional sequence of chunks.
 
   Args:
     value: An array-like object to pack. For example, scalar (float, int, bool,
-      etc.), NumPy array, or nested lists of scalars.
+      etc.), NumPy array, or nested lists of scalars. C-contiguous arrays are
+      not copied, so a chunked `np.memmap` (see `np.load(..., mmap_mode='r')`)
+      is read from disk one chunk at a time. Quantization materializes the
+      quantized array in memory.
     bytes_per_chunk: The number of bytes to include in each chunk. If 0, the
       entire value will be packed into the Tensor proto, otherwise the value
       will be split into chunks of this size.
     compression_type: The type of compression to apply to the data. This is
       applied to each chunk separately.
+    compression_options: Compression level, zstd worker threads and frame
+      options.
+    quantization_type: Lossy quantization to apply before compression, for
+      consumers that only need 8 or 16 bits of precision. Floating point values
+      are cast to bfloat16/float16, or quantized to int8/uint8 with a scale and
+      zero point per track (last axis) stored in the header.
+      `unpack_proto` dequantizes to the original data type.
+    layout: How to lay out the elements. For [N, N, ...] tensors of symmetric
+      matrices such as contact maps, TENSOR_LAYOUT_SYMMETRIC_UPPER_TRIANGLE
+      stores only the upper triangle, halving the data to compress and send.
+      `unpack_proto` rebuilds the full matrices.
+    parallel: Whether to compress chunks in parallel. If True, the shared
+      `default_executor()` is used; an executor can also be passed directly.
+      Chunk order is preserved, and small tensors are always compressed
+      serially.
 
   Returns:
     Tuple of Tensor protocol buffer and, if items_per_chunk is greater than 0, a
     sequence of TensorChunk protos.
   """
-  packed = tensor_pb2.Tensor()
-  value = np.ascontiguousarray(value)
+  value, packed = _prepare_value(value, quantization_type, layout)
 
-  packed.shape[:] = value.shape
-  packed.data_type = _NUMPY_DTYPE_TO_TENSOR_DTYPE[value.dtype]
+  def _compress(view):
+    return _compress_bytes(
+        view,
+        compression_type,
+        compression_options,
+        itemsize=value.itemsize,
+        stride=_row_stride(value.shape),
+    )
 
   chunks = []
   if bytes_per_chunk > 0:
-    items_per_chunk = bytes_per_chunk // value.itemsize
-    if bytes_per_chunk < value.itemsize:
-      raise ValueError(f'{bytes_per_chunk=} must be >= {value.itemsize=}.')
-    for chunk in np.split(
-        value.ravel(), range(items_per_chunk, value.size, items_per_chunk)
-    ):
+    num_chunks, views = _chunk_views(value, bytes_per_chunk)
+
+    executor = _get_executor(parallel, num_chunks, value.nbytes)
+    compressed = (
+        executor.map(_compress, views) if executor else map(_compress, views)
+    )
+    for data in compressed:
       chunks.append(
-          tensor_pb2.TensorChunk(
-              data=_compress_bytes(chunk, compression_type),
-              compression_type=compression_type,
-          )
+          tensor_pb2.TensorChunk(data=data, compression_type=compression_type)
       )
     packed.chunk_count = len(chunks)
+    packed.items_per_chunk = bytes_per_chunk // value.itemsize
   else:
-    packed.array.data = _compress_bytes(value, compression_type)
+    packed.array.data = _compress(_byte_view(value))
     packed.array.compression_type = compression_type
 
   return packed, chunks
@@ -120,33 +872,569 @@ def pack_tensor(
 def unpack_proto(
     proto: tensor_pb2.Tensor,
     chunks: Iterable[tensor_pb2.TensorChunk] = (),
-) -> np.ndarray:
+    *,
+    out: np.ndarray | None = None,
+    parallel: bool | futures.Executor = False,
+    dequantize: bool = True,
+    symmetric_view: bool = False,
+) -> np.ndarray | SymmetricMatrixView:
   """Converts a Tensor proto and any chunks into a NumPy array.
 
+  The output is allocated once from the shape and data type in the header, and
+  each chunk is decompressed directly into its slice of the output, so peak
+  memory is the size of the tensor plus a single compressed chunk.
+
   Args:
     proto: Tensor proto to unpack.
     chunks: Optional sequence of TensorChunk protos to unpack.
+    out: Optional C-contiguous, writeable array with the shape and dtype of the
+      tensor to unpack into, for example a reused buffer. If not provided, a new
+      array is allocated. For quantized tensors that are dequantized, the dtype
+      is the original data type; for symmetric layouts, the shape is the full
+      [N, N, ...] shape.
+    parallel: Whether to decompress chunks in parallel. If True, the shared
+      `default_executor()` is used; an executor can also be passed directly.
+      Small tensors, and chunks without a stored content size, are always
+      decompressed serially.
+    dequantize: Whether to dequantize quantized tensors to their original data
+      type. If False, the transported values are returned as is.
+    symmetric_view: For tensors with a symmetric layout, whether to return a
+      lazy `SymmetricMatrixView` of the stored upper triangle instead of
+      rebuilding the full matrices.
 
   Returns:
-    NumPy array of the unpacked data.
+    Writeable NumPy array of the unpacked data (`out` if provided), or a
+    `SymmetricMatrixView` if requested.
   """
+  if proto.layout != tensor_pb2.TensorLayout.TENSOR_LAYOUT_DENSE or (
+      dequantize and proto.HasField('quantization')
+  ):
+    if symmetric_view and out is not None:
+      raise ValueError('out cannot be used with symmetric_view.')
+    return _restore_value(
+        proto,
+        _unpack_stored(proto, chunks, parallel=parallel),
+        out=out,
+        dequantize=dequantize,
+        symmetric_view=symmetric_view,
+    )
+  return _unpack_stored(proto, chunks, out=out, parallel=parallel)
+
+
+def _unpack_stored(
+    proto: tensor_pb2.Tensor,
+    chunks: Iterable[tensor_pb2.TensorChunk],
+    *,
+    out: np.ndarray | None = None,
+    parallel: bool | futures.Executor = False,
+) -> np.ndarray:
+  """Unpacks the stored data of a tensor, without dequantizing or layout."""
+  out = _output_array(proto, out)
+  buffer = out.reshape(-1).view(np.uint8)
+  itemsize, stride = out.itemsize, _row_stride(out.shape)
+
   match proto.WhichOneof('payload'):
     case 'array':
-      data = _decompress_bytes(proto.array.data, proto.array.compression_type)
+      written = _decompress_into(
+          proto.array.data,
+          proto.array.compression_type,
+          buffer,
+          itemsize=itemsize,
+          stride=stride,
+      )
     case 'chunk_count':
-      data = b''.join([
-          _decompress_bytes(chunk.data, chunk.compression_type)
-          for chunk in chunks
-      ])
+      written = None
+      if parallel:
+        chunks = list(chunks)
+        if executor := _get_executor(parallel, len(chunks), buffer.size):
+          written = _parallel_decompress_into(
+              chunks, buffer, executor, itemsize=itemsize, stride=stride
+          )
+      if written is None:
+        written = 0
+        for chunk in chunks:
+          written += _decompress_into(
+              chunk.data,
+              chunk.compression_type,
+              buffer[written:],
+              itemsize=itemsize,
+              stride=stride,
+          )
     case _:
       raise ValueError(
           f'Unsupported payload type: {proto.WhichOneof("payload")}'
       )
 
-  array = np.frombuffer(
-      data, dtype=_TENSOR_DTYPE_TO_NUMPY_DTYPE[proto.data_type]
-  ).reshape(proto.shape)
-  return array
+  if written != buffer.size:
+    raise ValueError(
+        f'Expected {buffer.size} bytes of tensor data, got {written}.'
+    )
+  return out
+
+
+@dataclasses.dataclass(frozen=True)
+class ChunkIndex:
+  """Maps element ranges of a chunked tensor to the chunks that hold them.
+
+  Attributes:
+    num_items: Number of elements in the tensor.
+    items_per_chunk: Number of elements in every chunk except the last.
+  """
+
+  num_items: int
+  items_per_chunk: int
+
+  @classmethod
+  def from_proto(
+      cls,
+      proto: tensor_pb2.Tensor,
+      chunks: Sequence[tensor_pb2.TensorChunk] = (),
+  ) -> 'ChunkIndex':
+    """Returns the index of a chunked Tensor.
+
+    Args:
+      proto: Chunked Tensor header.
+      chunks: The tensor's chunks. Only needed, and only the first chunk is
+        read, if the header predates `items_per_chunk`.
+
+    Raises:
+      ValueError: If the tensor is not chunked or the chunk size is
+        inconsistent with `chunk_count`.
+    """
+    if proto.WhichOneof('payload') != 'chunk_count':
+      raise ValueError('Only chunked tensors have a chunk index.')
+    num_items = int(np.prod(proto.shape, dtype=np.int64))
+    items_per_chunk = proto.items_per_chunk
+    if not items_per_chunk and proto.chunk_count:
+      chunk = chunks[0]
+      if (size := _decompressed_size(chunk)) is None:
+        compression_type, _ = _SHUFFLE_COMPRESSION_TYPES.get(
+            chunk.compression_type, (chunk.compression_type, False)
+        )
+        size = len(_decompress_bytes(chunk.data, compression_type))
+      items_per_chunk = (
+          size // _TENSOR_DTYPE_TO_NUMPY_DTYPE[proto.data_type].itemsize
+      )
+    index = cls(num_items=num_items, items_per_chunk=max(items_per_chunk, 1))
+    if num_items and index.chunk_count != proto.chunk_count:
+      raise ValueError(
+          f'{items_per_chunk=} is inconsistent with {proto.chunk_count=}.'
+      )
+    return index
+
+  @property
+  def chunk_count(self) -> int:
+    return -(-self.num_items // self.items_per_chunk)
+
+  def chunk_range(self, start: int, stop: int) -> range:
+    """Returns the ids of the chunks covering elements [start, stop)."""
+    if start >= stop:
+      return range(0)
+    return range(
+        start // self.items_per_chunk,
+        (stop - 1) // self.items_per_chunk + 1,
+    )
+
+  def item_range(self, chunk_id: int) -> tuple[int, int]:
+    """Returns the [start, stop) elements held by a chunk."""
+    start = chunk_id * self.items_per_chunk
+    return start, min(start + self.items_per_chunk, self.num_items)
+
+
+def _leading_rows(index_expr: Any, num_rows: int) -> tuple[int, int, tuple]:
+  """Returns the rows of the first axis an index touches.
+
+  Args:
+    index_expr: NumPy index expression.
+    num_rows: Size of the first axis.
+
+  Returns:
+    Tuple of the [start, stop) rows touched and the equivalent index into the
+    array of those rows.
+  """
+  index = index_expr if isinstance(index_expr, tuple) else (index_expr,)
+  if not index or index[0] is Ellipsis or index[0] is None:
+    return 0, num_rows, index
+  first, rest = index[0], index[1:]
+
+  if isinstance(first, slice):
+    rows = range(num_rows)[first]
+    if not rows:
+      return 0, 0, (slice(0, 0), *rest)
+    start, stop = min(rows[0], rows[-1]), max(rows[0], rows[-1]) + 1
+    relative_stop = rows.stop - start
+    return (
+        start,
+        stop,
+        (
+            slice(
+                rows.start - start,
+                relative_stop if relative_stop >= 0 else None,
+                rows.step,
+            ),
+            *rest,
+        ),
+    )
+
+  if isinstance(first, (int, np.integer)):
+    row = operator.index(first)
+    if not -num_rows <= row < num_rows:
+      raise IndexError(f'Index {row} is out of bounds for size {num_rows}.')
+    row %= num_rows
+    return row, row + 1, (0, *rest)
+
+  rows = np.asarray(first)
+  if rows.dtype == bool:
+    rows = np.flatnonzero(rows)
+  if not rows.size:
+    return 0, 0, (rows, *rest)
+  rows = np.where(rows < 0, rows + num_rows, rows)
+  start, stop = int(rows.min()), int(rows.max()) + 1
+  if start < 0 or stop > num_rows:
+    raise IndexError(f'Index is out of bounds for size {num_rows}.')
+  return start, stop, (rows - start, *rest)
+
+
+def unpack_slice(
+    proto: tensor_pb2.Tensor,
+    chunks: Sequence[tensor_pb2.TensorChunk],
+    index_expr: Any,
+    *,
+    dequantize: bool = True,
+) -> np.ndarray:
+  """Unpacks part of a chunked tensor, decompressing only the chunks needed.
+
+  Chunks are row-major, so the chunks read are those covering the rows of the
+  first axis selected by `index_expr`. Tensors with a symmetric layout are
+  unpacked in full before indexing. For example, for a [positions, tracks]
+  tensor, `np.s_[1000:2000, [3, 7]]` reads only the chunks holding positions
+  1000 to 1999. Since only the chunks covering the slice are accessed, `chunks`
+  may be a lazy sequence, for example one reading chunks from disk on demand.
+
+  Args:
+    proto: Tensor proto to unpack.
+    chunks: The tensor's TensorChunk protos.
+    index_expr: NumPy index expression, such as one built with `np.s_`. The
+      first axis may be indexed by an integer, slice, integer array or boolean
+      mask; other axes by anything NumPy supports.
+    dequantize: Whether to dequantize quantized tensors to their original data
+      type.
+
+  Returns:
+    The unpacked tensor indexed by `index_expr`.
+  """
+  shape = tuple(proto.shape)
+  if (
+      proto.WhichOneof('payload') != 'chunk_count'
+      or not shape
+      or proto.layout != tensor_pb2.TensorLayout.TENSOR_LAYOUT_DENSE
+  ):
+    return unpack_proto(proto, chunks, dequantize=dequantize)[index_expr]
+
+  dtype = _TENSOR_DTYPE_TO_NUMPY_DTYPE[proto.data_type]
+  row_items = int(np.prod(shape[1:], dtype=np.int64))
+  start_row, stop_row, index_expr = _leading_rows(index_expr, shape[0])
+  start, stop = start_row * row_items, stop_row * row_items
+
+  chunk_index = ChunkIndex.from_proto(proto, chunks)
+  chunk_ids = chunk_index.chunk_range(start, stop)
+  offset = chunk_index.item_range(chunk_ids[0])[0] if chunk_ids else start
+  end = chunk_index.item_range(chunk_ids[-1])[1] if chunk_ids else start
+  buffer = np.empty(end - offset, dtype=dtype)
+  buffer_bytes = buffer.view(np.uint8)
+  written = 0
+  for chunk_id in chunk_ids:
+    chunk = chunks[chunk_id]
+    written += _decompress_into(
+        chunk.data,
+        chunk.compression_type,
+        buffer_bytes[written:],
+        itemsize=dtype.itemsize,
+        stride=_row_stride(shape),
+    )
+  if written != buffer_bytes.size:
+    raise ValueError(
+        f'Expected {buffer_bytes.size} bytes of tensor data, got {written}.'
+    )
+
+  rows = buffer[start - offset : stop - offset].reshape(
+      (stop_row - start_row, *shape[1:])
+  )
+  if dequantize and proto.HasField('quantization'):
+    quantization = proto.quantization
+    if quantization.scale and quantization.axis == 0:
+      quantization = tensor_pb2.Quantization(
+          original_data_type=quantization.original_data_type,
+          scale=quantization.scale[start_row:stop_row],
+          zero_point=quantization.zero_point[start_row:stop_row],
+      )
+    rows = dequantize_array(rows, quantization)
+  return rows[index_expr]
+
+
+def create_memmap(
+    proto: tensor_pb2.Tensor,
+    path: str | os.PathLike[str],
+    *,
+    dequantize: bool = False,
+    restore_layout: bool = False,
+) -> np.memmap:
+  """Creates a `.npy` file backed array to unpack a tensor into.
+
+  Args:
+    proto: Tensor header.
+    path: Path of the `.npy` file to create, overwriting any existing file.
+    dequantize: Whether to use the original data type of a quantized tensor
+      rather than the transported one.
+    restore_layout: Whether to use the full shape of a tensor with a symmetric
+      layout rather than the stored one.
+
+  Returns:
+    Writeable memory-mapped array with the shape and dtype of the tensor. The
+    file can be loaded with `np.load(path, mmap_mode='r')`; bfloat16 data is
+    stored as 2-byte void and needs `.view(ml_dtypes.bfloat16)`.
+  """
+  data_type = proto.data_type
+  if dequantize and proto.HasField('quantization'):
+    data_type = proto.quantization.original_data_type
+  shape = tuple(proto.shape)
+  if restore_layout and (
+      proto.layout
+      == tensor_pb2.TensorLayout.TENSOR_LAYOUT_SYMMETRIC_UPPER_TRIANGLE
+  ):
+    n = _triangle_size(shape[0])
+    shape = (n, n, *shape[1:])
+  return np.lib.format.open_memmap(
+      os.fspath(path),
+      mode='w+',
+      dtype=_TENSOR_DTYPE_TO_NUMPY_DTYPE[data_type],
+      shape=shape,
+  )
+
+
+def unpack_to_file(
+    proto: tensor_pb2.Tensor,
+    chunks: Sequence[tensor_pb2.TensorChunk],
+    path: str | os.PathLike[str],
+    *,
+    parallel: bool | futures.Executor = False,
+    dequantize: bool = True,
+) -> np.memmap:
+  """Unpacks a tensor into a memory-mapped `.npy` file.
+
+  Tensors larger than available memory are decompressed straight to the page
+  cache, which the kernel writes back and evicts as needed. Quantized tensors
+  are dequantized in blocks of rows, so resident memory stays bounded by the
+  block size. Tensors with a symmetric layout hold their stored upper
+  triangle in memory while the full matrices are written.
+
+  Args:
+    proto: Tensor proto to unpack.
+    chunks: The tensor's TensorChunk protos.
+    path: Path of the `.npy` file to create, overwriting any existing file.
+    parallel: Whether to decompress chunks in parallel. See `unpack_proto`.
+    dequantize: Whether to dequantize quantized tensors to their original data
+      type.
+
+  Returns:
+    The unpacked tensor as a writeable `np.memmap` of the file.
+  """
+  out = create_memmap(proto, path, dequantize=dequantize, restore_layout=True)
+  if proto.layout != tensor_pb2.TensorLayout.TENSOR_LAYOUT_DENSE:
+    unpack_proto(
+        proto, chunks, out=out, parallel=parallel, dequantize=dequantize
+    )
+  elif not (dequantize and proto.HasField('quantization')):
+    unpack_proto(proto, chunks, out=out, parallel=parallel, dequantize=False)
+  elif proto.WhichOneof('payload') != 'chunk_count' or not out.ndim:
+    unpack_proto(proto, chunks, out=out)
+  else:
+    # Blocks span several chunks so that few chunks are decoded twice.
+    itemsize = _TENSOR_DTYPE_TO_NUMPY_DTYPE[proto.data_type].itemsize
+    block_bytes = max(_FILE_BLOCK_BYTES, 4 * proto.items_per_chunk * itemsize)
+    row_bytes = max(out[:1].nbytes, 1)
+    block_rows = max(block_bytes // row_bytes, 1)
+    for start in range(0, out.shape[0], block_rows):
+      rows = np.s_[start : start + block_rows]
+      out[rows] = unpack_slice(proto, chunks, rows)
+  out.flush()
+  return out
+
+
+class TensorAssembler:
+  """Unpacks a chunked Tensor incrementally as its chunks arrive.
+
+  Each chunk is decompressed into a preallocated output as soon as it is added,
+  overlapping decompression with receiving the remaining chunks, for example
+  from a gRPC response stream:
+
+    assembler = tensor_utils.TensorAssembler(output.track_data.values)
+    for response in responses:
+      assembler.add_chunk(response.tensor_chunk)
+      if assembler.done:
+        break
+    values = assembler.result()
+  """
+
+  def __init__(
+      self,
+      proto: tensor_pb2.Tensor,
+      *,
+      out: np.ndarray | None = None,
+      path: str | os.PathLike[str] | None = None,
+  ):
+    """Initializes the assembler.
+
+    Args:
+      proto: Tensor header to assemble. If the data is stored inline in the
+        header, it is unpacked immediately.
+      out: Optional C-contiguous, writeable array with the shape and dtype of
+        the tensor to unpack into, in the transported (possibly quantized)
+        data type. If not provided, a new array is allocated.
+      path: Optional path of a `.npy` file to unpack into instead of memory,
+        for tensors larger than available memory. See `create_memmap`.
+        Mutually exclusive with `out`.
+    """
+    if path is not None:
+      if out is not None:
+        raise ValueError('Only one of out and path can be provided.')
+      out = create_memmap(proto, path)
+    self._out = _output_array(proto, out)
+    # Keep only the header; inline data is unpacked below.
+    self._proto = tensor_pb2.Tensor(
+        shape=proto.shape,
+        data_type=proto.data_type,
+        layout=proto.layout,
+        quantization=(
+            proto.quantization if proto.HasField('quantization') else None
+        ),
+    )
+    self._buffer = self._out.reshape(-1).view(np.uint8)
+    self._itemsize = self._out.itemsize
+    self._stride = _row_stride(self._out.shape)
+    self._bytes_written = 0
+    self._chunks_received = 0
+    match proto.WhichOneof('payload'):
+      case 'array':
+        self._chunk_count = 0
+        self._bytes_written = _decompress_into(
+            proto.array.data,
+            proto.array.compression_type,
+            self._buffer,
+            itemsize=self._itemsize,
+            stride=self._stride,
+        )
+      case 'chunk_count':
+        self._chunk_count = proto.chunk_count
+      case _:
+        raise ValueError(
+            f'Unsupported payload type: {proto.WhichOneof("payload")}'
+        )
+
+  @property
+  def chunk_count(self) -> int:
+    """Number of chunks expected (0 if the data is stored in the header)."""
+    return self._chunk_count
+
+  @property
+  def chunks_received(self) -> int:
+    return self._chunks_received
+
+  @property
+  def bytes_written(self) -> int:
+    """Number of decompressed bytes written to the output so far."""
+    return self._bytes_written
+
+  @property
+  def nbytes(self) -> int:
+    """Total number of decompressed bytes of the tensor."""
+    return self._buffer.size
+
+  @property
+  def progress(self) -> float:
+    """Fraction of the tensor data received, between 0 and 1."""
+    return self._bytes_written / self.nbytes if self.nbytes else 1.0
+
+  @property
+  def done(self) -> bool:
+    return (
+        self._chunks_received >= self._chunk_count
+        and self._bytes_written == self.nbytes
+    )
+
+  def add_chunk(self, chunk: tensor_pb2.TensorChunk) -> int:
+    """Decompresses the next chunk into the output.
+
+    Args:
+      chunk: The next TensorChunk, in the order they were packed.
+
+    Returns:
+      The number of bytes written for this chunk.
+
+    Raises:
+      ValueError: If all expected chunks were already received, or the chunk
+        data exceeds the size of the tensor.
+    """
+    if self._chunks_received >= self._chunk_count:
+      raise ValueError(f'Expected only {self._chunk_count} chunks.')
+    written = _decompress_into(
+        chunk.data,
+        chunk.compression_type,
+        self._buffer[self._bytes_written :],
+        itemsize=self._itemsize,
+        stride=self._stride,
+    )
+    self._bytes_written += written
+    self._chunks_received += 1
+    return written
+
+  def completed_rows(self) -> np.ndarray:
+    """Returns a view of the leading rows that are fully received.
+
+    Rows are indexed along the first axis, so a [positions, tracks] tensor
+    can be processed as a growing prefix of positions while the rest arrives.
+    The view shares memory with the final result.
+
+    Raises:
+      ValueError: If the tensor is a scalar.
+    """
+    if not self._out.ndim:
+      raise ValueError('Scalar tensors have no rows.')
+    row_bytes = self.nbytes // self._out.shape[0] if self._out.shape[0] else 0
+    if not row_bytes:
+      return self._out
+    return self._out[: self._bytes_written // row_bytes]
+
+  def result(
+      self, *, dequantize: bool = True, symmetric_view: bool = False
+  ) -> np.ndarray | SymmetricMatrixView:
+    """Returns the unpacked tensor.
+
+    Args:
+      dequantize: Whether to dequantize a quantized tensor to its original data
+        type, in memory. If False, or the tensor is not quantized, the output
+        buffer (or file backed array) is returned.
+      symmetric_view: For tensors with a symmetric layout, whether to return a
+        lazy `SymmetricMatrixView` instead of rebuilding the full matrices in
+        memory.
+
+    Raises:
+      ValueError: If the tensor data is incomplete.
+    """
+    if self._bytes_written != self.nbytes:
+      raise ValueError(
+          f'Expected {self.nbytes} bytes of tensor data, got'
+          f' {self._bytes_written}.'
+      )
+    if isinstance(self._out, np.memmap):
+      self._out.flush()
+    return _restore_value(
+        self._proto,
+        self._out,
+        out=None,
+        dequantize=dequantize,
+        symmetric_view=symmetric_view,
+    )
 
 
 def upcast_floating(x: np.ndarray) -> np.ndarray:
@@ -158,3 +1446,36 @@ def upcast_floating(x: np.ndarray) -> np.ndarray:
     return x.astype(np.float32)
   else:
     return x
+
+
+def as_dlpack(value: np.ndarray, *, bfloat16_as_uint16: bool = False) -> Any:
+  """Returns an object exporting an unpacked tensor through DLPack.
+
+  Pass the result to e.g. `torch.from_dlpack` or `jax.dlpack.from_dlpack` to
+  share memory with `value` instead of copying it.
+
+  NumPy cannot export `ml_dtypes.bfloat16` through DLPack. With
+  `bfloat16_as_uint16`, bfloat16 tensors are exported as a uint16 view of the
+  same memory instead, which the consumer reinterprets without copying:
+
+    tensor = torch.from_dlpack(as_dlpack(x, bfloat16_as_uint16=True))
+    tensor = tensor.view(torch.bfloat16)
+
+  Args:
+    value: Array to export.
+    bfloat16_as_uint16: Whether to export bfloat16 tensors as uint16.
+
+  Returns:
+    Object implementing `__dlpack__` and `__dlpack_device__`.
+
+  Raises:
+    TypeError: If `value` is bfloat16 and `bfloat16_as_uint16` is False.
+  """
+  if value.dtype == ml_dtypes.bfloat16:
+    if not bfloat16_as_uint16:
+      raise TypeError(
+          'bfloat16 cannot be exported through DLPack; pass'
+          ' bfloat16_as_uint16=True and view the result as bfloat16.'
+      )
+    return value.view(np.uint16)
+  return value
@@ -0,0 +1,201 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Benchmarks tensor compression ratio and throughput.
+
+Compares compression types and zstd levels on synthetic track tensors.
+
+Usage:
+
+  python -m src.alphagenome.tensor_utils_benchmark --levels=-5,1,3,9,19 \
+    --compression_types=ZSTD,ZSTD_SHUFFLE,ZSTD_XOR_SHUFFLE
+"""
+
+from collections.abc import Iterator, Mapping, Sequence
+import dataclasses
+import itertools
+import time
+
+from absl import app
+from absl import flags
+import ml_dtypes
+import numpy as np
+
+from . import tensor_utils
+from .protos import tensor_pb2
+
+
+_COMPRESSION_TYPES = flags.DEFINE_list(
+    'compression_types',
+    ['ZSTD', 'ZSTD_SHUFFLE', 'ZSTD_XOR_SHUFFLE'],
+    'Compression types to benchmark, without the COMPRESSION_TYPE_ prefix.',
+)
+_LEVELS = flags.DEFINE_list(
+    'levels', ['-5', '1', '3', '6', '9', '19'], 'zstd levels to benchmark.'
+)
+_THREADS = flags.DEFINE_integer('threads', 0, 'zstd worker threads.')
+_LENGTH = flags.DEFINE_integer(
+    'length', 2**17, 'Number of positions of the synthetic track tensors.'
+)
+_NUM_TRACKS = flags.DEFINE_integer(
+    'num_tracks', 64, 'Number of tracks of the synthetic track tensors.'
+)
+_BYTES_PER_CHUNK = flags.DEFINE_integer(
+    'bytes_per_chunk', 2**22, 'Chunk size passed to pack_tensor.'
+)
+_REPEATS = flags.DEFINE_integer(
+    'repeats', 3, 'Repetitions per measurement; the fastest is reported.'
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchmarkResult:
+  name: str
+  compression_type: str
+  level: int
+  ratio: float
+  compress_mb_per_s: float
+  decompress_mb_per_s: float
+
+
+def track_tensors(
+    length: int, num_tracks: int, seed: int = 0
+) -> Mapping[str, np.ndarray]:
+  """Returns synthetic tensors resembling genomic signal tracks.
+
+  Args:
+    length: Number of positions.
+    num_tracks: Number of tracks.
+    seed: Random seed.
+
+  Returns:
+    Mapping of names to [length, num_tracks] arrays: smooth coverage-like
+    signal in float32 and bfloat16, and a sparse peak-like signal.
+  """
+  rng = np.random.default_rng(seed)
+  kernel = np.hanning(129)
+  kernel /= kernel.sum()
+  noise = rng.gamma(0.3, 1.0, size=(length + kernel.size - 1, num_tracks))
+  smooth = np.stack(
+      [
+          np.convolve(noise[:, i], kernel, mode='valid')
+          for i in range(num_tracks)
+      ],
+      axis=1,
+  ).astype(np.float32)
+  sparse = np.where(smooth > np.quantile(smooth, 0.95), smooth, 0).astype(
+      np.float32
+  )
+  return {
+      'smooth_float32': smooth,
+      'smooth_bfloat16': smooth.astype(ml_dtypes.bfloat16),
+      'sparse_float32': sparse,
+  }
+
+
+def _fastest(fn, repeats: int) -> float:
+  best = float('inf')
+  for _ in range(repeats):
+    start = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - start)
+  return best
+
+
+def benchmark_compression(
+    tensors: Mapping[str, np.ndarray],
+    levels: Sequence[int],
+    *,
+    compression_types: Sequence[tensor_pb2.CompressionType] = (
+        tensor_pb2.CompressionType.COMPRESSION_TYPE_ZSTD,
+    ),
+    threads: int = 0,
+    bytes_per_chunk: int = 2**22,
+    repeats: int = 3,
+) -> Iterator[BenchmarkResult]:
+  """Measures compression ratio and throughput of `pack_tensor`.
+
+  Args:
+    tensors: Named tensors to compress.
+    levels: zstd compression levels to measure.
+    compression_types: Compression types to measure.
+    threads: zstd worker threads.
+    bytes_per_chunk: Chunk size passed to `pack_tensor`.
+    repeats: Number of repetitions; the fastest is reported.
+
+  Yields:
+    One result per tensor, compression type and level. Throughput is in MB/s
+    of uncompressed data.
+  """
+  for name, value in tensors.items():
+    megabytes = value.nbytes / 1e6
+    for compression_type, level in itertools.product(compression_types, levels):
+      options = tensor_utils.CompressionOptions(level=level, threads=threads)
+
+      def _pack(
+          value=value, compression_type=compression_type, options=options
+      ):
+        return tensor_utils.pack_tensor(
+            value,
+            bytes_per_chunk=bytes_per_chunk,
+            compression_type=compression_type,
+            compression_options=options,
+        )
+
+      proto, chunks = _pack()
+
+      def _unpack(proto=proto, chunks=chunks, out=np.empty_like(value)):
+        return tensor_utils.unpack_proto(proto, chunks, out=out)
+
+      compressed = sum(len(chunk.data) for chunk in chunks)
+      yield BenchmarkResult(
+          name=name,
+          compression_type=tensor_pb2.CompressionType.Name(
+              compression_type
+          ).removeprefix('COMPRESSION_TYPE_'),
+          level=level,
+          ratio=value.nbytes / compressed,
+          compress_mb_per_s=megabytes / _fastest(_pack, repeats),
+          decompress_mb_per_s=megabytes / _fastest(_unpack, repeats),
+      )
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  tensors = track_tensors(_LENGTH.value, _NUM_TRACKS.value)
+  print(
+      f'{"tensor":<18} {"compression":<18} {"level":>5} {"ratio":>7}'
+      f' {"comp MB/s":>10} {"decomp MB/s":>12}'
+  )
+  for result in benchmark_compression(
+      tensors,
+      [int(level) for level in _LEVELS.value],
+      compression_types=[
+          tensor_pb2.CompressionType.Value(f'COMPRESSION_TYPE_{name}')
+          for name in _COMPRESSION_TYPES.value
+      ],
+      threads=_THREADS.value,
+      bytes_per_chunk=_BYTES_PER_CHUNK.value,
+      repeats=_REPEATS.value,
+  ):
+    print(
+        f'{result.name:<18} {result.compression_type:<18} {result.level:>5}'
+        f' {result.ratio:>7.2f} {result.compress_mb_per_s:>10.1f}'
+        f' {result.decompress_mb_per_s:>12.1f}'
+    )
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -0,0 +1,490 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+from concurrent import futures
+import os
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import ml_dtypes
+import numpy as np
+
+from . import tensor_utils
+from .protos import tensor_pb2
+
+_CompressionType = tensor_pb2.CompressionType
+_QuantizationType = tensor_pb2.QuantizationType
+
+
+class UnpackProtoTest(parameterized.TestCase):
+
+  @parameterized.parameters(0, 7, 64)
+  def test_unpacks_into_out(self, bytes_per_chunk):
+    value = np.arange(60, dtype=np.float32).reshape(3, 4, 5)
+    proto, chunks = tensor_utils.pack_tensor(
+        value,
+        bytes_per_chunk=bytes_per_chunk,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+    )
+    out = np.zeros_like(value)
+    self.assertIs(tensor_utils.unpack_proto(proto, chunks, out=out), out)
+    np.testing.assert_array_equal(out, value)
+
+  def test_mismatched_out_raises(self):
+    proto, _ = tensor_utils.pack_tensor(np.zeros((2, 3), np.float32))
+    for out in (
+        np.zeros((3, 2), np.float32),
+        np.zeros((2, 3), np.float64),
+        np.zeros((3, 2), np.float32).T,
+    ):
+      with self.assertRaises(ValueError):
+        tensor_utils.unpack_proto(proto, out=out)
+
+  def test_missing_chunk_raises(self):
+    proto, chunks = tensor_utils.pack_tensor(
+        np.zeros(100, np.float32), bytes_per_chunk=80
+    )
+    with self.assertRaises(ValueError):
+      tensor_utils.unpack_proto(proto, chunks[:-1])
+
+
+class _CountingExecutor(futures.ThreadPoolExecutor):
+
+  def __init__(self):
+    super().__init__(max_workers=4)
+    self.submitted = 0
+
+  def submit(self, *args, **kwargs):
+    self.submitted += 1
+    return super().submit(*args, **kwargs)
+
+
+class ParallelTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.executor = _CountingExecutor()
+    self.addCleanup(self.executor.shutdown)
+
+  def test_round_trip(self):
+    # 8 MiB, above the size compressed in parallel.
+    value = np.arange(2**21, dtype=np.float32).reshape(-1, 8)
+    proto, chunks = tensor_utils.pack_tensor(
+        value,
+        bytes_per_chunk=2**20,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+        parallel=self.executor,
+    )
+    self.assertLen(chunks, 8)
+    self.assertEqual(self.executor.submitted, 8)
+    restored = tensor_utils.unpack_proto(proto, chunks, parallel=self.executor)
+    self.assertEqual(self.executor.submitted, 16)
+    np.testing.assert_array_equal(restored, value)
+    np.testing.assert_array_equal(
+        tensor_utils.unpack_proto(proto, chunks, parallel=True), value
+    )
+
+  def test_small_tensors_are_serial(self):
+    value = np.arange(100, dtype=np.float32)
+    proto, chunks = tensor_utils.pack_tensor(
+        value,
+        bytes_per_chunk=40,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+        parallel=self.executor,
+    )
+    restored = tensor_utils.unpack_proto(proto, chunks, parallel=self.executor)
+    np.testing.assert_array_equal(restored, value)
+    self.assertEqual(self.executor.submitted, 0)
+
+
+class CompressionOptionsTest(parameterized.TestCase):
+
+  @parameterized.parameters(
+      dict(level=-5),
+      dict(level=19, write_checksum=True),
+      dict(threads=2),
+      dict(write_content_size=False),
+  )
+  def test_round_trip(self, **options):
+    value = np.tile(np.arange(1000, dtype=np.float32), 8)
+    proto, chunks = tensor_utils.pack_tensor(
+        value,
+        bytes_per_chunk=4096,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+        compression_options=tensor_utils.CompressionOptions(**options),
+    )
+    np.testing.assert_array_equal(
+        tensor_utils.unpack_proto(proto, chunks), value
+    )
+
+  def test_contexts_are_cached_per_thread_and_options(self):
+    options = tensor_utils.CompressionOptions(level=1)
+    compressor = tensor_utils._zstd_compressor(options)
+    self.assertIs(
+        tensor_utils._zstd_compressor(tensor_utils.CompressionOptions(level=1)),
+        compressor,
+    )
+    self.assertIsNot(
+        tensor_utils._zstd_compressor(tensor_utils.CompressionOptions(level=2)),
+        compressor,
+    )
+    self.assertIs(
+        tensor_utils._zstd_decompressor(), tensor_utils._zstd_decompressor()
+    )
+    with futures.ThreadPoolExecutor(1) as executor:
+      self.assertIsNot(
+          executor.submit(tensor_utils._zstd_compressor, options).result(),
+          compressor,
+      )
+
+
+class PackTensorStreamTest(parameterized.TestCase):
+
+  @parameterized.parameters(4, 100, 4096)
+  def test_matches_pack_tensor(self, bytes_per_chunk):
+    value = np.arange(300, dtype=np.int32).reshape(30, 10)
+    proto, stream = tensor_utils.pack_tensor_stream(
+        value,
+        bytes_per_chunk=bytes_per_chunk,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+    )
+    expected_proto, expected_chunks = tensor_utils.pack_tensor(
+        value,
+        bytes_per_chunk=bytes_per_chunk,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+    )
+    self.assertEqual(proto, expected_proto)
+    chunks = list(stream)
+    self.assertEqual(chunks, list(expected_chunks))
+    np.testing.assert_array_equal(
+        tensor_utils.unpack_proto(proto, chunks), value
+    )
+
+  def test_chunks_are_compressed_lazily(self):
+    value = np.zeros(1000, np.float32)
+    proto, stream = tensor_utils.pack_tensor_stream(value, bytes_per_chunk=400)
+    self.assertEqual(proto.chunk_count, 10)
+    first = next(stream)
+    # Chunks not yet produced read the array when they are compressed.
+    value[100:] = 1
+    restored = tensor_utils.unpack_proto(proto, [first, *stream])
+    np.testing.assert_array_equal(restored[:100], 0)
+    np.testing.assert_array_equal(restored[100:], 1)
+
+  def test_chunk_smaller_than_item_raises(self):
+    with self.assertRaises(ValueError):
+      tensor_utils.pack_tensor_stream(
+          np.zeros(4, np.float64), bytes_per_chunk=4
+      )
+
+
+class TensorAssemblerTest(absltest.TestCase):
+
+  def test_assembles_incrementally(self):
+    value = np.arange(200, dtype=np.float32).reshape(20, 10)
+    # 3 rows per chunk.
+    proto, chunks = tensor_utils.pack_tensor(
+        value,
+        bytes_per_chunk=120,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+    )
+    assembler = tensor_utils.TensorAssembler(proto)
+    self.assertEqual(assembler.chunk_count, len(chunks))
+    for i, chunk in enumerate(chunks):
+      self.assertFalse(assembler.done)
+      assembler.add_chunk(chunk)
+      rows = assembler.completed_rows()
+      self.assertLen(rows, min(3 * (i + 1), 20))
+      np.testing.assert_array_equal(rows, value[: len(rows)])
+    self.assertTrue(assembler.done)
+    self.assertEqual(assembler.progress, 1.0)
+    np.testing.assert_array_equal(assembler.result(), value)
+    with self.assertRaises(ValueError):
+      assembler.add_chunk(chunks[0])
+
+  def test_inline_tensor_is_done(self):
+    value = np.arange(6, dtype=np.int64)
+    proto, _ = tensor_utils.pack_tensor(value)
+    assembler = tensor_utils.TensorAssembler(proto)
+    self.assertTrue(assembler.done)
+    np.testing.assert_array_equal(assembler.result(), value)
+
+  def test_incomplete_result_raises(self):
+    proto, chunks = tensor_utils.pack_tensor(
+        np.zeros(10, np.float32), bytes_per_chunk=20
+    )
+    assembler = tensor_utils.TensorAssembler(proto)
+    assembler.add_chunk(chunks[0])
+    self.assertAlmostEqual(assembler.progress, 0.5)
+    with self.assertRaises(ValueError):
+      assembler.result()
+
+
+class CompressionTest(parameterized.TestCase):
+
+  @parameterized.product(
+      compression_type=[
+          _CompressionType.COMPRESSION_TYPE_ZSTD_SHUFFLE,
+          _CompressionType.COMPRESSION_TYPE_ZSTD_XOR_SHUFFLE,
+          _CompressionType.COMPRESSION_TYPE_LZ4_SHUFFLE,
+          _CompressionType.COMPRESSION_TYPE_LZ4_XOR_SHUFFLE,
+      ],
+      dtype=[np.float32, ml_dtypes.bfloat16, np.int64, np.bool_],
+      bytes_per_chunk=[0, 100],
+  )
+  def test_shuffle_round_trip(self, compression_type, dtype, bytes_per_chunk):
+    rng = np.random.default_rng(0)
+    value = rng.normal(size=(37, 5)).cumsum(axis=0).astype(dtype)
+    proto, chunks = tensor_utils.pack_tensor(
+        value,
+        bytes_per_chunk=bytes_per_chunk,
+        compression_type=compression_type,
+    )
+    restored = tensor_utils.unpack_proto(proto, chunks)
+    self.assertEqual(restored.dtype, value.dtype)
+    np.testing.assert_array_equal(restored, value)
+
+
+class QuantizationTest(parameterized.TestCase):
+
+  @parameterized.parameters(
+      (_QuantizationType.QUANTIZATION_TYPE_INT8, 1 / 255),
+      (_QuantizationType.QUANTIZATION_TYPE_UINT8, 1 / 255),
+      (_QuantizationType.QUANTIZATION_TYPE_FLOAT16, 1e-3),
+      (_QuantizationType.QUANTIZATION_TYPE_BFLOAT16, 1e-2),
+  )
+  def test_round_trip(self, quantization_type, tolerance):
+    rng = np.random.default_rng(0)
+    # Tracks with very different ranges, including a constant one.
+    value = rng.uniform(size=(64, 3)).astype(np.float32)
+    value *= np.array([1, 100, 0], dtype=np.float32)
+    proto, _ = tensor_utils.pack_tensor(
+        value, quantization_type=quantization_type
+    )
+    restored = tensor_utils.unpack_proto(proto)
+    self.assertEqual(restored.dtype, value.dtype)
+    # Each track is accurate to its own range (or magnitude for floats).
+    error = np.abs(restored - value)
+    bound = tolerance * np.maximum(np.ptp(value, 0), np.abs(value)) + 1e-6
+    np.testing.assert_array_less(error, bound)
+
+  def test_float_quantization_keeps_non_finite_values(self):
+    value = np.array([[np.nan, np.inf], [-np.inf, 1.0]], dtype=np.float32)
+    quantized, quantization = tensor_utils.quantize_array(
+        value, _QuantizationType.QUANTIZATION_TYPE_FLOAT16
+    )
+    np.testing.assert_array_equal(
+        tensor_utils.dequantize_array(quantized, quantization), value
+    )
+
+  @parameterized.parameters(np.nan, np.inf, -np.inf)
+  def test_integer_quantization_rejects_non_finite_values(self, bad):
+    value = np.ones((4, 2), dtype=np.float32)
+    value[1, 0] = bad
+    with self.assertRaisesRegex(ValueError, 'finite'):
+      tensor_utils.quantize_array(
+          value, _QuantizationType.QUANTIZATION_TYPE_INT8
+      )
+
+
+class _RecordingChunks(collections.abc.Sequence):
+  """Chunks that record which ones are read."""
+
+  def __init__(self, chunks):
+    self._chunks = chunks
+    self.read = []
+
+  def __len__(self):
+    return len(self._chunks)
+
+  def __getitem__(self, index):
+    self.read.append(index)
+    return self._chunks[index]
+
+
+class UnpackSliceTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.value = np.arange(400, dtype=np.float32).reshape(40, 10)
+    # 3 rows per chunk.
+    self.proto, self.chunks = tensor_utils.pack_tensor(
+        self.value,
+        bytes_per_chunk=120,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+    )
+
+  @parameterized.parameters(
+      (np.s_[:],),
+      (np.s_[5],),
+      (np.s_[-1],),
+      (np.s_[3:17],),
+      (np.s_[17:3:-2],),
+      (np.s_[::4, 2],),
+      (np.s_[[9, 2, 9]],),
+      (np.s_[..., 1],),
+      (np.s_[35:50],),
+      (np.s_[np.arange(40) % 7 == 3],),
+  )
+  def test_matches_full_unpack(self, index_expr):
+    np.testing.assert_array_equal(
+        tensor_utils.unpack_slice(self.proto, self.chunks, index_expr),
+        self.value[index_expr],
+    )
+
+  def test_reads_only_needed_chunks(self):
+    chunks = _RecordingChunks(self.chunks)
+    np.testing.assert_array_equal(
+        tensor_utils.unpack_slice(self.proto, chunks, np.s_[10:13]),
+        self.value[10:13],
+    )
+    self.assertEqual(chunks.read, [3, 4])
+
+  def test_quantized(self):
+    proto, chunks = tensor_utils.pack_tensor(
+        self.value,
+        bytes_per_chunk=40,
+        quantization_type=tensor_pb2.QuantizationType.QUANTIZATION_TYPE_INT8,
+    )
+    np.testing.assert_array_equal(
+        tensor_utils.unpack_slice(proto, chunks, np.s_[5:9, 3]),
+        tensor_utils.unpack_proto(proto, chunks)[5:9, 3],
+    )
+
+  def test_chunk_index(self):
+    # 15 items per chunk.
+    proto, chunks = tensor_utils.pack_tensor(
+        np.zeros(100, np.int32), bytes_per_chunk=60
+    )
+    index = tensor_utils.ChunkIndex.from_proto(proto)
+    self.assertEqual(index.chunk_count, 7)
+    self.assertEqual(index.chunk_range(14, 16), range(0, 2))
+    self.assertEqual(index.chunk_range(5, 5), range(0))
+    self.assertEqual(index.item_range(6), (90, 100))
+    # Headers without items_per_chunk are indexed from the first chunk.
+    proto.ClearField('items_per_chunk')
+    self.assertEqual(tensor_utils.ChunkIndex.from_proto(proto, chunks), index)
+
+
+class MemmapTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.directory = self.enter_context(tempfile.TemporaryDirectory())
+    self.path = os.path.join(self.directory, 'value.npy')
+    self.value = np.arange(400, dtype=np.float32).reshape(40, 10)
+
+  def test_unpack_to_file(self):
+    proto, chunks = tensor_utils.pack_tensor(
+        self.value,
+        bytes_per_chunk=120,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+    )
+    out = tensor_utils.unpack_to_file(proto, chunks, self.path)
+    self.assertIsInstance(out, np.memmap)
+    np.testing.assert_array_equal(out, self.value)
+    np.testing.assert_array_equal(np.load(self.path), self.value)
+
+  def test_unpack_quantized_to_file_in_blocks(self):
+    proto, chunks = tensor_utils.pack_tensor(
+        self.value,
+        bytes_per_chunk=30,
+        quantization_type=tensor_pb2.QuantizationType.QUANTIZATION_TYPE_UINT8,
+    )
+    with mock.patch.object(tensor_utils, '_FILE_BLOCK_BYTES', 64):
+      out = tensor_utils.unpack_to_file(proto, chunks, self.path)
+    self.assertEqual(out.dtype, np.float32)
+    np.testing.assert_array_equal(out, tensor_utils.unpack_proto(proto, chunks))
+
+  def test_create_memmap(self):
+    proto, _ = tensor_utils.pack_tensor(
+        self.value,
+        quantization_type=tensor_pb2.QuantizationType.QUANTIZATION_TYPE_INT8,
+    )
+    stored = tensor_utils.create_memmap(proto, self.path)
+    self.assertEqual((stored.shape, stored.dtype), ((40, 10), np.int8))
+    restored = tensor_utils.create_memmap(proto, self.path, dequantize=True)
+    self.assertEqual((restored.shape, restored.dtype), ((40, 10), np.float32))
+
+  def test_pack_from_memmap(self):
+    np.save(self.path, self.value)
+    mapped = np.load(self.path, mmap_mode='r')
+    proto, chunks = tensor_utils.pack_tensor(
+        mapped,
+        bytes_per_chunk=256,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+    )
+    np.testing.assert_array_equal(
+        tensor_utils.unpack_proto(proto, chunks), self.value
+    )
+
+  def test_assembler_writes_to_file(self):
+    proto, chunks = tensor_utils.pack_tensor(self.value, bytes_per_chunk=400)
+    assembler = tensor_utils.TensorAssembler(proto, path=self.path)
+    for chunk in chunks:
+      assembler.add_chunk(chunk)
+    np.testing.assert_array_equal(assembler.result(), self.value)
+    np.testing.assert_array_equal(np.load(self.path), self.value)
+
+
+def _symmetric(n, *trailing):
+  rng = np.random.default_rng(0)
+  value = rng.normal(size=(n, n, *trailing)).astype(np.float32)
+  return value + np.swapaxes(value, 0, 1)
+
+
+class UpperTriangleTest(parameterized.TestCase):
+
+  @parameterized.parameters((1,), (5,), (6, 3), (4, 2, 2))
+  def test_round_trip(self, n, *trailing):
+    value = _symmetric(n, *trailing)
+    packed = tensor_utils.pack_upper_triangle(value)
+    self.assertEqual(packed.shape, (n * (n + 1) // 2, *trailing))
+    np.testing.assert_array_equal(
+        tensor_utils.unpack_upper_triangle(packed), value
+    )
+
+  def test_pack_tensor_layout(self):
+    value = _symmetric(16, 2)
+    proto, chunks = tensor_utils.pack_tensor(
+        value,
+        bytes_per_chunk=64,
+        compression_type=_CompressionType.COMPRESSION_TYPE_ZSTD,
+        layout=tensor_pb2.TensorLayout.TENSOR_LAYOUT_SYMMETRIC_UPPER_TRIANGLE,
+    )
+    self.assertLess(sum(len(c.data) for c in chunks), value.nbytes)
+    np.testing.assert_array_equal(
+        tensor_utils.unpack_proto(proto, chunks), value
+    )
+    view = tensor_utils.unpack_proto(proto, chunks, symmetric_view=True)
+    self.assertIsInstance(view, tensor_utils.SymmetricMatrixView)
+    self.assertEqual(view.shape, value.shape)
+    np.testing.assert_array_equal(view[3], value[3])
+    np.testing.assert_array_equal(view[2:9, 5, 1], value[2:9, 5, 1])
+    np.testing.assert_array_equal(view[[7, 1], 4:], value[[7, 1]][:, 4:])
+    np.testing.assert_array_equal(view[..., 0], value[..., 0])
+    np.testing.assert_array_equal(np.asarray(view), value)
+
+  def test_non_square_raises(self):
+    with self.assertRaises(ValueError):
+      tensor_utils.pack_upper_triangle(np.zeros((3, 4)))
+    with self.assertRaises(ValueError):
+      tensor_utils.unpack_upper_triangle(np.zeros(5))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,842 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Resilient HTTP calls to an upstream service.
+
+`UpstreamClient.post` wraps `requests.post` with:
+
+* Retries with exponential backoff and full jitter, per `RetryPolicy`. Requests
+  that are not idempotent are only retried if they never reached the upstream.
+* A retry budget shared by all calls (`RetryBudget`), so that retries and
+  hedges stop when the upstream is failing broadly instead of multiplying its
+  load.
+* Optional hedging: if a call has not completed after the `hedge_quantile` of
+  recent latencies of its RPC, a second request is sent and the first response
+  wins.
+* A circuit breaker that fails fast with `CircuitOpenError` after consecutive
+  failures, and lets a single probe through once `reset_timeout` has passed.
+
+With several upstream endpoints, a `LoadBalancer` picks the endpoint of each
+attempt: the one with the fewest outstanding requests, the least loaded one
+according to the load reports of the endpoints (see `load_reporting`), or by
+consistent hashing of a request key, so that repeated requests reach the
+endpoint that has their result cached. Each endpoint has its own circuit
+breaker, which ejects it after consecutive failures, and can be actively health
+checked.
+"""
+
+import bisect
+import collections
+from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
+from concurrent import futures
+import contextlib
+import dataclasses
+import hashlib
+import math
+import operator
+import random
+import threading
+import time
+from typing import Any
+import uuid
+
+import numpy as np
+import requests
+
+from . import load_reporting
+
+
+# Seconds left of the caller's deadline, sent with each request.
+TIMEOUT_HEADER = 'X-AlphaGenome-Timeout'
+# Identifies a call, so that the upstream can abort it when posted to the
+# cancel path.
+REQUEST_ID_HEADER = 'X-AlphaGenome-Request-Id'
+_CANCEL_POLL_INTERVAL = 0.05
+# Status of a request the upstream aborted because it was cancelled.
+_CLIENT_CLOSED_REQUEST = 499
+
+
+class CircuitOpenError(requests.RequestException):
+  """Raised instead of calling an upstream that is failing.
+
+  Subclasses `requests.RequestException`, so callers handling upstream errors
+  handle it too.
+  """
+
+
+class CallAborted(requests.RequestException):
+  """Base class of errors for calls given up on before they completed."""
+
+
+class DeadlineExceeded(CallAborted, requests.Timeout):
+  """Raised when a call's deadline passes before it could be sent."""
+
+
+class Cancelled(CallAborted):
+  """Raised when the caller cancels a call."""
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+  """How calls of an RPC are retried and hedged.
+
+  Attributes:
+    max_attempts: Maximum number of attempts, including the first.
+    initial_backoff: Upper bound of the delay before the first retry, seconds.
+    max_backoff: Upper bound of the delay before any retry, seconds.
+    backoff_multiplier: Growth of the upper bound per retry.
+    retryable_status_codes: HTTP status codes that are retried.
+    idempotent: Whether the request can safely be sent more than once. If not,
+      only attempts that failed to connect are retried, and it is not hedged.
+    hedge_quantile: If set, a hedged request is sent when the call is still
+      running after this quantile of the recent latencies of the RPC.
+  """
+
+  max_attempts: int = 3
+  initial_backoff: float = 0.1
+  max_backoff: float = 2.0
+  backoff_multiplier: float = 2.0
+  retryable_status_codes: frozenset[int] = frozenset({429, 502, 503, 504})
+  idempotent: bool = True
+  hedge_quantile: float | None = None
+
+  def backoff(self, retry: int, rng: random.Random) -> float:
+    """Returns the delay before the `retry`-th retry (from 0), with jitter."""
+    bound = self.initial_backoff * self.backoff_multiplier**retry
+    return rng.uniform(0, min(bound, self.max_backoff))
+
+
+class RetryBudget:
+  """Limits retries and hedges to a fraction of successful calls.
+
+  Follows gRPC retry throttling: failures take a token, successes add
+  `token_ratio` tokens, and retries are allowed while more than half of
+  `max_tokens` are left.
+  """
+
+  def __init__(self, max_tokens: float = 10.0, token_ratio: float = 0.1):
+    self._max_tokens = max_tokens
+    self._token_ratio = token_ratio
+    self._tokens = max_tokens
+    self._lock = threading.Lock()
+
+  @property
+  def tokens(self) -> float:
+    return self._tokens
+
+  def record_success(self) -> None:
+    with self._lock:
+      self._tokens = min(self._max_tokens, self._tokens + self._token_ratio)
+
+  def record_failure(self) -> None:
+    with self._lock:
+      self._tokens = max(0.0, self._tokens - 1)
+
+  def allow_retry(self) -> bool:
+    return self._tokens > self._max_tokens / 2
+
+
+class CircuitBreaker:
+  """Fails fast after consecutive upstream failures.
+
+  The circuit opens after `failure_threshold` consecutive failures. While open,
+  calls are refused until `reset_timeout` has passed; then one probe call is let
+  through, which closes the circuit if it succeeds and reopens it otherwise.
+  """
+
+  def __init__(
+      self,
+      failure_threshold: int = 5,
+      reset_timeout: float = 30.0,
+      *,
+      clock: Callable[[], float] = time.monotonic,
+  ):
+    self._failure_threshold = failure_threshold
+    self._reset_timeout = reset_timeout
+    self._clock = clock
+    self._failures = 0
+    self._opened_at = None
+    self._probing = False
+    self._lock = threading.Lock()
+
+  @property
+  def state(self) -> str:
+    """One of 'closed', 'open' or 'half-open'."""
+    if self._opened_at is None:
+      return 'closed'
+    if self._clock() - self._opened_at < self._reset_timeout:
+      return 'open'
+    return 'half-open'
+
+  def allow(self) -> bool:
+    """Returns whether a call may be made, reserving the probe if half-open."""
+    with self._lock:
+      match self.state:
+        case 'closed':
+          return True
+        case 'open':
+          return False
+        case _:
+          if self._probing:
+            return False
+          self._probing = True
+          return True
+
+  def release(self) -> None:
+    """Releases a call allowed by `allow` without recording an outcome."""
+    with self._lock:
+      self._probing = False
+
+  def record(self, success: bool) -> None:
+    """Records the outcome of a call allowed by `allow`."""
+    with self._lock:
+      self._probing = False
+      if success:
+        self._failures = 0
+        self._opened_at = None
+        return
+      self._failures += 1
+      if self._opened_at is not None or (
+          self._failures >= self._failure_threshold
+      ):
+        self._opened_at = self._clock()
+
+
+class LatencyTracker:
+  """Recent latencies of each RPC, for hedging delays."""
+
+  def __init__(self, window: int = 1000, min_samples: int = 20):
+    self._window = window
+    self._min_samples = min_samples
+    self._latencies = collections.defaultdict(
+        lambda: collections.deque(maxlen=window)
+    )
+    self._lock = threading.Lock()
+
+  def record(self, rpc: str, latency: float) -> None:
+    with self._lock:
+      self._latencies[rpc].append(latency)
+
+  def quantile(self, rpc: str, q: float) -> float | None:
+    """Returns a quantile of the recent latencies, or None if too few."""
+    with self._lock:
+      latencies = np.fromiter(self._latencies[rpc], float)
+    if latencies.size < self._min_samples:
+      return None
+    return float(np.quantile(latencies, q))
+
+
+class Endpoint:
+  """An upstream endpoint with its load, health and statistics."""
+
+  def __init__(self, url: str, breaker: CircuitBreaker, window: int = 1000):
+    self.url = url.rstrip('/')
+    self.breaker = breaker
+    self.healthy = True
+    self.outstanding = 0
+    self.requests = 0
+    self.errors = 0
+    self.latency_total = 0.0
+    self.load = None
+    self._latencies = collections.deque(maxlen=window)
+    self._lock = threading.Lock()
+
+  def update_load(self, headers: Mapping[str, str]) -> None:
+    """Keeps the load report carried by response headers, if any."""
+    load = load_reporting.LoadReport.from_headers(headers)
+    if load is not None:
+      self.load = load
+
+  @property
+  def load_score(self) -> float:
+    """Load relative to the endpoint's capacity, or outstanding requests.
+
+    Combines the last reported load, which includes requests of other clients,
+    with the requests outstanding from this client, which are current.
+    """
+    if self.load is None:
+      return float(self.outstanding)
+    busy = self.load.busy_workers + self.load.queue_depth
+    return max(busy, self.outstanding) / self.load.max_workers
+
+  def start(self) -> None:
+    with self._lock:
+      self.outstanding += 1
+
+  def release(self) -> None:
+    """Ends a request that neither succeeded nor failed, e.g. not sent."""
+    with self._lock:
+      self.outstanding -= 1
+    self.breaker.release()
+
+  def finish(self, latency: float, success: bool) -> None:
+    with self._lock:
+      self.outstanding -= 1
+      self.requests += 1
+      self.latency_total += latency
+      self._latencies.append(latency)
+      if not success:
+        self.errors += 1
+    self.breaker.record(success)
+
+  def latency_quantile(self, q: float) -> float:
+    """Returns a quantile of the recent latencies, or NaN if there are none."""
+    with self._lock:
+      latencies = np.fromiter(self._latencies, float)
+    return float(np.quantile(latencies, q)) if latencies.size else float('nan')
+
+  @property
+  def available(self) -> bool:
+    """Whether the endpoint is healthy and not ejected by its breaker."""
+    return self.healthy and self.breaker.state != 'open'
+
+
+def _ring_hash(key: str | bytes) -> int:
+  if isinstance(key, str):
+    key = key.encode()
+  return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+
+
+class LoadBalancer:
+  """Picks the upstream endpoint of each request.
+
+  Strategies:
+    * 'least_outstanding': the available endpoint with the fewest requests in
+      flight, ties broken at random.
+    * 'least_loaded': the available endpoint with the lowest `load_score`,
+      which uses the load reported by the endpoints in response headers and
+      falls back to outstanding requests for endpoints that do not report it.
+    * 'consistent_hash': the first available endpoint after the request key on
+      a hash ring, so that requests with the same key reach the same endpoint,
+      and only the keys of an ejected endpoint move elsewhere. Endpoints whose
+      reported utilization exceeds `max_utilization` are passed over. Requests
+      without a key fall back to 'least_loaded'.
+  """
+
+  STRATEGIES = ('least_outstanding', 'least_loaded', 'consistent_hash')
+
+  def __init__(
+      self,
+      urls: Sequence[str],
+      *,
+      strategy: str = 'least_outstanding',
+      virtual_nodes: int = 64,
+      max_utilization: float | None = 2.0,
+      breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+      seed: int | None = None,
+  ):
+    """Initializes the balancer.
+
+    Args:
+      urls: Base URLs of the endpoints.
+      strategy: One of `STRATEGIES`.
+      virtual_nodes: Points of each endpoint on the hash ring.
+      max_utilization: Reported utilization (busy and queued work per worker)
+        above which 'consistent_hash' prefers the next endpoint on the ring.
+        None to always keep affinity.
+      breaker_factory: Creates the circuit breaker of each endpoint.
+      seed: Seed of the tie breaking.
+
+    Raises:
+      ValueError: If there are no URLs or the strategy is unknown.
+    """
+    if not urls:
+      raise ValueError('At least one upstream URL is required.')
+    if strategy not in self.STRATEGIES:
+      raise ValueError(
+          f'Unknown strategy {strategy!r}, expected one of {self.STRATEGIES}.'
+      )
+    self.endpoints = [Endpoint(url, breaker_factory()) for url in urls]
+    self.strategy = strategy
+    self._max_utilization = max_utilization
+    ring = sorted(
+        (_ring_hash(f'{endpoint.url}#{i}'), index)
+        for index, endpoint in enumerate(self.endpoints)
+        for i in range(virtual_nodes)
+    )
+    self._ring_hashes = [h for h, _ in ring]
+    self._ring_endpoints = [index for _, index in ring]
+    self._rng = random.Random(seed)
+    self._lock = threading.Lock()
+
+  def _candidates(
+      self, key: str | bytes | None, exclude: Collection[Endpoint]
+  ) -> list[Endpoint]:
+    """Returns the available endpoints in order of preference."""
+    if key is not None and self.strategy == 'consistent_hash':
+      start = bisect.bisect(self._ring_hashes, _ring_hash(key))
+      ordered = []
+      for i in range(len(self._ring_endpoints)):
+        endpoint = self.endpoints[
+            self._ring_endpoints[(start + i) % len(self._ring_endpoints)]
+        ]
+        if endpoint not in ordered:
+          ordered.append(endpoint)
+      if self._max_utilization is not None:
+        # Stable, so affinity is kept among endpoints that are not overloaded.
+        ordered.sort(key=self._overloaded)
+    else:
+      if self.strategy == 'least_outstanding':
+        score = operator.attrgetter('outstanding')
+      else:
+        score = operator.attrgetter('load_score')
+      with self._lock:
+        ordered = sorted(
+            self.endpoints, key=lambda e: (score(e), self._rng.random())
+        )
+    return [e for e in ordered if e.available and e not in exclude]
+
+  def _overloaded(self, endpoint: Endpoint) -> bool:
+    load = endpoint.load
+    return load is not None and load.utilization > self._max_utilization
+
+  def pick(
+      self, key: str | bytes | None = None, exclude: Collection[Endpoint] = ()
+  ) -> Endpoint:
+    """Returns the endpoint for a request, reserving it with its breaker.
+
+    Args:
+      key: Request key for 'consistent_hash'.
+      exclude: Endpoints to avoid, e.g. those that failed the request already.
+        They are still used if no other endpoint is available.
+
+    Returns:
+      The endpoint, whose `finish` must be called after the request.
+
+    Raises:
+      CircuitOpenError: If no endpoint is available.
+    """
+    for candidates in (
+        self._candidates(key, exclude),
+        self._candidates(key, ()) if exclude else [],
+    ):
+      for endpoint in candidates:
+        # A half-open breaker lets only one probe through.
+        if endpoint.breaker.allow():
+          endpoint.start()
+          return endpoint
+    raise CircuitOpenError('No upstream endpoint is available.')
+
+  def check_health(self, path: str = '/health', timeout: float = 2.0) -> None:
+    """Marks each endpoint healthy if `path` responds with a success status.
+
+    Load reported in the headers of the health check responses is kept too, so
+    that idle endpoints have a current report.
+    """
+    for endpoint in self.endpoints:
+      try:
+        response = requests.get(f'{endpoint.url}{path}', timeout=timeout)
+      except requests.RequestException:
+        endpoint.healthy = False
+      else:
+        endpoint.healthy = response.ok
+        endpoint.update_load(response.headers)
+
+  def start_health_checks(
+      self, interval: float, path: str = '/health', timeout: float = 2.0
+  ) -> threading.Thread:
+    """Runs `check_health` every `interval` seconds in a daemon thread."""
+
+    def run():
+      while True:
+        self.check_health(path, timeout)
+        time.sleep(interval)
+
+    thread = threading.Thread(target=run, name='health-check', daemon=True)
+    thread.start()
+    return thread
+
+
+def _with_deadline(
+    kwargs: Mapping[str, Any], deadline: float | None
+) -> Mapping[str, Any]:
+  """Sets the timeout of a request to the time left before a deadline.
+
+  The deadline replaces any `timeout` in `kwargs`, which only applies to calls
+  without a deadline, and is propagated in `TIMEOUT_HEADER`.
+  """
+  if deadline is None:
+    return kwargs
+  remaining = deadline - time.monotonic()
+  if remaining <= 0:
+    raise DeadlineExceeded('Deadline passed before the request was sent.')
+  return dict(
+      kwargs,
+      timeout=remaining,
+      headers=dict(kwargs.get('headers') or {})
+      | {TIMEOUT_HEADER: f'{remaining:.3f}'},
+  )
+
+
+def _deadline_passed(deadline: float | None) -> bool:
+  return deadline is not None and time.monotonic() >= deadline
+
+
+def _post_cancel(url: str, request_id: str) -> None:
+  try:
+    requests.post(url, json={'request_id': request_id}, timeout=1.0)
+  except requests.RequestException:
+    pass  # The request finishes upstream and its response is discarded.
+
+
+class _CancelWatcher:
+  """Calls back once the cancellation events of running requests are set.
+
+  A single thread polls the events, so that requests run on their callers'
+  threads can still be aborted upstream.
+  """
+
+  def __init__(self, interval: float = _CANCEL_POLL_INTERVAL):
+    self._interval = interval
+    self._watched = {}
+    self._thread = None
+    self._lock = threading.Lock()
+
+  @contextlib.contextmanager
+  def watch(
+      self, cancel: threading.Event, on_cancel: Callable[[], None]
+  ) -> Iterator[None]:
+    """Calls `on_cancel` if `cancel` is set while in the context."""
+    token = object()
+    with self._lock:
+      self._watched[token] = (cancel, on_cancel)
+      if self._thread is None:
+        self._thread = threading.Thread(
+            target=self._run, name='cancel-watcher', daemon=True
+        )
+        self._thread.start()
+    try:
+      yield
+    finally:
+      with self._lock:
+        self._watched.pop(token, None)
+
+  def _run(self) -> None:
+    while True:
+      time.sleep(self._interval)
+      with self._lock:
+        fired = [
+            token
+            for token, (cancel, _) in self._watched.items()
+            if cancel.is_set()
+        ]
+        callbacks = [self._watched.pop(token)[1] for token in fired]
+      for on_cancel in callbacks:
+        on_cancel()
+
+
+def _never_sent(error: requests.RequestException) -> bool:
+  """Returns whether a failed request cannot have reached the upstream."""
+  return isinstance(error, requests.ConnectTimeout) or (
+      isinstance(error, requests.ConnectionError)
+      and 'NewConnectionError' in repr(error)
+  )
+
+
+class UpstreamClient:
+  """Posts requests to upstream endpoints with retries, hedging and balancing.
+
+  Calls can carry a deadline, which sets the HTTP timeout of each attempt and is
+  propagated to the upstream in `TIMEOUT_HEADER`, and a cancellation event.
+  Each request is tagged with its own `REQUEST_ID_HEADER`; requests that are
+  cancelled, or lose a hedge, while running upstream are aborted there by
+  posting their ID to `cancel_path`.
+
+  Attempts that are not hedged run on the calling thread. Hedged attempts run
+  on a pool of `max_hedge_workers` threads, each using up to two of them.
+
+  Usage:
+    client = UpstreamClient(
+        LoadBalancer(['http://backend-0:8000', 'http://backend-1:8000']),
+        policies={'metadata': RetryPolicy(hedge_quantile=0.95)},
+    )
+    response = client.post('metadata', '/metadata', json=payload)
+  """
+
+  def __init__(
+      self,
+      balancer: LoadBalancer,
+      *,
+      policies: Mapping[str, RetryPolicy] | None = None,
+      default_policy: RetryPolicy = RetryPolicy(),
+      budget: RetryBudget | None = None,
+      max_hedge_workers: int = 16,
+      cancel_path: str | None = '/cancel',
+      seed: int | None = None,
+  ):
+    """Initializes the client.
+
+    Args:
+      balancer: Picks the endpoint of each attempt.
+      policies: Retry policy of each RPC.
+      default_policy: Retry policy of other RPCs.
+      budget: Retry budget shared by all RPCs.
+      max_hedge_workers: Threads used to run hedged requests. Size it to twice
+        the number of concurrent hedged calls, so that hedges never queue.
+      cancel_path: Path to post the IDs of aborted requests to, or None if the
+        upstream cannot abort requests. Cancelled requests that cannot be
+        aborted run until they complete or their deadline passes.
+      seed: Seed of the backoff jitter.
+    """
+    self.balancer = balancer
+    self._policies = dict(policies or {})
+    self._default_policy = default_policy
+    self.budget = budget or RetryBudget()
+    self.latencies = LatencyTracker()
+    self._executor = futures.ThreadPoolExecutor(
+        max_hedge_workers, thread_name_prefix='hedge'
+    )
+    # Cancels are posted from their own threads, so that they are never queued
+    # behind the requests they abort.
+    self._cancel_executor = futures.ThreadPoolExecutor(
+        4, thread_name_prefix='cancel'
+    )
+    self._cancel_watcher = _CancelWatcher()
+    self._cancel_path = cancel_path
+    self._rng = random.Random(seed)
+    self.counters = collections.Counter()
+
+  def policy(self, rpc: str) -> RetryPolicy:
+    return self._policies.get(rpc, self._default_policy)
+
+  def _send(
+      self,
+      rpc: str,
+      endpoint: Endpoint,
+      path: str,
+      kwargs: Mapping[str, Any],
+      deadline: float | None,
+      request_id: str,
+  ) -> requests.Response:
+    """Posts to an endpoint reserved by `LoadBalancer.pick`.
+
+    Failures caused by the caller's deadline, and requests aborted upstream, are
+    not held against the endpoint.
+    """
+    try:
+      kwargs = _with_deadline(kwargs, deadline)
+    except DeadlineExceeded:
+      endpoint.release()
+      raise
+    kwargs = dict(
+        kwargs,
+        headers=dict(kwargs.get('headers') or {})
+        | {REQUEST_ID_HEADER: request_id},
+    )
+    start = time.monotonic()
+    try:
+      response = requests.post(f'{endpoint.url}{path}', **kwargs)
+    except requests.RequestException as e:
+      if _deadline_passed(deadline):
+        endpoint.release()
+        raise DeadlineExceeded(f'Deadline passed while calling {path}.') from e
+      endpoint.finish(time.monotonic() - start, False)
+      raise
+    latency = time.monotonic() - start
+    endpoint.update_load(response.headers)
+    if response.status_code == _CLIENT_CLOSED_REQUEST or (
+        response.status_code >= 500 and _deadline_passed(deadline)
+    ):
+      endpoint.release()
+    else:
+      endpoint.finish(latency, response.status_code < 500)
+    if response.ok:
+      self.latencies.record(rpc, latency)
+    return response
+
+  def _cancel_upstream(self, endpoint: Endpoint, request_id: str) -> None:
+    """Aborts a running request upstream, if the upstream supports it."""
+    if self._cancel_path is not None:
+      self.counters['cancels_sent'] += 1
+      self._cancel_executor.submit(
+          _post_cancel, f'{endpoint.url}{self._cancel_path}', request_id
+      )
+
+  def _abort(
+      self,
+      pending: Mapping[futures.Future[requests.Response], tuple[Endpoint, str]],
+  ) -> None:
+    """Drops requests not sent yet, and aborts running ones upstream."""
+    for future, (endpoint, request_id) in pending.items():
+      if future.cancel():
+        endpoint.release()
+      else:
+        self._cancel_upstream(endpoint, request_id)
+
+  def _attempt(
+      self,
+      rpc: str,
+      endpoint: Endpoint,
+      path: str,
+      key: str | bytes | None,
+      kwargs: Mapping[str, Any],
+      *,
+      hedge_delay: float | None,
+      deadline: float | None,
+      cancel: threading.Event | None,
+  ) -> requests.Response:
+    """Runs one attempt, hedged after `hedge_delay` and aborted on `cancel`."""
+    request_id = uuid.uuid4().hex
+    if hedge_delay is None:
+      if cancel is None:
+        return self._send(rpc, endpoint, path, kwargs, deadline, request_id)
+      with self._cancel_watcher.watch(
+          cancel, lambda: self._cancel_upstream(endpoint, request_id)
+      ):
+        response = self._send(rpc, endpoint, path, kwargs, deadline, request_id)
+      if cancel.is_set():
+        self.counters['cancelled'] += 1
+        raise Cancelled(f'Call to {path} was cancelled by the client.')
+      return response
+    hedge_at = time.monotonic() + hedge_delay
+    pending = {
+        self._executor.submit(
+            self._send, rpc, endpoint, path, kwargs, deadline, request_id
+        ): (endpoint, request_id)
+    }
+    while True:
+      timeout = None if cancel is None else _CANCEL_POLL_INTERVAL
+      if hedge_at is not None:
+        timeout = min(
+            timeout or math.inf, max(0.0, hedge_at - time.monotonic())
+        )
+      done, _ = futures.wait(
+          pending, timeout=timeout, return_when=futures.FIRST_COMPLETED
+      )
+      for future in done:
+        del pending[future]
+        if future.exception() is None or not pending:
+          self._abort(pending)
+          return future.result()
+      if cancel is not None and cancel.is_set():
+        self.counters['cancelled'] += 1
+        self._abort(pending)
+        raise Cancelled(f'Call to {path} was cancelled by the client.')
+      if hedge_at is not None and time.monotonic() >= hedge_at:
+        hedge_at = None
+        if self.budget.allow_retry():
+          try:
+            hedge_endpoint = self.balancer.pick(
+                key, exclude=[endpoint for endpoint, _ in pending.values()]
+            )
+          except CircuitOpenError:
+            continue
+          self.counters['hedges'] += 1
+          hedge_id = uuid.uuid4().hex
+          hedge = self._executor.submit(
+              self._send, rpc, hedge_endpoint, path, kwargs, deadline, hedge_id
+          )
+          pending[hedge] = (hedge_endpoint, hedge_id)
+
+  def post(
+      self,
+      rpc: str,
+      path: str,
+      *,
+      key: str | bytes | None = None,
+      deadline: float | None = None,
+      cancel: threading.Event | None = None,
+      **kwargs: Any,
+  ) -> requests.Response:
+    """Posts a request, retrying and hedging according to the RPC's policy.
+
+    Retries and hedges go to other endpoints than the ones that failed or are
+    slow, if any are available.
+
+    Args:
+      rpc: Name of the RPC, selecting the retry policy.
+      path: Path to post to on the chosen endpoint.
+      key: Request key for consistent hashing, e.g. a hash of the request.
+      deadline: `time.monotonic()` time by which the call must complete. No
+        attempt or retry is started after it, and the HTTP timeout of each
+        attempt is the time left, overriding `timeout`.
+      cancel: Event set when the caller is no longer interested in the result.
+      **kwargs: Arguments of `requests.post`.
+
+    Returns:
+      The first successful response, or the last response with a retryable
+      status code once retries are exhausted. Callers still need to check the
+      status.
+
+    Raises:
+      CircuitOpenError: If no endpoint is available.
+      DeadlineExceeded: If the deadline passed before an attempt was sent.
+      Cancelled: If `cancel` was set before the call completed.
+      requests.RequestException: If the last attempt failed.
+    """
+    policy = self.policy(rpc)
+    failed = set()
+    attempt = 0
+    while True:
+      if cancel is not None and cancel.is_set():
+        self.counters['cancelled'] += 1
+        raise Cancelled(f'Call to {path} was cancelled by the client.')
+      if _deadline_passed(deadline):
+        self.counters['deadline_exceeded'] += 1
+        raise DeadlineExceeded(f'Deadline passed before calling {path}.')
+      try:
+        endpoint = self.balancer.pick(key, exclude=failed)
+      except CircuitOpenError:
+        self.counters['circuit_open'] += 1
+        raise
+      hedge_delay = None
+      if policy.hedge_quantile is not None and policy.idempotent:
+        hedge_delay = self.latencies.quantile(rpc, policy.hedge_quantile)
+      try:
+        response = self._attempt(
+            rpc,
+            endpoint,
+            path,
+            key,
+            kwargs,
+            hedge_delay=hedge_delay,
+            deadline=deadline,
+            cancel=cancel,
+        )
+      except DeadlineExceeded:
+        self.counters['deadline_exceeded'] += 1
+        raise
+      except CallAborted:
+        raise
+      except requests.RequestException as e:
+        self.budget.record_failure()
+        retryable = policy.idempotent or _never_sent(e)
+        if not retryable or not self._may_retry(policy, attempt):
+          raise
+      else:
+        if response.status_code not in policy.retryable_status_codes:
+          self.budget.record_success()
+          return response
+        self.budget.record_failure()
+        if not policy.idempotent or not self._may_retry(policy, attempt):
+          return response
+      failed.add(endpoint)
+      self.counters['retries'] += 1
+      backoff = policy.backoff(attempt, self._rng)
+      if deadline is not None and time.monotonic() + backoff >= deadline:
+        self.counters['deadline_exceeded'] += 1
+        raise DeadlineExceeded(f'Deadline passed while retrying {path}.')
+      if cancel is None:
+        time.sleep(backoff)
+      else:
+        cancel.wait(backoff)
+      attempt += 1
+
+  def _may_retry(self, policy: RetryPolicy, attempt: int) -> bool:
+    if attempt + 1 >= policy.max_attempts:
+      return False
+    if not self.budget.allow_retry():
+      self.counters['retries_throttled'] += 1
+      return False
+    return True
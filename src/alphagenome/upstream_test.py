@@ -0,0 +1,433 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+from http import server
+import json
+import random
+import threading
+import time
+
+from absl.testing import absltest
+
+from . import load_reporting
+from . import upstream
+
+
+class _FakeUpstream(server.ThreadingHTTPServer):
+  """Upstream whose /slow path runs until its request is cancelled."""
+
+  def __init__(self):
+    super().__init__(('127.0.0.1', 0), _Handler)
+    self.requests = []
+    self.cancels = []
+    self.failures = collections.Counter()
+    self.cancelled = collections.defaultdict(threading.Event)
+    threading.Thread(target=self.serve_forever, daemon=True).start()
+
+  @property
+  def url(self) -> str:
+    return f'http://127.0.0.1:{self.server_port}'
+
+
+class _Handler(server.BaseHTTPRequestHandler):
+
+  def log_message(self, *args):
+    del args
+
+  def do_POST(self):  # pylint: disable=invalid-name
+    body = self.rfile.read(int(self.headers['Content-Length']))
+    fake = self.server
+    if self.path == '/cancel':
+      request_id = json.loads(body)['request_id']
+      fake.cancels.append(request_id)
+      fake.cancelled[request_id].set()
+      status = 200
+    else:
+      request_id = self.headers[upstream.REQUEST_ID_HEADER]
+      fake.requests.append(
+          (self.path, request_id, self.headers.get(upstream.TIMEOUT_HEADER))
+      )
+      status = 200
+      if self.path == '/slow':
+        status = 499 if fake.cancelled[request_id].wait(5) else 200
+      elif self.path == '/flaky' and fake.failures[self.path] < 1:
+        fake.failures[self.path] += 1
+        status = 503
+    self.send_response(status)
+    self.send_header('Content-Length', '2')
+    self.end_headers()
+    self.wfile.write(b'{}')
+
+
+class WithDeadlineTest(absltest.TestCase):
+
+  def test_without_deadline_keeps_timeout(self):
+    kwargs = {'timeout': 10, 'json': {}}
+    self.assertIs(upstream._with_deadline(kwargs, None), kwargs)
+
+  def test_deadline_replaces_timeout(self):
+    for timeout in (None, 0.5, 100):
+      kwargs = upstream._with_deadline(
+          {'timeout': timeout, 'headers': {'Accept': 'application/json'}},
+          time.monotonic() + 10,
+      )
+      self.assertBetween(kwargs['timeout'], 9, 10)
+      self.assertBetween(
+          float(kwargs['headers'][upstream.TIMEOUT_HEADER]), 9, 10
+      )
+      self.assertEqual(kwargs['headers']['Accept'], 'application/json')
+
+  def test_passed_deadline_raises(self):
+    with self.assertRaises(upstream.DeadlineExceeded):
+      upstream._with_deadline({}, time.monotonic() - 1)
+
+
+class UpstreamClientTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.fake = _FakeUpstream()
+    self.addCleanup(self.fake.server_close)
+    self.addCleanup(self.fake.shutdown)
+    self.client = upstream.UpstreamClient(
+        upstream.LoadBalancer([self.fake.url]),
+        default_policy=upstream.RetryPolicy(initial_backoff=0.01),
+        seed=0,
+    )
+
+  def test_deadline_is_propagated(self):
+    response = self.client.post(
+        'fast', '/fast', deadline=time.monotonic() + 5, timeout=1, json={}
+    )
+    self.assertEqual(response.status_code, 200)
+    ((_, _, timeout),) = self.fake.requests
+    self.assertBetween(float(timeout), 4, 5)
+
+  def test_deadline_exceeded(self):
+    with self.assertRaises(upstream.DeadlineExceeded):
+      self.client.post(
+          'slow', '/slow', deadline=time.monotonic() + 0.2, json={}
+      )
+    self.assertEqual(self.client.counters['deadline_exceeded'], 1)
+    self.assertEqual(self.client.balancer.endpoints[0].errors, 0)
+
+  def test_each_attempt_has_its_own_request_id(self):
+    response = self.client.post('flaky', '/flaky', json={})
+    self.assertEqual(response.status_code, 200)
+    request_ids = [request_id for _, request_id, _ in self.fake.requests]
+    self.assertLen(request_ids, 2)
+    self.assertLen(set(request_ids), 2)
+
+  def test_cancel_aborts_running_request_upstream(self):
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+    start = time.monotonic()
+    with self.assertRaises(upstream.Cancelled):
+      self.client.post('slow', '/slow', cancel=cancel, json={})
+    self.assertLess(time.monotonic() - start, 2)
+    ((_, request_id, _),) = self.fake.requests
+    self.assertEqual(self.fake.cancels, [request_id])
+    self.assertEqual(self.client.counters['cancelled'], 1)
+    self.assertEqual(self.client.balancer.endpoints[0].outstanding, 0)
+
+  def test_cancel_before_call(self):
+    cancel = threading.Event()
+    cancel.set()
+    with self.assertRaises(upstream.Cancelled):
+      self.client.post('fast', '/fast', cancel=cancel, json={})
+    self.assertEmpty(self.fake.requests)
+
+  def test_hedge_loser_is_cancelled(self):
+    client = upstream.UpstreamClient(
+        upstream.LoadBalancer([self.fake.url]),
+        policies={'slow': upstream.RetryPolicy(hedge_quantile=0.5)},
+    )
+    for _ in range(25):
+      client.latencies.record('slow', 0.05)
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    with self.assertRaises(upstream.Cancelled):
+      client.post('slow', '/slow', cancel=cancel, json={})
+    self.assertEqual(client.counters['hedges'], 1)
+    request_ids = {request_id for _, request_id, _ in self.fake.requests}
+    self.assertLen(request_ids, 2)
+    deadline = time.monotonic() + 2
+    while len(self.fake.cancels) < 2 and time.monotonic() < deadline:
+      time.sleep(0.01)
+    self.assertEqual(set(self.fake.cancels), request_ids)
+
+
+class RetryPolicyTest(absltest.TestCase):
+
+  def test_backoff_is_jittered_and_bounded(self):
+    policy = upstream.RetryPolicy(
+        initial_backoff=0.1, max_backoff=1.0, backoff_multiplier=2.0
+    )
+    rng = random.Random(0)
+    for retry, bound in ((0, 0.1), (1, 0.2), (2, 0.4), (5, 1.0)):
+      delays = [policy.backoff(retry, rng) for _ in range(100)]
+      self.assertBetween(min(delays), 0, bound / 2)
+      self.assertBetween(max(delays), bound / 2, bound)
+
+
+class RetryBudgetTest(absltest.TestCase):
+
+  def test_failures_exhaust_budget(self):
+    budget = upstream.RetryBudget(max_tokens=10, token_ratio=0.5)
+    for _ in range(4):
+      budget.record_failure()
+    self.assertTrue(budget.allow_retry())
+    budget.record_failure()
+    self.assertFalse(budget.allow_retry())
+    budget.record_success()
+    self.assertTrue(budget.allow_retry())
+
+  def test_tokens_are_bounded(self):
+    budget = upstream.RetryBudget(max_tokens=10, token_ratio=0.5)
+    for _ in range(100):
+      budget.record_success()
+    self.assertEqual(budget.tokens, 10)
+    for _ in range(100):
+      budget.record_failure()
+    self.assertEqual(budget.tokens, 0)
+    for _ in range(10):
+      budget.record_success()
+    self.assertFalse(budget.allow_retry())
+    budget.record_success()
+    self.assertTrue(budget.allow_retry())
+
+
+class _FakeClock:
+
+  def __init__(self):
+    self.now = 0.0
+
+  def __call__(self) -> float:
+    return self.now
+
+
+class CircuitBreakerTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.clock = _FakeClock()
+    self.breaker = upstream.CircuitBreaker(
+        failure_threshold=3, reset_timeout=10, clock=self.clock
+    )
+
+  def _open(self):
+    for _ in range(3):
+      self.assertTrue(self.breaker.allow())
+      self.breaker.record(False)
+    self.assertEqual(self.breaker.state, 'open')
+
+  def test_opens_after_consecutive_failures(self):
+    for success in (False, False, True, False, False):
+      self.breaker.record(success)
+    self.assertEqual(self.breaker.state, 'closed')
+    self.breaker.record(False)
+    self.assertEqual(self.breaker.state, 'open')
+    self.assertFalse(self.breaker.allow())
+
+  def test_successful_probe_closes(self):
+    self._open()
+    self.clock.now = 9.9
+    self.assertFalse(self.breaker.allow())
+    self.clock.now = 10
+    self.assertEqual(self.breaker.state, 'half-open')
+    self.assertTrue(self.breaker.allow())
+    # Only one probe at a time.
+    self.assertFalse(self.breaker.allow())
+    self.breaker.record(True)
+    self.assertEqual(self.breaker.state, 'closed')
+    self.assertTrue(self.breaker.allow())
+
+  def test_failed_probe_reopens(self):
+    self._open()
+    self.clock.now = 10
+    self.assertTrue(self.breaker.allow())
+    self.breaker.record(False)
+    self.assertEqual(self.breaker.state, 'open')
+    self.clock.now = 19.9
+    self.assertFalse(self.breaker.allow())
+    self.clock.now = 20
+    self.assertTrue(self.breaker.allow())
+
+
+class LoadBalancerTest(absltest.TestCase):
+
+  def test_least_outstanding(self):
+    urls = ['http://a', 'http://b', 'http://c']
+    balancer = upstream.LoadBalancer(urls, seed=0)
+    picked = [balancer.pick() for _ in urls]
+    self.assertCountEqual([endpoint.url for endpoint in picked], urls)
+    picked[1].finish(0.1, success=True)
+    self.assertIs(balancer.pick(), picked[1])
+
+  def test_exclude(self):
+    balancer = upstream.LoadBalancer(['http://a', 'http://b'], seed=0)
+    first = balancer.pick()
+    first.finish(0.1, success=False)
+    second = balancer.pick(exclude=[first])
+    self.assertIsNot(second, first)
+    second.finish(0.1, success=True)
+    # Excluded endpoints are used if no other is available.
+    second.healthy = False
+    self.assertIs(balancer.pick(exclude=[first]), first)
+
+  def test_breaker_ejects_endpoint(self):
+    balancer = upstream.LoadBalancer(
+        ['http://a', 'http://b'],
+        breaker_factory=lambda: upstream.CircuitBreaker(failure_threshold=1),
+    )
+    failing = balancer.pick()
+    failing.finish(0.1, success=False)
+    self.assertFalse(failing.available)
+    for _ in range(3):
+      endpoint = balancer.pick()
+      self.assertIsNot(endpoint, failing)
+      endpoint.finish(0.1, success=True)
+    balancer.pick().finish(0.1, success=False)
+    with self.assertRaises(upstream.CircuitOpenError):
+      balancer.pick()
+
+  def test_consistent_hash_is_stable(self):
+    balancer = upstream.LoadBalancer(
+        [f'http://backend-{i}' for i in range(4)], strategy='consistent_hash'
+    )
+    keys = [f'key-{i}' for i in range(200)]
+
+    def assign():
+      assignment = {}
+      for key in keys:
+        assignment[key] = endpoint = balancer.pick(key)
+        endpoint.finish(0.1, success=True)
+      return assignment
+
+    before = assign()
+    self.assertEqual(assign(), before)
+    self.assertLen(set(before.values()), 4)
+    ejected = balancer.endpoints[1]
+    ejected.healthy = False
+    after = assign()
+    for key in keys:
+      if before[key] is ejected:
+        self.assertIsNot(after[key], ejected)
+      else:
+        # Only the keys of the ejected endpoint move.
+        self.assertIs(after[key], before[key])
+    ejected.healthy = True
+    self.assertEqual(assign(), before)
+
+  def test_invalid_arguments(self):
+    with self.assertRaises(ValueError):
+      upstream.LoadBalancer([])
+    with self.assertRaises(ValueError):
+      upstream.LoadBalancer(['http://a'], strategy='round_robin')
+
+
+def _load_headers(busy_workers, queue_depth=0):
+  return load_reporting.LoadReport(
+      in_flight=busy_workers + queue_depth,
+      queue_depth=queue_depth,
+      busy_workers=busy_workers,
+      max_workers=4,
+      latency_p50=0.1,
+      latency_p95=0.2,
+      cpu_utilization=0.5,
+      memory_utilization=0.5,
+  ).headers()
+
+
+class LoadAwareBalancingTest(absltest.TestCase):
+
+  def test_least_loaded(self):
+    balancer = upstream.LoadBalancer(
+        ['http://a', 'http://b', 'http://c'], strategy='least_loaded', seed=0
+    )
+    a, b, c = balancer.endpoints
+    a.update_load(_load_headers(busy_workers=4))
+    b.update_load(_load_headers(busy_workers=1))
+    # Without a report, outstanding requests are the load.
+    c.start()
+    c.start()
+    self.assertIs(balancer.pick(), b)
+    self.assertIs(balancer.pick(), b)
+    self.assertEqual(b.load_score, 0.5)
+    b.update_load({})
+    self.assertEqual(b.load_score, 0.5)
+
+  def test_consistent_hash_passes_over_overloaded_endpoints(self):
+    balancer = upstream.LoadBalancer(
+        [f'http://backend-{i}' for i in range(4)],
+        strategy='consistent_hash',
+        max_utilization=1.0,
+    )
+    home = balancer.pick('key')
+    home.finish(0.1, success=True)
+    home.update_load(_load_headers(busy_workers=4, queue_depth=4))
+    other = balancer.pick('key')
+    self.assertIsNot(other, home)
+    other.finish(0.1, success=True)
+    home.update_load(_load_headers(busy_workers=2))
+    self.assertIs(balancer.pick('key'), home)
+
+
+class _HealthHandler(server.BaseHTTPRequestHandler):
+
+  def log_message(self, *args):
+    del args
+
+  def do_GET(self):  # pylint: disable=invalid-name
+    self.send_response(self.server.status)
+    self.send_header('Content-Length', '0')
+    self.end_headers()
+
+
+class HealthCheckTest(absltest.TestCase):
+
+  def test_ejects_and_recovers(self):
+    health = server.ThreadingHTTPServer(('127.0.0.1', 0), _HealthHandler)
+    health.status = 200
+    threading.Thread(target=health.serve_forever, daemon=True).start()
+    self.addCleanup(health.server_close)
+    self.addCleanup(health.shutdown)
+    # Nothing listens on port 1.
+    balancer = upstream.LoadBalancer(
+        [f'http://127.0.0.1:{health.server_port}', 'http://127.0.0.1:1']
+    )
+    reachable, unreachable = balancer.endpoints
+
+    balancer.check_health(timeout=1)
+    self.assertTrue(reachable.available)
+    self.assertFalse(unreachable.available)
+    for _ in range(3):
+      endpoint = balancer.pick()
+      self.assertIs(endpoint, reachable)
+      endpoint.finish(0.1, success=True)
+
+    health.status = 503
+    balancer.check_health(timeout=1)
+    self.assertFalse(reachable.available)
+    with self.assertRaises(upstream.CircuitOpenError):
+      balancer.pick()
+
+    health.status = 200
+    balancer.check_health(timeout=1)
+    self.assertIs(balancer.pick(), reachable)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,260 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Memory-mapped lookup index of precomputed variant scores.
+
+The index file is laid out as:
+
+  * A fixed-size header (`_HEADER`).
+  * A sorted array of 64-bit key prefixes, searched with a binary search.
+  * A parallel array of entries holding the remaining key digest bits and the
+    offset and length of the payload.
+  * The concatenated payloads (serialized service responses).
+
+Keys are 128-bit BLAKE2b digests of the canonical variant key, so lookups only
+touch O(log N) cache lines of the memory-mapped file. Index files are replaced
+atomically by the builder, and `ReloadingVariantScoreIndex` picks up a new file
+without a restart.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Any
+
+from absl import logging
+import numpy as np
+
+
+_MAGIC = b'AGVSIDX1'
+_VERSION = 1
+# magic, version, num_entries, keys_offset, entries_offset, payload_offset.
+_HEADER = struct.Struct('<8sQQQQQ')
+_ENTRY_DTYPE = np.dtype(
+    [('digest_low', '<u8'), ('offset', '<u8'), ('length', '<u8')]
+)
+
+
+def variant_key(
+    *,
+    chromosome: str,
+    position: int,
+    reference_bases: str,
+    alternate_bases: str,
+    scorer: Sequence[Mapping[str, Any]] | Mapping[str, Any],
+    model_version: str = '',
+    organism: int | str = '',
+) -> bytes:
+  """Returns the canonical index key for a scored variant.
+
+  Args:
+    chromosome: Chromosome of the variant.
+    position: Position of the variant.
+    reference_bases: Reference bases.
+    alternate_bases: Alternate bases.
+    scorer: Variant scorer(s), as JSON-compatible dicts (e.g. from
+      `MessageToDict`). Serialized with sorted keys so that field order does not
+      matter.
+    model_version: Model version used for scoring.
+    organism: Organism the variant belongs to. Chromosome names are shared
+      across organisms, so this is part of the key as well.
+  """
+  fields = (
+      chromosome,
+      str(position),
+      reference_bases.upper(),
+      alternate_bases.upper(),
+      json.dumps(scorer, sort_keys=True, separators=(',', ':')),
+      model_version,
+      str(organism),
+  )
+  return '\t'.join(fields).encode()
+
+
+def key_from_request(request: Mapping[str, Any]) -> bytes:
+  """Returns the index key of a `ScoreVariantRequest` in JSON dict form."""
+  variant = request.get('variant', {})
+  return variant_key(
+      chromosome=variant.get('chromosome', ''),
+      position=int(variant.get('position', 0)),
+      reference_bases=variant.get('reference_bases', ''),
+      alternate_bases=variant.get('alternate_bases', ''),
+      scorer=request.get('variant_scorers', []),
+      model_version=request.get('model_version', ''),
+      organism=request.get('organism', ''),
+  )
+
+
+def _digest(key: bytes) -> tuple[int, int]:
+  digest = hashlib.blake2b(key, digest_size=16).digest()
+  high, low = struct.unpack('>QQ', digest)
+  return high, low
+
+
+def build_index(
+    records: Iterable[tuple[bytes, bytes]], path: str | os.PathLike[str]
+) -> int:
+  """Builds an index file from (key, payload) records.
+
+  The file is written to a temporary file next to `path` and atomically renamed
+  into place, so readers never observe a partially written index. If a key is
+  repeated, the last payload wins.
+
+  Args:
+    records: Iterable of (key, payload) pairs, where keys are typically created
+      with `variant_key`.
+    path: Destination path of the index.
+
+  Returns:
+    Number of entries in the index.
+  """
+  payloads = {_digest(key): payload for key, payload in records}
+  digests = sorted(payloads)
+
+  keys = np.array([high for high, _ in digests], dtype='<u8')
+  entries = np.zeros(len(digests), dtype=_ENTRY_DTYPE)
+  offset = 0
+  for i, digest in enumerate(digests):
+    length = len(payloads[digest])
+    entries[i] = (digest[1], offset, length)
+    offset += length
+
+  keys_offset = _HEADER.size
+  entries_offset = keys_offset + keys.nbytes
+  payload_offset = entries_offset + entries.nbytes
+
+  directory = os.path.dirname(os.path.abspath(path))
+  with tempfile.NamedTemporaryFile(dir=directory, delete=False) as f:
+    try:
+      f.write(
+          _HEADER.pack(
+              _MAGIC,
+              _VERSION,
+              len(digests),
+              keys_offset,
+              entries_offset,
+              payload_offset,
+          )
+      )
+      f.write(keys.tobytes())
+      f.write(entries.tobytes())
+      for digest in digests:
+        f.write(payloads[digest])
+      f.flush()
+      os.fsync(f.fileno())
+    except BaseException:
+      os.unlink(f.name)
+      raise
+  os.replace(f.name, path)
+  return len(digests)
+
+
+class VariantScoreIndex:
+  """Read-only view of an index file built with `build_index`."""
+
+  def __init__(self, path: str | os.PathLike[str]):
+    with open(path, 'rb') as f:
+      stat = os.fstat(f.fileno())
+      if stat.st_size < _HEADER.size:
+        raise ValueError(f'{path} is not a variant score index.')
+      self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    self.file_stat = stat
+
+    magic, version, num_entries, keys_offset, entries_offset, payload_offset = (
+        _HEADER.unpack_from(self._mmap)
+    )
+    if magic != _MAGIC or version != _VERSION:
+      raise ValueError(f'{path} is not a version {_VERSION} score index.')
+    self._keys = np.frombuffer(
+        self._mmap, dtype='<u8', count=num_entries, offset=keys_offset
+    )
+    self._entries = np.frombuffer(
+        self._mmap, dtype=_ENTRY_DTYPE, count=num_entries, offset=entries_offset
+    )
+    self._payload_offset = payload_offset
+
+  def __len__(self) -> int:
+    return len(self._keys)
+
+  def lookup(self, key: bytes) -> bytes | None:
+    """Returns the payload stored for `key`, or None if it is not indexed."""
+    high, low = _digest(key)
+    high = np.uint64(high)
+    index = int(np.searchsorted(self._keys, high, side='left'))
+    while index < len(self._keys) and self._keys[index] == high:
+      entry = self._entries[index]
+      if int(entry['digest_low']) == low:
+        start = self._payload_offset + int(entry['offset'])
+        return self._mmap[start : start + int(entry['length'])]
+      index += 1
+    return None
+
+
+class ReloadingVariantScoreIndex:
+  """Variant score index that follows atomic replacements of its file.
+
+  At most once every `check_interval` seconds, the file is stat'ed and, if its
+  inode or modification time changed, the new file is mapped. Lookups in flight
+  keep using the previous mapping until they complete. If the new file cannot be
+  opened, the previous mapping is kept until a valid file replaces it.
+  """
+
+  def __init__(
+      self, path: str | os.PathLike[str], *, check_interval: float = 5.0
+  ):
+    self._path = path
+    self._check_interval = check_interval
+    self._lock = threading.Lock()
+    self._index = None
+    self._next_check = 0.0
+    self._maybe_reload()
+
+  def _maybe_reload(self) -> VariantScoreIndex | None:
+    now = time.monotonic()
+    if now < self._next_check:
+      return self._index
+    with self._lock:
+      if now < self._next_check:
+        return self._index
+      self._next_check = now + self._check_interval
+      try:
+        stat = os.stat(self._path)
+      except FileNotFoundError:
+        self._index = None
+        return None
+      current = self._index
+      if current is None or (stat.st_ino, stat.st_mtime_ns) != (
+          current.file_stat.st_ino,
+          current.file_stat.st_mtime_ns,
+      ):
+        try:
+          self._index = VariantScoreIndex(self._path)
+        except (OSError, ValueError):
+          # A partially written or invalid file must not take the index down;
+          # keep serving the previous one until a valid file replaces it.
+          logging.exception(
+              'Failed to load variant score index %s.', self._path
+          )
+      return self._index
+
+  def lookup(self, key: bytes) -> bytes | None:
+    """Returns the payload stored for `key`, or None if it is not indexed."""
+    index = self._maybe_reload()
+    return index.lookup(key) if index is not None else None
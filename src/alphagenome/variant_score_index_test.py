@@ -0,0 +1,143 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+
+from . import variant_score_index
+
+
+def _request(position, scorer_type='RNA_SEQ'):
+  return {
+      'variant': {
+          'chromosome': 'chr1',
+          'position': position,
+          'reference_bases': 'a',
+          'alternate_bases': 'T',
+      },
+      'variant_scorers': [{'gene_mask': {'requested_output': scorer_type}}],
+      'organism': 'HOMO_SAPIENS',
+  }
+
+
+class VariantScoreIndexTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    directory = self.enter_context(tempfile.TemporaryDirectory())
+    self.path = os.path.join(directory, 'scores.idx')
+
+  def _build(self, records):
+    return variant_score_index.build_index(
+        (
+            (variant_score_index.key_from_request(request), payload)
+            for request, payload in records
+        ),
+        self.path,
+    )
+
+  def test_lookup(self):
+    records = [(_request(i), f'payload {i}'.encode()) for i in range(100)]
+    self.assertEqual(self._build(records), 100)
+    index = variant_score_index.VariantScoreIndex(self.path)
+    self.assertLen(index, 100)
+    for request, payload in records:
+      self.assertEqual(
+          index.lookup(variant_score_index.key_from_request(request)), payload
+      )
+    for missing in (_request(100), _request(1, scorer_type='ATAC')):
+      self.assertIsNone(
+          index.lookup(variant_score_index.key_from_request(missing))
+      )
+
+  def test_key_is_canonical(self):
+    request = _request(5)
+    reordered = dict(reversed(request.items()))
+    reordered['variant'] = dict(request['variant'], reference_bases='A')
+    self.assertEqual(
+        variant_score_index.key_from_request(request),
+        variant_score_index.key_from_request(reordered),
+    )
+
+  def test_shared_key_prefix(self):
+    digests = {b'a': (7, 1), b'b': (7, 2), b'c': (7, 3), b'd': (8, 1)}
+    with mock.patch.object(variant_score_index, '_digest', digests.get):
+      variant_score_index.build_index(
+          [(b'a', b'1'), (b'b', b'2'), (b'd', b'4')], self.path
+      )
+      index = variant_score_index.VariantScoreIndex(self.path)
+      self.assertEqual(index.lookup(b'b'), b'2')
+      self.assertEqual(index.lookup(b'd'), b'4')
+      self.assertIsNone(index.lookup(b'c'))
+
+  def test_invalid_file_raises(self):
+    with open(self.path, 'wb') as f:
+      f.write(b'not an index' * 10)
+    with self.assertRaises(ValueError):
+      variant_score_index.VariantScoreIndex(self.path)
+
+
+class ReloadingVariantScoreIndexTest(absltest.TestCase):
+
+  def test_reloads_replaced_file(self):
+    directory = self.enter_context(tempfile.TemporaryDirectory())
+    path = os.path.join(directory, 'scores.idx')
+    index = variant_score_index.ReloadingVariantScoreIndex(
+        path, check_interval=0
+    )
+    self.assertIsNone(index.lookup(b'key'))
+
+    variant_score_index.build_index([(b'key', b'old')], path)
+    self.assertEqual(index.lookup(b'key'), b'old')
+    variant_score_index.build_index([(b'key', b'new')], path)
+    self.assertEqual(index.lookup(b'key'), b'new')
+
+    os.unlink(path)
+    self.assertIsNone(index.lookup(b'key'))
+
+  def test_keeps_current_index_if_replacement_is_invalid(self):
+    directory = self.enter_context(tempfile.TemporaryDirectory())
+    path = os.path.join(directory, 'scores.idx')
+    variant_score_index.build_index([(b'key', b'old')], path)
+    index = variant_score_index.ReloadingVariantScoreIndex(
+        path, check_interval=0
+    )
+    self.assertEqual(index.lookup(b'key'), b'old')
+
+    invalid = os.path.join(directory, 'invalid.idx')
+    with open(invalid, 'wb') as f:
+      f.write(b'not an index' * 10)
+    os.replace(invalid, path)
+    with self.assertLogs(level='ERROR'):
+      self.assertEqual(index.lookup(b'key'), b'old')
+
+    variant_score_index.build_index([(b'key', b'new')], path)
+    self.assertEqual(index.lookup(b'key'), b'new')
+
+  def test_checks_at_most_once_per_interval(self):
+    directory = self.enter_context(tempfile.TemporaryDirectory())
+    path = os.path.join(directory, 'scores.idx')
+    variant_score_index.build_index([(b'key', b'old')], path)
+    index = variant_score_index.ReloadingVariantScoreIndex(
+        path, check_interval=3600
+    )
+    variant_score_index.build_index([(b'key', b'new')], path)
+    self.assertEqual(index.lookup(b'key'), b'old')
+
+
+if __name__ == '__main__':
+  absltest.main()